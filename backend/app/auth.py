@@ -1,22 +1,66 @@
 # backend/app/auth.py
 
+import hashlib
+import hmac
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, NamedTuple, Optional, Tuple
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from passlib.hash import argon2
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
 from app import models
+from app.cache import TTLCache
 from app.config import settings
-from app.database import get_db
+from app.database import get_async_db, get_async_read_db
+from app.hashing import HashingPool
 from app.schemas import token_schema
 
 # --- Password Hashing ---
-# We use bcrypt as the hashing algorithm.
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+def _build_crypt_context() -> CryptContext:
+    """
+    Builds the password hashing policy from settings.
+
+    The configured scheme and cost are pinned with matching min/max bounds, so
+    stored hashes that are weaker *or* stronger than the policy are reported by
+    `needs_update` and transparently rehashed on the next successful login.
+    Hashes from the other scheme are marked deprecated and migrated the same way.
+    """
+    schemes = ["bcrypt"]
+    if argon2.has_backend():
+        schemes.insert(0, "argon2")
+    if settings.PASSWORD_HASH_SCHEME not in schemes:
+        raise RuntimeError(
+            f"PASSWORD_HASH_SCHEME '{settings.PASSWORD_HASH_SCHEME}' is not available. "
+            f"Supported on this host: {', '.join(schemes)}."
+        )
+
+    return CryptContext(
+        schemes=schemes,
+        default=settings.PASSWORD_HASH_SCHEME,
+        deprecated="auto",
+        bcrypt__rounds=settings.BCRYPT_ROUNDS,
+        bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+        bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+        argon2__rounds=settings.ARGON2_TIME_COST,
+        argon2__min_rounds=settings.ARGON2_TIME_COST,
+        argon2__max_rounds=settings.ARGON2_TIME_COST,
+        argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+        argon2__parallelism=settings.ARGON2_PARALLELISM,
+    )
+
+
+pwd_context = _build_crypt_context()
+
+# Hashing is CPU-bound (~250ms per bcrypt call), so async code paths run it on
+# this dedicated pool instead of on the event loop.
+password_hashing_pool = HashingPool(max_workers=settings.PASSWORD_HASH_WORKERS)
 
 # --- OAuth2 Scheme ---
 # This defines the security scheme. `tokenUrl` points to the login endpoint
@@ -24,6 +68,21 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="users/token")
 
 
+# --- Principal Cache ---
+# Maps a token to its decoded claims and a detached snapshot of the user, so that
+# repeated requests with the same token skip both the JWT decode and the user
+# lookup. Entries never outlive the token itself.
+class CachedPrincipal(NamedTuple):
+    claims: Dict[str, Any]
+    user: models.User
+
+
+principal_cache = TTLCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verifies that a plain text password matches its hashed version.
@@ -40,7 +99,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def hash_password(password: str) -> str:
     """
-    Hashes a plain text password using bcrypt.
+    Hashes a plain text password using the configured scheme and cost.
 
     Args:
         password: The password to hash.
@@ -51,6 +110,58 @@ def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifies a password and, if its hash no longer matches the hashing policy,
+    computes a replacement hash in the same step.
+
+    Args:
+        plain_password: The password in plain text.
+        hashed_password: The hashed password from the database.
+
+    Returns:
+        A tuple of (verified, new_hash). `new_hash` is None unless the password
+        is valid and the stored hash should be replaced.
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Awaitable version of `verify_password` that runs on the hashing pool.
+
+    Args:
+        plain_password: The password in plain text.
+        hashed_password: The hashed password from the database.
+
+    Returns:
+        True if the passwords match, False otherwise.
+    """
+    return await password_hashing_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Awaitable version of `verify_and_update_password` that runs on the hashing pool.
+    """
+    return await password_hashing_pool.run(verify_and_update_password, plain_password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Awaitable version of `hash_password` that runs on the hashing pool.
+
+    Args:
+        password: The password to hash.
+
+    Returns:
+        The hashed password as a string.
+    """
+    return await password_hashing_pool.run(hash_password, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Creates a new JWT access token.
@@ -78,25 +189,55 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
-) -> models.User:
+def _token_cache_key(token: str) -> bytes:
     """
-    Dependency to get the current user from a JWT token.
+    Returns the cache key for a token. The full token is hashed (not just its
+    signature) so that a cached entry can only be reached with the exact same token.
+    """
+    return hashlib.sha256(token.encode("utf-8")).digest()
 
-    This function is used in path operations to protect routes and identify
-    the currently authenticated user.
+
+def _snapshot_user(user: models.User) -> models.User:
+    """
+    Copies the column values of a User into a new, detached instance.
+
+    The snapshot is never attached to a session itself; each request merges
+    its own copy, so cached state cannot be modified by a route.
+    """
+    snapshot = models.User(
+        **{attr.key: getattr(user, attr.key) for attr in inspect(models.User).column_attrs}
+    )
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+
+def invalidate_user_cache(email: str) -> int:
+    """
+    Drops every cached principal that belongs to the given user.
+
+    This must be called after the user's profile or password changes, or the
+    account is deleted.
 
     Args:
-        token: The bearer token from the request's Authorization header.
-        db: The database session dependency.
+        email: The email address of the user whose entries should be dropped.
+
+    Returns:
+        The number of cache entries removed.
+    """
+    return principal_cache.discard_where(lambda principal: principal.user.email == email)
+
+
+async def _authenticate(token: str, db: AsyncSession) -> models.User:
+    """
+    Resolves a bearer token to a User attached to the given session.
+
+    Validated tokens are kept in the principal cache, so repeated requests
+    with the same token do not query the users table again until the entry
+    expires or is invalidated.
 
     Raises:
         HTTPException (401): If the token is invalid, expired, or the user
                              is not found.
-
-    Returns:
-        The SQLAlchemy User model instance for the authenticated user.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -104,6 +245,13 @@ def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    cache_key = _token_cache_key(token)
+    cached = principal_cache.get(cache_key)
+    if cached is not None:
+        # `load=False` attaches a copy of the snapshot to this request's
+        # session without emitting a SELECT.
+        return await db.merge(cached.user, load=False)
+
     try:
         # Decode the token using the secret key and algorithm from settings
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
@@ -117,10 +265,72 @@ def get_current_user(
         # This catches errors like invalid signature, malformed token, etc.
         raise credentials_exception
 
-    user = db.query(models.User).filter(models.User.email == token_data.email).first()
+    user = await db.scalar(select(models.User).where(models.User.email == token_data.email))
 
     if user is None:
         # This case handles a valid token for a user that has since been deleted.
         raise credentials_exception
 
+    # Never cache a principal for longer than its token is valid.
+    expires_in = payload["exp"] - time.time() if "exp" in payload else None
+    principal_cache.set(
+        cache_key,
+        CachedPrincipal(claims=payload, user=_snapshot_user(user)),
+        ttl_seconds=expires_in,
+    )
+
     return user
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
+) -> models.User:
+    """
+    Dependency to get the current user from a JWT token.
+
+    This function is used in path operations to protect routes and identify
+    the currently authenticated user.
+
+    Args:
+        token: The bearer token from the request's Authorization header.
+        db: The database session dependency.
+
+    Raises:
+        HTTPException (401): If the token is invalid, expired, or the user
+                             is not found.
+
+    Returns:
+        The SQLAlchemy User model instance for the authenticated user.
+    """
+    return await _authenticate(token, db)
+
+
+async def get_current_user_readonly(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_read_db)
+) -> models.User:
+    """
+    Read-only variant of `get_current_user` for GET endpoints.
+
+    The user is attached to a read-only session that may be served by a
+    replica, so the returned instance must not be modified.
+    """
+    return await _authenticate(token, db)
+
+
+# --- Shared-Secret Tokens ---
+def verify_shared_token(supplied: Optional[str], expected: str) -> None:
+    """
+    Checks a token sent in a header against a configured shared secret.
+
+    Used by the operator endpoints, which have no user behind them. While
+    no secret is configured they do not exist (404), so a default deployment
+    exposes none of them.
+
+    Raises:
+        HTTPException (404): If no secret is configured.
+        HTTPException (403): If the supplied token is missing or does not match.
+    """
+    if not expected:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if supplied is None or not hmac.compare_digest(supplied.encode(), expected.encode()):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid token")
@@ -0,0 +1,103 @@
+# backend/app/batch.py
+
+from typing import Any, Dict, Iterable, List, Optional, Type, TypeVar
+
+from fastapi import HTTPException, status
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# The maximum number of items accepted by a single batch request.
+MAX_BATCH_SIZE = 100
+
+ModelT = TypeVar("ModelT")
+
+
+def item_error(index: int, status_code: int, detail: str, item_id: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Describes why one item of a batch was rejected.
+
+    Args:
+        index: The position of the item in the request body.
+        status_code: The status the equivalent single-item request would have returned.
+        detail: A human-readable error message.
+        item_id: The ID of the targeted record, for update and delete batches.
+    """
+    error = {"index": index, "status_code": status_code, "detail": detail}
+    if item_id is not None:
+        error["id"] = item_id
+    return error
+
+
+def raise_for_item_errors(errors: List[Dict[str, Any]]) -> None:
+    """
+    Rejects the whole batch if any of its items failed a check.
+
+    Batches are all-or-nothing: nothing has been written when this raises,
+    and the response lists every failed item so the client can fix them all
+    in one go.
+
+    Raises:
+        HTTPException (422): If `errors` is not empty.
+    """
+    if errors:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=sorted(errors, key=lambda error: error["index"]),
+        )
+
+
+async def insert_many(db: AsyncSession, model: Type[ModelT], rows: List[Dict[str, Any]]) -> List[ModelT]:
+    """
+    Inserts many rows in as few round-trips as the database allows.
+
+    On databases that support it (PostgreSQL, SQLite 3.35+) this emits
+    multi-row `INSERT ... RETURNING` statements, which return the new rows
+    (including their IDs) without a `refresh` SELECT per object. The rows are
+    returned in the order they were given.
+    """
+    if db.get_bind().dialect.insert_executemany_returning_sort_by_parameter_order:
+        result = await db.scalars(insert(model).returning(model, sort_by_parameter_order=True), rows)
+        return result.all()
+
+    objects = [model(**row) for row in rows]
+    db.add_all(objects)
+    await db.flush()
+    return objects
+
+
+async def fetch_owned(db: AsyncSession, model: Type[ModelT], owner_id: int, ids: Iterable[int]) -> Dict[int, ModelT]:
+    """
+    Loads the records with the given IDs that belong to the user, in one query.
+
+    Returns:
+        A dictionary mapping each found ID to its record. IDs that do not
+        exist or belong to another user are missing from it.
+    """
+    records = await db.scalars(
+        select(model).where(model.id.in_(set(ids)), model.owner_id == owner_id)
+    )
+    return {record.id: record for record in records}
+
+
+def missing_id_errors(ids: List[int], found: Dict[int, Any], label: str) -> List[Dict[str, Any]]:
+    """
+    Builds a 404 item error for every ID that `fetch_owned` did not find.
+    """
+    return [
+        item_error(index, status.HTTP_404_NOT_FOUND, f"{label} with id {item_id} not found.", item_id)
+        for index, item_id in enumerate(ids)
+        if item_id not in found
+    ]
+
+
+def duplicate_id_errors(ids: List[int]) -> List[Dict[str, Any]]:
+    """
+    Builds an item error for every ID that appears more than once in a batch.
+    """
+    seen = set()
+    errors = []
+    for index, item_id in enumerate(ids):
+        if item_id in seen:
+            errors.append(item_error(index, status.HTTP_400_BAD_REQUEST, f"Duplicate id {item_id} in batch.", item_id))
+        seen.add(item_id)
+    return errors
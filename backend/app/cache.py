@@ -0,0 +1,122 @@
+# backend/app/cache.py
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    A small, thread-safe, in-process LRU cache whose entries expire after a TTL.
+
+    Synchronous path operations run in FastAPI's threadpool, so every access is
+    guarded by a lock. The cache keeps hit/miss/eviction counters so it can be
+    monitored through the internal stats endpoint.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        """
+        Args:
+            max_entries: The maximum number of entries kept. The least recently
+                         used entry is evicted when the cache is full.
+                         A value of 0 disables the cache.
+            ttl_seconds: The default lifetime of an entry in seconds.
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # --- Monitoring Counters ---
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Returns the cached value for `key`, or None if it is missing or expired.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            # Mark the entry as the most recently used one.
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """
+        Stores `value` under `key`.
+
+        Args:
+            key: The cache key.
+            value: The value to cache.
+            ttl_seconds: An optional lifetime that overrides the default TTL.
+                         Non-positive values mean the entry is not cached.
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        if self.max_entries <= 0 or ttl <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, key: Hashable) -> None:
+        """Removes a single entry, if present."""
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def discard_where(self, predicate: Callable[[Any], bool]) -> int:
+        """
+        Removes every entry whose value matches `predicate`.
+
+        Returns:
+            The number of entries removed.
+        """
+        with self._lock:
+            stale_keys = [key for key, (_, value) in self._entries.items() if predicate(value)]
+            for key in stale_keys:
+                del self._entries[key]
+            self.invalidations += len(stale_keys)
+        return len(stale_keys)
+
+    def clear(self) -> None:
+        """Removes all entries."""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns a snapshot of the cache's size and monitoring counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
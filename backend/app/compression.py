@@ -0,0 +1,333 @@
+# backend/app/compression.py
+
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Brotli is optional; without it, clients are offered gzip only.
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+# Only these media types are compressed. Images and other binary formats are
+# usually compressed already, so recompressing them only costs CPU.
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/msgpack",
+    "application/x-ndjson",
+    "application/xml",
+    "application/javascript",
+    "image/svg+xml",
+)
+
+# Route key used for requests that did not match an API route (e.g. static files).
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class _GzipCompressor:
+    """Incremental gzip encoder."""
+
+    def __init__(self, level: int):
+        # wbits=31 selects the gzip container (16) with a 32 KiB window (15).
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def process(self, data: bytes, final: bool) -> bytes:
+        # A sync flush ends every streamed chunk on a byte boundary, so the client
+        # can decode it without waiting for the rest of the stream.
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class _BrotliCompressor:
+    """Incremental Brotli encoder."""
+
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def process(self, data: bytes, final: bool) -> bytes:
+        output = self._compressor.process(data)
+        return output + (self._compressor.finish() if final else self._compressor.flush())
+
+
+def choose_encoding(accept_encoding: str, brotli_available: bool) -> Optional[str]:
+    """
+    Picks the content coding for a response from the `Accept-Encoding` header.
+
+    Args:
+        accept_encoding: The raw header value, e.g. "gzip, deflate, br;q=0.9".
+        brotli_available: Whether the Brotli encoder is installed.
+
+    Returns:
+        "br", "gzip", or None to send the response uncompressed. Brotli wins
+        over gzip when the client rates both equally.
+    """
+    qualities: Dict[str, float] = {}
+    for coding in accept_encoding.split(","):
+        name, *params = [part.strip().lower() for part in coding.split(";")]
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        if name:
+            qualities[name] = max(qualities.get(name, 0.0), quality)
+
+    wildcard = qualities.get("*", 0.0)
+    candidates = (["br"] if brotli_available else []) + ["gzip"]
+    best, best_quality = None, 0.0
+    for name in candidates:
+        quality = qualities.get(name, wildcard)
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+class CompressionStats:
+    """
+    Per-route counters that show how well compression pays off.
+
+    For every route this tracks how many responses were compressed or sent
+    as-is because they were below the size threshold, the bytes before and
+    after compression, and the CPU time spent compressing. The ratio and the
+    cost per MB are what `COMPRESSION_MINIMUM_SIZE` and the levels are tuned by.
+    """
+
+    def __init__(self):
+        self._routes: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _route(self, route: str) -> Dict[str, Any]:
+        counters = self._routes.get(route)
+        if counters is None:
+            counters = self._routes[route] = {
+                "compressed": 0,
+                "below_threshold": 0,
+                "bytes_in": 0,
+                "bytes_out": 0,
+                "cpu_seconds": 0.0,
+                "encodings": {},
+            }
+        return counters
+
+    def record_compressed(self, route: str, encoding: str, bytes_in: int, bytes_out: int, cpu_seconds: float) -> None:
+        with self._lock:
+            counters = self._route(route)
+            counters["compressed"] += 1
+            counters["bytes_in"] += bytes_in
+            counters["bytes_out"] += bytes_out
+            counters["cpu_seconds"] += cpu_seconds
+            counters["encodings"][encoding] = counters["encodings"].get(encoding, 0) + 1
+
+    def record_below_threshold(self, route: str) -> None:
+        with self._lock:
+            self._route(route)["below_threshold"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns a snapshot of the counters, keyed by "METHOD /path"."""
+        with self._lock:
+            routes = {}
+            for route, counters in sorted(self._routes.items()):
+                bytes_in, cpu_seconds = counters["bytes_in"], counters["cpu_seconds"]
+                routes[route] = {
+                    "compressed": counters["compressed"],
+                    "below_threshold": counters["below_threshold"],
+                    "encodings": dict(counters["encodings"]),
+                    "bytes_in": bytes_in,
+                    "bytes_out": counters["bytes_out"],
+                    "ratio": round(counters["bytes_out"] / bytes_in, 4) if bytes_in else 0.0,
+                    "cpu_ms": round(cpu_seconds * 1000, 2),
+                    "cpu_ms_per_mb": round(cpu_seconds * 1000 / (bytes_in / 1_000_000), 2) if bytes_in else 0.0,
+                }
+            return {"brotli_available": brotli is not None, "routes": routes}
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses with Brotli or gzip, as negotiated by `Accept-Encoding`.
+
+    Responses below `minimum_size` bytes are sent unchanged, as are responses
+    that are not of a compressible media type or already carry a
+    `Content-Encoding`. Streaming responses are buffered only until the
+    threshold is reached; from then on each chunk is compressed and sent as
+    it arrives.
+
+    A strong ETag on a compressed response is turned into a weak one, since
+    the bytes differ from the uncompressed variant. `If-None-Match` uses the
+    weak comparison, so conditional requests keep working. A 304 to a client
+    that accepts a coding gets the same weak ETag and `Vary` header, so it
+    matches the response a cache holds for that client.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        stats: Optional[CompressionStats] = None,
+    ):
+        """
+        Args:
+            app: The wrapped ASGI application.
+            minimum_size: Responses shorter than this many bytes are not compressed.
+            gzip_level: The zlib compression level (1-9).
+            brotli_quality: The Brotli quality (0-11).
+            stats: Where to record per-route counters. A private instance is
+                   used if omitted.
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.stats = stats or CompressionStats()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""), brotli is not None)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressingResponder(self, scope, send, encoding)
+        await self.app(scope, receive, responder.send)
+
+    def _compressor(self, encoding: str):
+        if encoding == "br":
+            return _BrotliCompressor(self.brotli_quality)
+        return _GzipCompressor(self.gzip_level)
+
+
+def _weaken_etag(headers: MutableHeaders) -> None:
+    """Turns a strong ETag into a weak one; the compressed bytes differ from the identity variant."""
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = "W/" + etag
+
+
+class _CompressingResponder:
+    """Rewrites the response messages of a single request."""
+
+    def __init__(self, middleware: CompressionMiddleware, scope: Scope, send: Send, encoding: str):
+        self.middleware = middleware
+        self.scope = scope
+        self.downstream_send = send
+        self.encoding = encoding
+
+        self.start_message: Optional[Message] = None
+        self.passthrough = False
+        self.buffer: List[bytes] = []
+        self.buffered_size = 0
+        self.compressor = None
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_seconds = 0.0
+
+    def _route_key(self) -> str:
+        # The router stores the matched route in the (shared) scope.
+        route = self.scope.get("route")
+        path = getattr(route, "path", None)
+        return f"{self.scope['method']} {path}" if path else UNMATCHED_ROUTE
+
+    def _compress(self, data: bytes, final: bool) -> bytes:
+        started_at = time.thread_time()
+        output = self.compressor.process(data, final)
+        self.cpu_seconds += time.thread_time() - started_at
+        self.bytes_in += len(data)
+        self.bytes_out += len(output)
+        return output
+
+    def _start_compression(self) -> None:
+        headers = MutableHeaders(scope=self.start_message)
+        headers["Content-Encoding"] = self.encoding
+        # The compressed length is only known once the whole body is encoded.
+        del headers["Content-Length"]
+        _weaken_etag(headers)
+        self.compressor = self.middleware._compressor(self.encoding)
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = (
+                "content-encoding" in headers
+                or message["status"] in (204, 304)
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+            )
+            if message["status"] == 304 and "content-encoding" not in headers:
+                # The 304 stands in for a compressed 200 and must carry the
+                # same validator, or a cache cannot match it to its copy.
+                not_modified_headers = MutableHeaders(scope=message)
+                _weaken_etag(not_modified_headers)
+                not_modified_headers.add_vary_header("Accept-Encoding")
+            if self.passthrough:
+                await self.downstream_send(message)
+            else:
+                MutableHeaders(scope=message).add_vary_header("Accept-Encoding")
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.downstream_send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        # Already streaming compressed output.
+        if self.compressor is not None:
+            await self.downstream_send({
+                "type": "http.response.body",
+                "body": self._compress(body, final=not more_body),
+                "more_body": more_body,
+            })
+            if not more_body:
+                self._record()
+            return
+
+        self.buffer.append(body)
+        self.buffered_size += len(body)
+
+        if not more_body:
+            data = b"".join(self.buffer)
+            if len(data) < self.middleware.minimum_size:
+                self.middleware.stats.record_below_threshold(self._route_key())
+                await self.downstream_send(self.start_message)
+                await self.downstream_send({"type": "http.response.body", "body": data})
+                return
+            self._start_compression()
+            compressed = self._compress(data, final=True)
+            MutableHeaders(scope=self.start_message)["Content-Length"] = str(len(compressed))
+            await self.downstream_send(self.start_message)
+            await self.downstream_send({"type": "http.response.body", "body": compressed})
+            self._record()
+            return
+
+        # A streaming response: keep buffering until the threshold is reached.
+        if self.buffered_size >= self.middleware.minimum_size:
+            self._start_compression()
+            await self.downstream_send(self.start_message)
+            await self.downstream_send({
+                "type": "http.response.body",
+                "body": self._compress(b"".join(self.buffer), final=False),
+                "more_body": True,
+            })
+            self.buffer = []
+
+    def _record(self) -> None:
+        self.middleware.stats.record_compressed(
+            self._route_key(), self.encoding, self.bytes_in, self.bytes_out, self.cpu_seconds
+        )
+
+
+# Shared by the middleware in `main.py` and the internal stats endpoint.
+compression_stats = CompressionStats()
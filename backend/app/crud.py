@@ -0,0 +1,61 @@
+# backend/app/crud.py
+
+from typing import Any, Dict, Optional, Type, TypeVar
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+ModelT = TypeVar("ModelT")
+
+
+async def update_owned(
+    db: AsyncSession, model: Type[ModelT], owner_id: int, record_id: int, values: Dict[str, Any]
+) -> Optional[ModelT]:
+    """
+    Updates one record of a user with a single owner-scoped UPDATE statement.
+
+    On databases that support `UPDATE ... RETURNING` (PostgreSQL, SQLite
+    3.35+) the updated row comes back from the same statement, so an edit
+    needs no SELECT before or after it. Other databases run the UPDATE and
+    then read the row back.
+
+    Args:
+        db: The session of the write request.
+        model: The mapped class, which must have `id` and `owner_id` columns.
+        owner_id: The ID of the authenticated user.
+        record_id: The ID of the record to update.
+        values: The columns to change. If empty, the record is only read.
+
+    Returns:
+        The updated record, or None if no record with this ID belongs to the user.
+    """
+    owned = (model.id == record_id, model.owner_id == owner_id)
+
+    if not values:
+        return await db.scalar(select(model).where(*owned))
+
+    stmt = update(model).where(*owned).values(**values)
+
+    if db.get_bind().dialect.update_returning:
+        return await db.scalar(stmt.returning(model))
+
+    result = await db.execute(stmt)
+    if result.rowcount == 0:
+        return None
+    return await db.scalar(select(model).where(*owned))
+
+
+async def delete_owned(db: AsyncSession, model: Type[ModelT], owner_id: int, record_id: int) -> bool:
+    """
+    Deletes one record of a user with a single owner-scoped DELETE statement.
+
+    The affected row count tells whether the record existed, so no SELECT is
+    needed first. Every supported driver reports it reliably for DELETE.
+
+    Returns:
+        True if a record was deleted, False if none with this ID belongs to the user.
+    """
+    result = await db.execute(
+        delete(model).where(model.id == record_id, model.owner_id == owner_id)
+    )
+    return result.rowcount > 0
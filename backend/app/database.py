@@ -1,21 +1,353 @@
 # backend/app/database.py
 
-from sqlalchemy import create_engine
+import asyncio
+import hashlib
+import itertools
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Type
+from uuid import uuid4
+
+from fastapi import Request
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
 
+from app.cache import TTLCache
 # Import the settings instance from our config file.
 from app.config import settings
 
+
+# --- Connection Pool Instrumentation ---
+class PoolStats:
+    """
+    Thread-safe counters describing how a connection pool is being used.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record_checkout(self, waited: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def record_connect(self) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def record_invalidation(self) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            checkouts = self.checkouts
+            return {
+                "checkouts": checkouts,
+                "checkout_timeouts": self.timeouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "avg_checkout_wait_ms": round(self.total_wait_seconds / checkouts * 1000, 3) if checkouts else 0.0,
+                "max_checkout_wait_ms": round(self.max_wait_seconds * 1000, 3),
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    A QueuePool that measures how long each checkout waits for a connection.
+
+    SQLAlchemy has no "before checkout" event, so the wait is timed around
+    the pool's own `_do_get`, which blocks while the pool is exhausted.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.record_timeout()
+            raise
+        self.stats.record_checkout(time.perf_counter() - started_at)
+        return connection
+
+    def recreate(self):
+        # Keep the counters when the pool is rebuilt, e.g. by `engine.dispose()`.
+        new_pool = super().recreate()
+        new_pool.stats = self.stats
+        return new_pool
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """The asyncio-compatible variant of InstrumentedQueuePool."""
+
+
+def _async_database_url(url: str) -> URL:
+    """
+    Converts the configured DATABASE_URL into its asyncio-driver equivalent:
+    asyncpg for PostgreSQL and aiosqlite for local SQLite runs.
+    """
+    database_url = make_url(url)
+    async_drivers = {
+        "postgresql": "postgresql+asyncpg",
+        "sqlite": "sqlite+aiosqlite",
+    }
+    backend = database_url.get_backend_name()
+    if backend in async_drivers:
+        return database_url.set(drivername=async_drivers[backend])
+    return database_url
+
+
+def _engine_options(url: str, poolclass: Type[Pool] = InstrumentedQueuePool) -> Dict[str, Any]:
+    """
+    Builds the engine keyword arguments for the configured pool.
+
+    In-memory SQLite databases keep SQLAlchemy's default single-connection
+    pool, because every new connection would otherwise see an empty database.
+    """
+    database_url = make_url(url)
+    if database_url.get_backend_name() == "sqlite" and database_url.database in (None, "", ":memory:"):
+        return {}
+
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def _async_engine_options(url: str) -> Dict[str, Any]:
+    """
+    Builds the keyword arguments of an asyncio engine.
+
+    Behind PgBouncer in transaction pooling mode, a prepared statement may
+    be used from a different server connection than the one it was created
+    on ("prepared statement __asyncpg_stmt_N__ does not exist"). asyncpg's
+    statement caches are therefore disabled, and every statement gets a
+    unique name, so names never collide on a shared server connection.
+    """
+    options = _engine_options(url, poolclass=InstrumentedAsyncQueuePool)
+    if settings.DB_PGBOUNCER_TRANSACTION_POOLING and make_url(url).get_backend_name() == "postgresql":
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    return options
+
+
+def _install_pool_listeners(engine: Engine) -> None:
+    """
+    Attaches the connection-level event listeners to an engine: pool counters
+    and, for PostgreSQL, the statement timeout.
+
+    The timeout is set with SET instead of a startup option, because PgBouncer
+    rejects unknown startup parameters. A session-level SET, once per pooled
+    connection, only holds while the client keeps its server connection, i.e.
+    without PgBouncer or in session pooling mode. In transaction pooling mode
+    it would stay behind on whichever server connection ran it, so it is set
+    with SET LOCAL at the start of every transaction instead.
+    """
+    statement_timeout = (
+        int(settings.DB_STATEMENT_TIMEOUT_MS)
+        if settings.DB_STATEMENT_TIMEOUT_MS > 0 and engine.dialect.name == "postgresql"
+        else 0
+    )
+    per_transaction = settings.DB_PGBOUNCER_TRANSACTION_POOLING
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        stats = getattr(engine.pool, "stats", None)
+        if stats is not None:
+            stats.record_connect()
+
+        if statement_timeout and not per_transaction:
+            cursor = dbapi_connection.cursor()
+            cursor.execute(f"SET statement_timeout = {statement_timeout}")
+            cursor.close()
+            # The driver ran the SET in a transaction; commit it, or the pool's
+            # rollback on check-in would undo it after the first checkout.
+            dbapi_connection.commit()
+
+    if statement_timeout and per_transaction:
+        @event.listens_for(engine, "begin")
+        def on_begin(connection):
+            connection.exec_driver_sql(f"SET LOCAL statement_timeout = {statement_timeout}")
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        stats = getattr(engine.pool, "stats", None)
+        if stats is not None:
+            stats.record_invalidation()
+
+
+def get_pool_stats(engine: Engine) -> Dict[str, Any]:
+    """
+    Returns the current state and counters of an engine's connection pool.
+
+    Args:
+        engine: The engine whose pool should be described.
+
+    Returns:
+        A dictionary suitable for the internal stats endpoint.
+    """
+    pool = engine.pool
+    summary: Dict[str, Any] = {"pool_class": type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        summary.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "timeout_seconds": pool.timeout(),
+        })
+
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        summary.update(stats.snapshot())
+
+    return summary
+
+
 # Create the SQLAlchemy engine. The engine is the starting point for any
 # SQLAlchemy application. It's the 'home base' for the actual database.
-# We connect it using the DATABASE_URL from our settings.
-engine = create_engine(settings.DATABASE_URL)
+# We connect it using the DATABASE_URL from our settings, with the pool
+# sized and tuned through the DB_* settings.
+engine = create_engine(settings.DATABASE_URL, **_engine_options(settings.DATABASE_URL))
+_install_pool_listeners(engine)
+
+# The asyncio engine used by the API routes. It shares the pool settings with
+# the synchronous engine, so request concurrency is bounded by the pool size
+# rather than by the size of Starlette's threadpool.
+async_engine = create_async_engine(
+    _async_database_url(settings.DATABASE_URL),
+    **_async_engine_options(settings.DATABASE_URL),
+)
+_install_pool_listeners(async_engine.sync_engine)
 
 # Create a SessionLocal class. Each instance of SessionLocal will be a
 # database session. The session is the primary interface for all database
 # operations like adding, updating, and deleting records.
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# The asyncio counterpart of SessionLocal. Objects are not expired on commit,
+# because an expired attribute cannot be lazily reloaded outside of an await.
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+# --- Read Replicas ---
+class Replica:
+    """
+    A read-only database replica with its own engine, session factory and
+    health state.
+
+    Health is checked with a `SELECT 1` at most once per
+    REPLICA_HEALTH_CHECK_SECONDS. A failed check, or a request that loses its
+    connection, takes the replica out of rotation for REPLICA_RETRY_SECONDS.
+    """
+
+    def __init__(self, url: str):
+        self.url = make_url(url)
+        self.engine = create_async_engine(
+            _async_database_url(url),
+            **_async_engine_options(url),
+        )
+        _install_pool_listeners(self.engine.sync_engine)
+        self.session_factory = async_sessionmaker(bind=self.engine, autoflush=False, expire_on_commit=False)
+
+        self.healthy = True
+        self.checked_at = 0.0
+        self.retry_at = 0.0
+        self.failures = 0
+
+    def mark_unhealthy(self, reason: Exception) -> None:
+        self.healthy = False
+        self.retry_at = time.monotonic() + settings.REPLICA_RETRY_SECONDS
+        self.failures += 1
+        print(f"Replica {self.url.render_as_string(hide_password=True)} marked unhealthy: {reason}")
+
+    async def is_available(self) -> bool:
+        """Returns True if the replica is healthy, running a health check when one is due."""
+        now = time.monotonic()
+        if not self.healthy and now < self.retry_at:
+            return False
+        if self.healthy and now - self.checked_at < settings.REPLICA_HEALTH_CHECK_SECONDS:
+            return True
+
+        try:
+            async with self.engine.connect() as connection:
+                await asyncio.wait_for(
+                    connection.execute(text("SELECT 1")),
+                    timeout=settings.REPLICA_HEALTH_CHECK_TIMEOUT_SECONDS,
+                )
+        except Exception as exc:
+            self.mark_unhealthy(exc)
+            return False
+
+        self.healthy = True
+        self.checked_at = now
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "url": self.url.render_as_string(hide_password=True),
+            "healthy": self.healthy,
+            "failures": self.failures,
+            "pool": get_pool_stats(self.engine.sync_engine),
+        }
+
+
+replicas: List[Replica] = [
+    Replica(url.strip()) for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()
+]
+_replica_rotation = itertools.cycle(replicas)
+
+# Clients that recently sent a write are pinned to the primary for a few
+# seconds, so they read their own writes even if the replicas lag behind.
+_recent_writers = TTLCache(max_entries=10_000, ttl_seconds=settings.REPLICA_READ_AFTER_WRITE_SECONDS)
+
+_SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def _client_key(request: Request) -> Optional[bytes]:
+    """Identifies the client behind a request by its bearer token."""
+    authorization = request.headers.get("authorization")
+    if not authorization:
+        return None
+    return hashlib.sha256(authorization.encode("utf-8")).digest()
+
+
+async def _choose_replica() -> Optional[Replica]:
+    """Returns the next available replica in round-robin order, or None."""
+    for _ in range(len(replicas)):
+        replica = next(_replica_rotation)
+        if await replica.is_available():
+            return replica
+    return None
+
 # Create a Base class. Our ORM models (like User, Medication, etc.) will
 # inherit from this class. This is how SQLAlchemy connects our Python objects
 # to the database tables.
@@ -39,3 +371,56 @@ def get_db() -> Session:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db(request: Request) -> AsyncIterator[AsyncSession]:
+    """
+    FastAPI dependency to get an asyncio database session for each request.
+
+    The session always uses the primary database. It checks out a connection
+    only when the first query runs and returns it to the pool when the request
+    is finished, even if an error occurred.
+
+    Yields:
+        An active SQLAlchemy AsyncSession.
+    """
+    if replicas and request.method not in _SAFE_METHODS:
+        client_key = _client_key(request)
+        if client_key is not None:
+            _recent_writers.set(client_key, True)
+
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db(request: Request) -> AsyncIterator[AsyncSession]:
+    """
+    FastAPI dependency to get a read-only asyncio session for GET endpoints.
+
+    The session is served by a healthy read replica when replicas are
+    configured. It falls back to the primary when no replica is available, or
+    when the same client sent a write within REPLICA_READ_AFTER_WRITE_SECONDS.
+
+    Yields:
+        An active SQLAlchemy AsyncSession that must only be used for reads.
+    """
+    replica = None
+    if replicas:
+        client_key = _client_key(request)
+        if client_key is None or _recent_writers.get(client_key) is None:
+            replica = await _choose_replica()
+
+    if replica is None:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+
+    async with replica.session_factory() as db:
+        try:
+            yield db
+        except DBAPIError as exc:
+            # A lost connection takes the replica out of rotation, so the
+            # following requests fall back to the primary.
+            if exc.connection_invalidated:
+                replica.mark_unhealthy(exc)
+            raise
@@ -0,0 +1,135 @@
+# backend/app/hash_calibration.py
+
+"""
+Benchmarks password hashing costs on the current host.
+
+Usage (from the `backend` directory):
+    python -m app.hash_calibration --target-ms 250
+
+For each candidate bcrypt work factor (and argon2 parameter set, when
+argon2-cffi is installed) this reports the time per hash and the throughput
+per CPU core, then recommends the strongest setting that stays within the
+target latency. Pin the result with the PASSWORD_HASH_* settings in `.env`.
+
+This module deliberately does not import `app.config`, so it can be run on a
+new host before the application is configured.
+"""
+
+import argparse
+import os
+import statistics
+import time
+from typing import Dict, List, Optional
+
+from passlib.hash import argon2, bcrypt
+
+CALIBRATION_PASSWORD = "calibration-password-1234"
+
+BCRYPT_CANDIDATES = [10, 11, 12, 13, 14]
+
+# (time_cost, memory_cost in KiB, parallelism)
+ARGON2_CANDIDATES = [
+    (2, 19456, 1),
+    (2, 65536, 1),
+    (3, 65536, 4),
+    (2, 102400, 8),
+    (4, 262144, 4),
+]
+
+
+def _time_hash(handler, samples: int) -> float:
+    """
+    Hashes the calibration password `samples` times and returns the median
+    duration of a single hash in seconds.
+    """
+    handler.hash(CALIBRATION_PASSWORD)  # Warm-up, e.g. for argon2 memory allocation.
+    durations = []
+    for _ in range(samples):
+        started_at = time.perf_counter()
+        handler.hash(CALIBRATION_PASSWORD)
+        durations.append(time.perf_counter() - started_at)
+    return statistics.median(durations)
+
+
+def benchmark(samples: int) -> List[Dict]:
+    """
+    Benchmarks every candidate setting available on this host.
+
+    Returns:
+        One result dictionary per candidate, including the settings that would
+        pin it in `.env`.
+    """
+    results = []
+
+    for rounds in BCRYPT_CANDIDATES:
+        seconds = _time_hash(bcrypt.using(rounds=rounds), samples)
+        results.append({
+            "scheme": "bcrypt",
+            "params": f"rounds={rounds}",
+            "seconds": seconds,
+            "env": {"PASSWORD_HASH_SCHEME": "bcrypt", "BCRYPT_ROUNDS": rounds},
+        })
+
+    if argon2.has_backend():
+        for time_cost, memory_cost, parallelism in ARGON2_CANDIDATES:
+            handler = argon2.using(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+            seconds = _time_hash(handler, samples)
+            results.append({
+                "scheme": "argon2",
+                "params": f"t={time_cost} m={memory_cost}KiB p={parallelism}",
+                "seconds": seconds,
+                "env": {
+                    "PASSWORD_HASH_SCHEME": "argon2",
+                    "ARGON2_TIME_COST": time_cost,
+                    "ARGON2_MEMORY_COST": memory_cost,
+                    "ARGON2_PARALLELISM": parallelism,
+                },
+            })
+
+    return results
+
+
+def recommend(results: List[Dict], scheme: str, target_ms: float) -> Optional[Dict]:
+    """
+    Returns the slowest (i.e. strongest) candidate of `scheme` that still hashes
+    within `target_ms`, or None if every candidate is too slow.
+    """
+    within_target = [r for r in results if r["scheme"] == scheme and r["seconds"] * 1000 <= target_ms]
+    return max(within_target, key=lambda r: r["seconds"]) if within_target else None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark password hashing costs on this host.")
+    parser.add_argument("--target-ms", type=float, default=250.0,
+                        help="The maximum acceptable time for a single hash (default: 250).")
+    parser.add_argument("--samples", type=int, default=5,
+                        help="The number of timed hashes per candidate (default: 5).")
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    print(f"Benchmarking password hashing on {cores} CPU core(s), {args.samples} samples per candidate...")
+    if not argon2.has_backend():
+        print("argon2-cffi is not installed; only bcrypt candidates will be measured.")
+    print()
+
+    results = benchmark(args.samples)
+
+    print(f"{'scheme':<8} {'parameters':<28} {'ms/hash':>9} {'hashes/s/core':>14} {'hashes/s (host)':>16}")
+    for r in results:
+        per_core = 1 / r["seconds"]
+        print(f"{r['scheme']:<8} {r['params']:<28} {r['seconds'] * 1000:>9.1f} {per_core:>14.2f} {per_core * cores:>16.2f}")
+    print()
+
+    for scheme in ("bcrypt", "argon2"):
+        best = recommend(results, scheme, args.target_ms)
+        if best is None:
+            if any(r["scheme"] == scheme for r in results):
+                print(f"No {scheme} candidate hashes within {args.target_ms:.0f} ms on this host.")
+            continue
+        print(f"Recommended {scheme} setting ({best['seconds'] * 1000:.0f} ms/hash):")
+        for key, value in best["env"].items():
+            print(f"    {key}={value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# backend/app/hashing.py
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class HashingPool:
+    """
+    A dedicated, size-limited worker pool for CPU-heavy password hashing.
+
+    bcrypt releases the GIL while it hashes, so a thread pool gives real
+    parallelism without the cost of a process pool. Keeping hashing off the
+    event loop and out of Starlette's default threadpool means a burst of
+    logins only queues up behind other logins, not behind unrelated requests.
+    """
+
+    def __init__(self, max_workers: int):
+        """
+        Args:
+            max_workers: The number of threads that may hash at the same time.
+        """
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+
+        # --- Monitoring Counters ---
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+        self.max_run_seconds = 0.0
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Runs `func(*args)` on the pool and waits for the result without
+        blocking the event loop.
+        """
+        submitted_at = time.perf_counter()
+        with self._lock:
+            self.queued += 1
+
+        def task() -> T:
+            started_at = time.perf_counter()
+            waited = started_at - submitted_at
+            with self._lock:
+                self.queued -= 1
+                self.running += 1
+                self.total_wait_seconds += waited
+                self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+            succeeded = False
+            try:
+                result = func(*args)
+                succeeded = True
+                return result
+            finally:
+                ran = time.perf_counter() - started_at
+                with self._lock:
+                    self.running -= 1
+                    self.completed += 1
+                    if not succeeded:
+                        self.failed += 1
+                    self.total_run_seconds += ran
+                    self.max_run_seconds = max(self.max_run_seconds, ran)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, task)
+
+    def shutdown(self) -> None:
+        """Waits for queued work to finish and stops the worker threads."""
+        self._executor.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns a snapshot of the pool's queue depth and latency counters."""
+        with self._lock:
+            completed = self.completed
+            return {
+                "max_workers": self.max_workers,
+                "queue_depth": self.queued,
+                "running": self.running,
+                "completed": completed,
+                "failed": self.failed,
+                "avg_wait_ms": round(self.total_wait_seconds / completed * 1000, 2) if completed else 0.0,
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 2),
+                "avg_run_ms": round(self.total_run_seconds / completed * 1000, 2) if completed else 0.0,
+                "max_run_ms": round(self.max_run_seconds * 1000, 2),
+            }
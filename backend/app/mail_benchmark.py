@@ -0,0 +1,185 @@
+# backend/app/mail_benchmark.py
+
+"""
+Measures outgoing mail throughput against a local stand-in SMTP server.
+
+Usage (from the `backend` directory; requires `pip install aiosmtpd`):
+    python -m app.mail_benchmark --messages 500 --pool-size 4
+
+It starts an aiosmtpd server on localhost that requires STARTTLS (with a
+throwaway self-signed certificate) and a login, like a real provider, and
+accepts every message without delivering it. The reminder email is then
+sent `--messages` times:
+
+    per-message   - a new FastMail connection (connect, STARTTLS, login) for
+                    every message, as the app did before the connection pool.
+    pooled x1     - `app.mailer.SMTPPool` with one connection, one message at a time.
+    pooled xN     - the pool with `--pool-size` connections, sending concurrently
+                    the way the reminder job does.
+
+`--latency-ms` adds a delay to every SMTP reply, to approximate a remote server.
+"""
+
+import argparse
+import asyncio
+import datetime
+import logging
+import socket
+import ssl
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import Any, Dict
+
+from fastapi_mail import ConnectionConfig, FastMail, MessageSchema
+
+from app.mailer import SMTPPool
+from app.reminders import build_reminder_message
+
+try:
+    from aiosmtpd.controller import Controller
+    from aiosmtpd.smtp import AuthResult
+except ImportError:  # pragma: no cover - optional, only needed for the benchmark
+    Controller = None
+
+
+class _AcceptingHandler:
+    """Accepts every message, optionally after a delay, and counts them."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.received = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        await asyncio.sleep(self.latency)
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        await asyncio.sleep(self.latency)
+        self.received += 1
+        return "250 OK"
+
+
+def _self_signed_context(directory: str) -> ssl.SSLContext:
+    """Creates a server TLS context with a new self-signed certificate for localhost."""
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name).issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now).not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    cert_path, key_path = f"{directory}/cert.pem", f"{directory}/key.pem"
+    with open(cert_path, "wb") as file:
+        file.write(certificate.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, "wb") as file:
+        file.write(key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        ))
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(cert_path, key_path)
+    return context
+
+
+def _free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def _sample_message(number: int) -> MessageSchema:
+    medications = [
+        SimpleNamespace(name="Metformin", dosage="500 mg", timing=datetime.time(8, 0)),
+        SimpleNamespace(name="Atorvastatin", dosage="10 mg", timing=datetime.time(21, 0)),
+    ]
+    batch = SimpleNamespace(email=f"user{number}@example.com", full_name=f"Benchmark User {number}", medications=medications)
+    return build_reminder_message(batch)
+
+
+async def _run(name: str, messages: int, send, concurrency: int) -> Dict[str, Any]:
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one(number: int) -> None:
+        async with slots:
+            await send(_sample_message(number))
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(one(number) for number in range(messages)))
+    seconds = time.perf_counter() - started_at
+    return {"name": name, "seconds": seconds}
+
+
+async def benchmark(config: ConnectionConfig, messages: int, pool_size: int, max_messages: int) -> list:
+    results = []
+
+    async def per_message(message: MessageSchema) -> None:
+        await FastMail(config).send_message(message)
+
+    results.append(await _run("per-message", messages, per_message, 1))
+
+    for size in (1, pool_size):
+        pool = SMTPPool(config, size=size, max_messages=max_messages, idle_seconds=60)
+        result = await _run(f"pooled x{size}", messages, pool.send, size)
+        await pool.close()
+        result["opened"] = pool.opened
+        results.append(result)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure mail throughput against a local SMTP server.")
+    parser.add_argument("--messages", type=int, default=500,
+                        help="The number of messages per run (default: 500).")
+    parser.add_argument("--pool-size", type=int, default=4,
+                        help="The number of connections of the concurrent pooled run (default: 4).")
+    parser.add_argument("--max-messages", type=int, default=100,
+                        help="Messages per pooled connection before it is replaced (default: 100).")
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="A delay added to the server's EHLO and DATA replies (default: 0).")
+    args = parser.parse_args()
+
+    if Controller is None:
+        raise SystemExit("aiosmtpd is not installed; run `pip install aiosmtpd` first.")
+
+    # aiosmtpd logs a warning about its own use of a deprecated attribute on every login.
+    logging.getLogger("mail.log").setLevel(logging.ERROR)
+    handler = _AcceptingHandler(args.latency_ms / 1000)
+    with tempfile.TemporaryDirectory() as directory:
+        controller = Controller(
+            handler, hostname="127.0.0.1", port=_free_port(),
+            tls_context=_self_signed_context(directory), require_starttls=True,
+            authenticator=lambda *args: AuthResult(success=True), auth_require_tls=True,
+        )
+        controller.start()
+        try:
+            config = ConnectionConfig(
+                MAIL_USERNAME="benchmark", MAIL_PASSWORD="benchmark", MAIL_FROM="reminders@example.com",
+                MAIL_PORT=controller.port, MAIL_SERVER="127.0.0.1",
+                MAIL_STARTTLS=True, MAIL_SSL_TLS=False, USE_CREDENTIALS=True, VALIDATE_CERTS=False,
+            )
+            print(f"Sending {args.messages} messages per run to a local STARTTLS server "
+                  f"({args.latency_ms:.0f} ms reply latency)...")
+            print()
+            results = asyncio.run(benchmark(config, args.messages, args.pool_size, args.max_messages))
+        finally:
+            controller.stop()
+
+    print(f"{'transport':<13} {'seconds':>8} {'messages/s':>11} {'connections':>12}")
+    for r in results:
+        connections = r.get("opened", args.messages)
+        print(f"{r['name']:<13} {r['seconds']:>8.2f} {args.messages / r['seconds']:>11.1f} {connections:>12}")
+    print(f"The server accepted {handler.received} messages.")
+
+
+if __name__ == "__main__":
+    main()
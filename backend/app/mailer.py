@@ -0,0 +1,246 @@
+# backend/app/mailer.py
+
+import asyncio
+import socket
+import time
+from typing import Any, Dict, List, Optional
+
+import aiosmtplib
+from fastapi_mail import ConnectionConfig, FastMail, MessageSchema
+
+from app.config import settings
+
+# --- Email Connection Configuration ---
+# This configuration object reads email server settings from your .env file
+# via the global `settings` instance. It's used to connect to your email
+# provider's SMTP server and to build the messages.
+conf = ConnectionConfig(
+    MAIL_USERNAME=settings.MAIL_USERNAME,
+    MAIL_PASSWORD=settings.MAIL_PASSWORD,
+    MAIL_FROM=settings.MAIL_FROM,
+    MAIL_PORT=settings.MAIL_PORT,
+    MAIL_SERVER=settings.MAIL_SERVER,
+    MAIL_STARTTLS=True,
+    MAIL_SSL_TLS=False,
+    USE_CREDENTIALS=True,
+    VALIDATE_CERTS=True
+)
+
+# Errors after which a message is retried once on a new connection: the
+# server closed an idle connection, or the connection broke mid-send.
+_CONNECTION_ERRORS = (aiosmtplib.SMTPServerDisconnected, ConnectionError, asyncio.TimeoutError)
+
+
+class _PooledConnection:
+    """An open, authenticated SMTP session and how much it has been used."""
+    __slots__ = ("smtp", "loop", "sent", "idle_since")
+
+    def __init__(self, smtp: aiosmtplib.SMTP, loop: asyncio.AbstractEventLoop):
+        self.smtp = smtp
+        self.loop = loop
+        self.sent = 0
+        self.idle_since = time.monotonic()
+
+
+class SMTPPool:
+    """
+    A small pool of persistent, authenticated SMTP connections.
+
+    Opening an SMTP connection costs a TCP connect, a STARTTLS handshake and
+    a login, which is far more than sending one message over it. The pool
+    keeps up to `size` connections open between messages and hands them out
+    one message at a time, so at most `size` messages are sent concurrently
+    and the rest wait for a connection.
+
+    A connection is closed and replaced after `max_messages` messages (many
+    providers limit messages per session), after `idle_seconds` without use
+    (before the server drops it), and after any error. A message that fails
+    because a reused connection had gone stale is retried once on a new one.
+
+    Messages are built by fastapi-mail, exactly as `FastMail.send_message`
+    would build them, and `SUPPRESS_SEND` is honoured.
+    """
+
+    def __init__(self, config: ConnectionConfig, size: int, max_messages: int, idle_seconds: float):
+        """
+        Args:
+            config: The SMTP server, credentials and sender.
+            size: The maximum number of open connections.
+            max_messages: The number of messages sent over a connection before it is replaced.
+            idle_seconds: How long an unused connection is kept open.
+        """
+        self.config = config
+        self.size = size
+        self.max_messages = max_messages
+        self.idle_seconds = idle_seconds
+        self._builder = FastMail(config)
+        # Idle connections, most recently used last.
+        self._idle: List[_PooledConnection] = []
+        # Bound to the event loop the pool is used from; reset if that changes
+        # (connections cannot be shared across event loops).
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+        # --- Monitoring Counters ---
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.opened = 0
+        self.recycled = 0
+        self.expired = 0
+        self.errors = 0
+        self.in_use = 0
+
+    def _bind_loop(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.size)
+            # Connections of the old loop cannot be used from this one; close
+            # them rather than leave them open until the server drops them.
+            idle, self._idle = self._idle, []
+            for connection in idle:
+                if connection.loop is loop:
+                    self._idle.append(connection)
+                else:
+                    self._discard(connection)
+        return self._slots
+
+    async def _open(self) -> _PooledConnection:
+        smtp = aiosmtplib.SMTP(
+            hostname=self.config.MAIL_SERVER,
+            port=self.config.MAIL_PORT,
+            timeout=self.config.TIMEOUT,
+            use_tls=self.config.MAIL_SSL_TLS,
+            start_tls=self.config.MAIL_STARTTLS,
+            validate_certs=self.config.VALIDATE_CERTS,
+            local_hostname=self.config.LOCAL_HOSTNAME,
+            cert_bundle=self.config.CERT_BUNDLE,
+        )
+        await smtp.connect()
+        try:
+            if self.config.USE_CREDENTIALS:
+                await smtp.login(self.config.MAIL_USERNAME, self.config.MAIL_PASSWORD.get_secret_value())
+        except Exception:
+            smtp.close()
+            raise
+        self.opened += 1
+        return _PooledConnection(smtp, asyncio.get_running_loop())
+
+    def _acquire_idle(self) -> Optional[_PooledConnection]:
+        """Takes the most recently used idle connection that is still fit for use."""
+        while self._idle:
+            connection = self._idle.pop()
+            if connection.smtp.is_connected and time.monotonic() - connection.idle_since < self.idle_seconds:
+                return connection
+            self.expired += 1
+            connection.smtp.close()
+        return None
+
+    async def _release(self, connection: _PooledConnection) -> None:
+        connection.sent += 1
+        if connection.sent >= self.max_messages:
+            self.recycled += 1
+            await self._quit(connection)
+            return
+        connection.idle_since = time.monotonic()
+        self._idle.append(connection)
+
+    @staticmethod
+    async def _quit(connection: _PooledConnection) -> None:
+        try:
+            await connection.smtp.quit()
+        except Exception:
+            connection.smtp.close()
+
+    @staticmethod
+    def _discard(connection: _PooledConnection) -> None:
+        """
+        Closes a connection opened on another event loop. Once that loop is
+        closed it cannot close the transport any more, so the socket is shut
+        down directly instead.
+        """
+        if not connection.loop.is_closed():
+            connection.smtp.close()
+            return
+        transport, connection.smtp.transport = connection.smtp.transport, None
+        sock = transport.get_extra_info("socket") if transport is not None else None
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass  # Already disconnected.
+
+    async def send(self, message: MessageSchema) -> None:
+        """
+        Sends one message over a pooled connection, waiting for one if all are busy.
+
+        Raises:
+            Any error of building or sending the message, after the one retry
+            on a new connection for connection errors.
+        """
+        prepared = await self._builder.get_message(message)
+        if self.config.SUPPRESS_SEND:
+            return
+
+        async with self._bind_loop():
+            self.in_use += 1
+            try:
+                connection = self._acquire_idle()
+                reused = connection is not None
+                while True:
+                    if connection is None:
+                        connection = await self._open()
+                    try:
+                        await connection.smtp.send_message(prepared)
+                    except Exception as error:
+                        self.errors += 1
+                        connection.smtp.close()
+                        connection = None
+                        if reused and isinstance(error, _CONNECTION_ERRORS):
+                            reused = False
+                            self.retried += 1
+                            continue
+                        raise
+                    break
+                await self._release(connection)
+                self.sent += 1
+            except Exception:
+                self.failed += 1
+                raise
+            finally:
+                self.in_use -= 1
+
+    async def close(self) -> None:
+        """Closes the idle connections, e.g. on application shutdown."""
+        idle, self._idle = self._idle, []
+        for connection in idle:
+            if connection.loop is asyncio.get_running_loop():
+                await self._quit(connection)
+            else:
+                self._discard(connection)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns a snapshot of the pool's connections and counters."""
+        return {
+            "size": self.size,
+            "max_messages": self.max_messages,
+            "idle": len(self._idle),
+            "in_use": self.in_use,
+            "sent": self.sent,
+            "failed": self.failed,
+            "retried": self.retried,
+            "opened": self.opened,
+            "recycled": self.recycled,
+            "expired": self.expired,
+            "errors": self.errors,
+        }
+
+
+# Shared by the password reset emails in `app.utils` and the daily reminders in `app.reminders`.
+mailer = SMTPPool(
+    conf,
+    size=settings.MAIL_POOL_SIZE,
+    max_messages=settings.MAIL_POOL_MAX_MESSAGES,
+    idle_seconds=settings.MAIL_POOL_IDLE_SECONDS,
+)
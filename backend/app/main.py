@@ -9,22 +9,30 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
+from app.auth import password_hashing_pool
+from app.compression import CompressionMiddleware, compression_stats
 from app.config import settings
-from app.database import Base, engine
+from app.database import engine
+from app.mailer import mailer
 from app.reminders import send_daily_reminders
 from app.routes import (
     appointment_routes,
     contact_routes,
+    dashboard_routes,
+    internal_routes,
     medication_routes,
+    search_routes,
+    suggest_routes,
     tip_routes,
     user_routes,
 )
+from app.schema import upgrade_schema
 
 
 # --- Database Initialization ---
-# This command creates all the database tables defined in our models.
-# It checks if the tables exist before creating them, so it's safe to run on every startup.
-Base.metadata.create_all(bind=engine)
+# This creates all the database tables and indexes defined in our models.
+# It checks if they exist before creating them, so it's safe to run on every startup.
+upgrade_schema(engine)
 
 
 # --- Application Lifespan Management ---
@@ -39,7 +47,8 @@ async def lifespan(app: FastAPI):
     """
     Manages the application's startup and shutdown events.
     - On startup: Schedules and starts the daily reminder job.
-    - On shutdown: Shuts down the scheduler gracefully.
+    - On shutdown: Shuts down the scheduler, the password hashing pool and
+      the SMTP connection pool gracefully.
     """
     print("Application startup: Starting scheduler...")
     # Schedule the `send_daily_reminders` function to run every day at 7:00 AM IST.
@@ -51,6 +60,8 @@ async def lifespan(app: FastAPI):
     
     print("Application shutdown: Shutting down scheduler...")
     scheduler.shutdown()
+    password_hashing_pool.shutdown()
+    await mailer.close()
     print("Scheduler shut down successfully.")
 
 
@@ -86,9 +97,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allow all HTTP methods
     allow_headers=["*"],  # Allow all headers
+    expose_headers=["X-Next-Cursor", "ETag"],  # Let browser clients read cursors and validators
 )
 
 
+# --- Response Compression ---
+# Added last, so it is the outermost middleware and compresses the final response.
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        stats=compression_stats,
+    )
+
+
 # --- API Routers ---
 # Include the routers from the 'routes' package. This keeps the API
 # endpoints organized in separate files.
@@ -97,6 +121,10 @@ app.include_router(medication_routes.router)
 app.include_router(appointment_routes.router)
 app.include_router(contact_routes.router)
 app.include_router(tip_routes.router)
+app.include_router(dashboard_routes.router)
+app.include_router(suggest_routes.router)
+app.include_router(search_routes.router)
+app.include_router(internal_routes.router)
 
 
 # --- Root Endpoint ---
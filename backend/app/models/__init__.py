@@ -17,6 +17,7 @@ create all tables from the `Base.metadata`.
 
 from .appointment import Appointment
 from .contact import Contact
+from .data_version import DataVersion
 from .medication import Medication
 from .tip import Tip
 from .user import User
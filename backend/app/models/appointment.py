@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, relationship
 
 from app.database import Base
@@ -31,6 +31,13 @@ class Appointment(Base):
     # The `back_populates` parameter must match the relationship name in the User model.
     owner: Mapped["User"] = relationship("User", back_populates="appointments")
 
+    # --- Indexes ---
+    # Appointments are always listed per owner and by date, so this composite
+    # index serves both the owner filter and date-range lookups.
+    __table_args__ = (
+        Index("ix_appointments_owner_datetime", "owner_id", "appointment_datetime"),
+    )
+
     def __repr__(self) -> str:
         """String representation of the Appointment object."""
         return f"<Appointment(id={self.id}, doctor_name='{self.doctor_name}', owner_id={self.owner_id})>"
@@ -30,7 +30,8 @@ class Contact(Base):
     # --- Table Constraints ---
     # This constraint ensures that a single user cannot have two contacts
     # with the exact same phone number. This enforces data integrity at the
-    # database level.
+    # database level. Its index starts with `owner_id`, so it also serves the
+    # owner-scoped contact lookups.
     __table_args__ = (
         UniqueConstraint('owner_id', 'phone_number', name='_owner_phone_uc'),
     )
@@ -0,0 +1,32 @@
+# backend/app/models/data_version.py
+
+from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, relationship
+
+from app.database import Base
+
+
+class DataVersion(Base):
+    """
+    SQLAlchemy model representing the version of one of a user's collections.
+
+    Every write to a user's medications, appointments or contacts increments
+    the matching row, so list endpoints can tell whether a client's cached
+    copy is still current by reading this single row instead of the
+    collection itself.
+    """
+    __tablename__ = "data_versions"
+
+    # --- Table Columns ---
+    # The composite primary key makes each lookup a single index probe.
+    owner_id: Mapped[int] = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    # The name of the collection, e.g. "medications".
+    collection: Mapped[str] = Column(String, primary_key=True)
+    version: Mapped[int] = Column(Integer, default=0, nullable=False)
+
+    # --- Relationships ---
+    owner: Mapped["User"] = relationship("User", back_populates="data_versions")
+
+    def __repr__(self) -> str:
+        """String representation of the DataVersion object."""
+        return f"<DataVersion(owner_id={self.owner_id}, collection='{self.collection}', version={self.version})>"
@@ -2,7 +2,7 @@
 
 from datetime import time
 
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Time
+from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, String, Time
 from sqlalchemy.orm import Mapped, relationship
 
 from app.database import Base
@@ -31,6 +31,14 @@ class Medication(Base):
     # a user's medications via `user.medications`.
     owner: Mapped["User"] = relationship("User", back_populates="medications")
 
+    # --- Indexes ---
+    # Every medication query is scoped to one owner. The list endpoint filters on
+    # `owner_id`, and the reminder job additionally filters on `is_active` and
+    # sorts by `timing`, so all three are covered by one composite index.
+    __table_args__ = (
+        Index("ix_medications_owner_active_timing", "owner_id", "is_active", "timing"),
+    )
+
     def __repr__(self) -> str:
         """String representation of the Medication object."""
         return f"<Medication(id={self.id}, name='{self.name}', owner_id={self.owner_id})>"
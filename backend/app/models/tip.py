@@ -1,5 +1,7 @@
 # backend/app/models/tip.py
 
+from typing import Optional
+
 from sqlalchemy import Column, Integer, String, Text
 from sqlalchemy.orm import Mapped
 
@@ -20,6 +22,9 @@ class Tip(Base):
     category: Mapped[str] = Column(String, index=True, default="General", nullable=False)
     # The main content/text of the health tip.
     content: Mapped[str] = Column(Text, nullable=False)
+    # SHA-256 of the normalized content (see `app.tip_ingest.content_hash`).
+    # The unique index keeps the same tip from being stored twice.
+    content_hash: Mapped[Optional[str]] = Column(String(64), unique=True, index=True, nullable=True)
 
     def __repr__(self) -> str:
         """String representation of the Tip object."""
@@ -3,7 +3,7 @@
 from datetime import date
 from typing import List, Optional
 
-from sqlalchemy import Boolean, Column, Date, Integer, String
+from sqlalchemy import Boolean, Column, Date, Index, Integer, String
 from sqlalchemy.orm import Mapped, relationship
 
 from app.database import Base
@@ -30,6 +30,11 @@ class User(Base):
     # User preference for receiving daily email reminders.
     send_reminders: Mapped[bool] = Column(Boolean, default=True, nullable=False)
 
+    # The number of emergency contacts the user has. It is kept up to date by
+    # the contact routes in the same transaction as each insert or delete, and
+    # lets the contact limit be enforced with a single conditional UPDATE.
+    contact_count: Mapped[int] = Column(Integer, default=0, server_default="0", nullable=False)
+
     # --- Relationships ---
     # These relationships link the user to their associated data in other tables.
     # The `cascade="all, delete-orphan"` option means that if a user is deleted,
@@ -45,7 +50,21 @@ class User(Base):
     contacts: Mapped[List["Contact"]] = relationship(
         "Contact", back_populates="owner", cascade="all, delete-orphan"
     )
+    data_versions: Mapped[List["DataVersion"]] = relationship(
+        "DataVersion", back_populates="owner", cascade="all, delete-orphan"
+    )
 
     def __repr__(self) -> str:
         """String representation of the User object."""
         return f"<User(id={self.id}, email='{self.email}')>"
+
+
+# --- Indexes ---
+# The daily reminder job only reads users who opted in. This partial index
+# contains just those users, so the job does not scan everyone who opted out.
+Index(
+    "ix_users_reminder_opt_in",
+    User.id,
+    postgresql_where=User.send_reminders == True,
+    sqlite_where=User.send_reminders == True,
+)
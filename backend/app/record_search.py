@@ -0,0 +1,148 @@
+# backend/app/record_search.py
+
+from typing import Any, Dict, List, Sequence, Tuple
+
+from sqlalchemy import DateTime, String, func, literal, null, or_, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+from app.tip_search import tokenize
+
+# --- Record Kinds ---
+MEDICATIONS = "medications"
+APPOINTMENTS = "appointments"
+CONTACTS = "contacts"
+
+# The searched tables, in the order groups with equally good matches are listed.
+MODELS = {MEDICATIONS: models.Medication, APPOINTMENTS: models.Appointment, CONTACTS: models.Contact}
+
+# The columns each kind of record contributes to the combined query, as
+# (title, subtitle, detail, at). Every query returns the same shape, so the
+# three tables can be searched with a single UNION ALL.
+RESULT_COLUMNS = {
+    MEDICATIONS: (models.Medication.name, models.Medication.dosage, None, None),
+    APPOINTMENTS: (
+        models.Appointment.doctor_name, models.Appointment.purpose,
+        models.Appointment.location, models.Appointment.appointment_datetime,
+    ),
+    CONTACTS: (models.Contact.name, models.Contact.relationship_type, models.Contact.phone_number, None),
+}
+
+# The searched fields of each kind, by their position in RESULT_COLUMNS, and
+# their weights: a match on what identifies a record counts more.
+SEARCHED_FIELDS = {
+    MEDICATIONS: ((0, 3.0), (1, 1.0)),                # name, dosage
+    APPOINTMENTS: ((0, 3.0), (1, 2.0), (2, 1.0)),     # doctor_name, purpose, location
+    CONTACTS: ((0, 3.0), (1, 2.0)),                   # name, relationship_type
+}
+
+# A word that merely starts with a query term ("cardio" in "cardiologist")
+# counts this much of a match on the whole word.
+PREFIX_MATCH = 0.5
+
+
+def _like_pattern(term: str) -> str:
+    """A LIKE pattern for a term anywhere in a column. Terms are word characters, so only `_` needs escaping."""
+    return "%" + term.replace("_", "\\_") + "%"
+
+
+def _kind_query(kind: str, owner_id: int, terms: Sequence[str]):
+    """
+    Selects one user's records of one kind that contain any of the terms.
+
+    The substring test is only a filter that keeps the rows to rank small;
+    whether a term matches at the start of a word is decided by `_score`.
+    """
+    model = MODELS[kind]
+    columns = RESULT_COLUMNS[kind]
+    title, subtitle, detail, at = columns
+    searched = [columns[position] for position, _ in SEARCHED_FIELDS[kind]]
+    matches_any = or_(*(
+        func.lower(column).like(_like_pattern(term), escape="\\")
+        for column in searched for term in terms
+    ))
+    return (
+        select(
+            literal(kind).label("kind"),
+            model.id.label("id"),
+            title.label("title"),
+            subtitle.label("subtitle"),
+            (detail if detail is not None else null().cast(String)).label("detail"),
+            (at if at is not None else null().cast(DateTime)).label("at"),
+        )
+        .where(model.owner_id == owner_id, matches_any)
+    )
+
+
+def _score(kind: str, row: Any, terms: Sequence[str]) -> float:
+    """
+    Scores a record: for every query term, the weight of the best field it
+    matches, where a whole-word match counts fully and a word-prefix match
+    counts PREFIX_MATCH. Records matching more terms, or matching them in
+    more important fields, rank higher.
+    """
+    values = (row.title, row.subtitle, row.detail, row.at)
+    field_words = [(set(tokenize(values[position] or "")), weight) for position, weight in SEARCHED_FIELDS[kind]]
+
+    score = 0.0
+    for term in terms:
+        best = 0.0
+        for words, weight in field_words:
+            if term in words:
+                best = max(best, weight)
+            elif any(word.startswith(term) for word in words):
+                best = max(best, weight * PREFIX_MATCH)
+        score += best
+    return score
+
+
+async def search_records(
+    db: AsyncSession, owner_id: int, query: str, limit_per_kind: int
+) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """
+    Searches a user's medications, appointments and contacts at once.
+
+    Args:
+        db: The session to query with.
+        owner_id: The ID of the user whose records are searched.
+        query: The search text. Its words are matched at the start of the
+               words of the searched fields, case-insensitively.
+        limit_per_kind: The maximum number of records returned per kind.
+
+    Returns:
+        The query terms, and one group per kind with any matches, the group
+        with the best match first. Each group has the kind, the total number
+        of matches and the best `limit_per_kind` records, best first.
+    """
+    terms = sorted(set(tokenize(query)))
+    if not terms:
+        return terms, []
+
+    rows = await db.execute(union_all(*(_kind_query(kind, owner_id, terms) for kind in MODELS)))
+
+    scored: Dict[str, List[Tuple[float, Any]]] = {kind: [] for kind in MODELS}
+    for row in rows:
+        score = _score(row.kind, row, terms)
+        if score > 0:
+            scored[row.kind].append((score, row))
+
+    groups = []
+    for kind, matches in scored.items():
+        if not matches:
+            continue
+        matches.sort(key=lambda match: (-match[0], match[1].id))
+        groups.append({
+            "kind": kind,
+            "total": len(matches),
+            "best_score": matches[0][0],
+            "results": [
+                {
+                    "id": row.id, "title": row.title, "subtitle": row.subtitle,
+                    "detail": row.detail, "at": row.at, "score": score,
+                }
+                for score, row in matches[:limit_per_kind]
+            ],
+        })
+    # `sort` is stable, so groups with equally good matches keep the order of MODELS.
+    groups.sort(key=lambda group: -group["best_score"])
+    return terms, groups
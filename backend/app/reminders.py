@@ -1,27 +1,97 @@
 # backend/app/reminders.py
 
+import asyncio
+import time
 from datetime import datetime
-from typing import List
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List
 
 import pytz
-from fastapi_mail import FastMail, MessageSchema
-from sqlalchemy.orm import Session
+from fastapi_mail import MessageSchema
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import models
-from app.database import SessionLocal
-from app.utils import conf  # Import the email config from utils.py
+from app.database import AsyncSessionLocal
+from app.mailer import mailer
 
 # Set the timezone to Indian Standard Time for accurate scheduling and display.
 IST = pytz.timezone("Asia/Kolkata")
 
+# How many rows the server-side cursor fetches at a time. Memory use of the
+# job is bounded by this, not by the number of users.
+REMINDER_FETCH_ROWS = 1000
 
-def create_email_body(user: models.User, meds_today: List[models.Medication]) -> str:
+
+class ReminderBatch:
+    """
+    One user's reminder: who to send it to and their active medications.
+
+    The medications are the projected result rows (`name`, `dosage`,
+    `timing`), not ORM objects, and a batch is dropped once its email is sent.
+    """
+    __slots__ = ("user_id", "email", "full_name", "medications")
+
+    def __init__(self, user_id: int, email: str, full_name: str):
+        self.user_id = user_id
+        self.email = email
+        self.full_name = full_name
+        self.medications: List[Any] = []
+
+
+def reminder_query():
+    """
+    The single query behind the reminder job: every active medication of
+    every user who has reminders enabled, with only the columns the email
+    needs, ordered by user and time so each user's rows arrive together.
+
+    The order matches the (owner_id, is_active, timing) index on medications,
+    and users without active medications are left out by the join.
+    """
+    return (
+        select(
+            models.User.id.label("user_id"),
+            models.User.email,
+            models.User.full_name,
+            models.Medication.name,
+            models.Medication.dosage,
+            models.Medication.timing,
+        )
+        .join(models.Medication, models.Medication.owner_id == models.User.id)
+        .where(models.User.send_reminders == True, models.Medication.is_active == True)
+        .order_by(models.Medication.owner_id, models.Medication.timing)
+    )
+
+
+async def iter_reminder_batches(db: AsyncSession, fetch_rows: int = REMINDER_FETCH_ROWS) -> AsyncIterator[ReminderBatch]:
+    """
+    Streams the reminder query through a server-side cursor and yields one
+    `ReminderBatch` per user, as soon as the user's last row has arrived.
+
+    Args:
+        db: The session to run the query on. Its connection stays busy until
+            the iteration ends.
+        fetch_rows: How many rows are fetched from the cursor at a time.
+    """
+    result = await db.stream(reminder_query().execution_options(yield_per=fetch_rows))
+    batch = None
+    async for row in result:
+        if batch is None or row.user_id != batch.user_id:
+            if batch is not None:
+                yield batch
+            batch = ReminderBatch(row.user_id, row.email, row.full_name)
+        batch.medications.append(row)
+    if batch is not None:
+        yield batch
+
+
+def create_email_body(user: Any, meds_today: List[Any]) -> str:
     """
     Generates a user-friendly HTML email body for the daily reminder.
 
     Args:
-        user: The user object to whom the email is being sent.
-        meds_today: A list of the user's active medications for the day.
+        user: The recipient; anything with a `full_name`, such as a `User` or a `ReminderBatch`.
+        meds_today: The user's active medications for the day; anything with
+                    `name`, `dosage` and `timing`, such as `Medication` objects or result rows.
 
     Returns:
         A string containing the complete HTML for the email body.
@@ -68,49 +138,81 @@ def create_email_body(user: models.User, meds_today: List[models.Medication]) ->
     return html
 
 
+def build_reminder_message(batch: ReminderBatch) -> MessageSchema:
+    """Builds the reminder email for one user."""
+    return MessageSchema(
+        subject=f"💊 Your Medication Schedule for Today - {datetime.now(IST).strftime('%B %d')}",
+        recipients=[batch.email],
+        body=create_email_body(batch, batch.medications),
+        subtype="html"
+    )
+
+
+async def process_reminders(
+    db: AsyncSession, deliver: Callable[[MessageSchema], Awaitable[None]]
+) -> Dict[str, Any]:
+    """
+    Builds and delivers the reminder of every user with active medications.
+
+    Args:
+        db: The session to read the users and medications with.
+        deliver: Sends one message. The scheduled job sends it by email;
+                 the benchmark in `app.reminders_benchmark` only counts it.
+
+    Returns:
+        The number of reminders and medications processed, and the time taken.
+    """
+    started_at = time.perf_counter()
+    reminders = medications = 0
+    async for batch in iter_reminder_batches(db):
+        await deliver(build_reminder_message(batch))
+        reminders += 1
+        medications += len(batch.medications)
+    return {"reminders": reminders, "medications": medications, "seconds": round(time.perf_counter() - started_at, 3)}
+
+
 async def send_daily_reminders():
     """
     The main job function executed by the scheduler.
 
-    It queries the database for all users who have reminders enabled,
-    fetches their active medications, and sends them a personalized
-    reminder email.
+    It streams every active medication of the users who have reminders
+    enabled from one joined query, ordered by user, and sends each user a
+    personalized reminder email as soon as their rows have been read. Users
+    without active medications get no email.
+
+    The emails go through the shared SMTP connection pool, as many at a time
+    as it has connections. A failed email is logged and does not stop the job.
     """
-    # Create a new database session specifically for this background task.
-    db: Session = SessionLocal()
-    try:
-        # Fetch all users who have the 'send_reminders' preference set to True.
-        users_to_remind = db.query(models.User).filter(models.User.send_reminders == True).all()
-        
-        print(f"[{datetime.now(IST).strftime('%Y-%m-%d %H:%M:%S')}] Running daily reminder job. Found {len(users_to_remind)} users to remind.")
-
-        for user in users_to_remind:
-            # For each user, fetch only their medications that are marked as 'is_active'.
-            meds_today = db.query(models.Medication).filter(
-                models.Medication.owner_id == user.id,
-                models.Medication.is_active == True
-            ).all()
-
-            # If the user has no active medications, skip sending an email.
-            if not meds_today:
-                print(f"Skipping reminder for {user.email} (no active medications).")
-                continue
-
-            html_body = create_email_body(user, meds_today)
-
-            message = MessageSchema(
-                subject=f"💊 Your Medication Schedule for Today - {datetime.now(IST).strftime('%B %d')}",
-                recipients=[user.email],
-                body=html_body,
-                subtype="html"
+    print(f"[{datetime.now(IST).strftime('%Y-%m-%d %H:%M:%S')}] Running daily reminder job.")
+
+    pending = set()
+    failures = 0
+
+    async def send(message: MessageSchema) -> None:
+        nonlocal failures
+        try:
+            await mailer.send(message)
+            print(f"Successfully sent reminder to {message.recipients[0]}")
+        except Exception as e:
+            failures += 1
+            print(f"Failed to send reminder to {message.recipients[0]}. Error: {e}")
+
+    async def deliver(message: MessageSchema) -> None:
+        # Keep the pool busy, but read no further ahead than it can send.
+        while len(pending) >= mailer.size:
+            _, still_pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            pending.intersection_update(still_pending)
+        pending.add(asyncio.create_task(send(message)))
+
+    # A dedicated session for this background task; it is closed when the block exits.
+    async with AsyncSessionLocal() as db:
+        try:
+            report = await process_reminders(db, deliver)
+            if pending:
+                await asyncio.wait(pending)
+            print(
+                f"Daily reminder job finished: {report['reminders']} reminders "
+                f"({report['medications']} medications, {failures} failed) in {report['seconds']}s."
             )
-
-            fm = FastMail(conf)
-            await fm.send_message(message)
-            print(f"Successfully sent reminder to {user.email}")
-            
-    except Exception as e:
-        print(f"An error occurred during the reminder job: {e}")
-    finally:
-        # It's crucial to close the database session in a background task.
-        db.close()
+        except Exception as e:
+            print(f"An error occurred during the reminder job: {e}")
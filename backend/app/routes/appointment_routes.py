@@ -1,26 +1,113 @@
 # backend/app/routes/appointment_routes.py
 
-from typing import List
+import base64
+import binascii
+from datetime import datetime
+from typing import List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app import models
-from app.auth import get_current_user
-from app.database import get_db
-from app.schemas import appointment_schema
+from app import batch, crud, models, versioning
+from app.auth import get_current_user, get_current_user_readonly
+from app.config import settings
+from app.database import get_async_db, get_async_read_db
+from app.schemas import appointment_schema, batch_schema
+from app.serialization import FIELDS_DESCRIPTION, NegotiatedRoute, RowSerializer
+from app.suggest import DOCTOR, suggestions
 
 # Create a new router for appointment-related endpoints.
 router = APIRouter(
     prefix="/appointments",  # All routes in this file will start with /appointments
-    tags=["Appointments"]    # Group these routes under "Appointments" in the API docs
+    tags=["Appointments"],   # Group these routes under "Appointments" in the API docs
+    route_class=NegotiatedRoute,  # Serve MessagePack to clients that ask for it
 )
 
+# Page size limits for the appointment list.
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# Serializes projected appointment rows for the fast JSON path and sparse fieldsets.
+appointment_rows = RowSerializer(models.Appointment, appointment_schema.AppointmentShow)
+
+
+def _encode_cursor(appointment_datetime: datetime, appointment_id: int) -> str:
+    """
+    Encodes the sort key of the last appointment on a page into an opaque,
+    URL-safe cursor.
+    """
+    raw = f"{appointment_datetime.isoformat()}|{appointment_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decodes a cursor produced by `_encode_cursor` back into its sort key.
+
+    Raises:
+        HTTPException (400): If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        timestamp, appointment_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(timestamp), int(appointment_id)
+    except (ValueError, binascii.Error, UnicodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor."
+        )
+
+
+def _as_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """
+    Appointment times are stored as naive local times, so any timezone offset
+    on a query parameter is dropped before comparing.
+    """
+    return value.replace(tzinfo=None) if value is not None and value.tzinfo else value
+
+
+def appointments_page_query(
+    owner_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    after: Optional[Tuple[datetime, int]] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+):
+    """
+    Builds the query for one page of a user's appointments, ordered by date.
+
+    It fetches one row more than `limit`, to find out whether another page
+    exists. `app.query_plan_check` checks that it is served by the
+    (owner_id, appointment_datetime) index.
+
+    Args:
+        owner_id: The ID of the user whose appointments are listed.
+        start: Only appointments at or after this time.
+        end: Only appointments before this time.
+        after: The (appointment_datetime, id) of the last appointment of the previous page.
+        limit: The page size.
+    """
+    query = select(models.Appointment).where(models.Appointment.owner_id == owner_id)
+
+    if start is not None:
+        query = query.where(models.Appointment.appointment_datetime >= _as_naive(start))
+    if end is not None:
+        query = query.where(models.Appointment.appointment_datetime < _as_naive(end))
+    if after is not None:
+        after_datetime, after_id = after
+        query = query.where(
+            tuple_(models.Appointment.appointment_datetime, models.Appointment.id) > tuple_(after_datetime, after_id)
+        )
+
+    return query.order_by(models.Appointment.appointment_datetime, models.Appointment.id).limit(limit + 1)
+
 
 @router.post("/", response_model=appointment_schema.AppointmentShow, status_code=status.HTTP_201_CREATED)
-def create_appointment(
+async def create_appointment(
     appointment: appointment_schema.AppointmentCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
     """
@@ -39,39 +126,185 @@ def create_appointment(
         owner_id=current_user.id  # Assign the appointment to the current user
     )
     db.add(new_appointment)
-    db.commit()
-    db.refresh(new_appointment)
+    await versioning.bump_version(db, current_user.id, versioning.APPOINTMENTS)
+    await db.commit()
+    await db.refresh(new_appointment)
+    suggestions.add(current_user.id, DOCTOR, [new_appointment.doctor_name])
     return new_appointment
 
 
-@router.get("/", response_model=List[appointment_schema.AppointmentShow])
-def get_all_user_appointments(
-    db: Session = Depends(get_db),
+# --- Batch Endpoints ---
+# Declared before the `/{appointment_id}` routes so that "batch" is never parsed as an ID.
+
+@router.post("/batch", response_model=List[appointment_schema.AppointmentShow], status_code=status.HTTP_201_CREATED)
+async def create_appointments_batch(
+    appointments: List[appointment_schema.AppointmentCreate] = Body(..., min_length=1, max_length=batch.MAX_BATCH_SIZE),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
     """
-    Retrieves a list of all appointments for the currently authenticated user.
+    Creates several appointments for the currently authenticated user at once.
+
+    The rows are written with multi-row `INSERT ... RETURNING` statements and
+    committed in a single transaction, so either every appointment is created or none is.
     """
-    appointments = db.query(models.Appointment).filter(
-        models.Appointment.owner_id == current_user.id
-    ).all()
+    new_appointments = await batch.insert_many(
+        db, models.Appointment, [{**appointment.model_dump(), "owner_id": current_user.id} for appointment in appointments]
+    )
+    await versioning.bump_version(db, current_user.id, versioning.APPOINTMENTS)
+    await db.commit()
+    suggestions.add(current_user.id, DOCTOR, [appointment.doctor_name for appointment in appointments])
+    return new_appointments
+
+
+@router.patch("/batch", response_model=List[appointment_schema.AppointmentShow])
+async def update_appointments_batch(
+    updates: List[appointment_schema.AppointmentBatchUpdate] = Body(..., min_length=1, max_length=batch.MAX_BATCH_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """
+    Applies partial updates to several appointments in one transaction.
+
+    Each item carries the ID of the appointment and only the fields to change. If
+    any ID is unknown or repeated, nothing is changed and the response lists
+    the failing items.
+    """
+    ids = [update.id for update in updates]
+    appointments = await batch.fetch_owned(db, models.Appointment, current_user.id, ids)
+    batch.raise_for_item_errors(batch.duplicate_id_errors(ids) + batch.missing_id_errors(ids, appointments, "Appointment"))
+
+    # (old name, new name) of the appointments whose doctor changed, for the suggestion index.
+    renamed = [
+        (appointments[update.id].doctor_name, update.doctor_name)
+        for update in updates if "doctor_name" in update.model_fields_set
+    ]
+    for update in updates:
+        for key, value in update.model_dump(exclude_unset=True, exclude={"id"}).items():
+            setattr(appointments[update.id], key, value)
+
+    if any(update.model_fields_set - {"id"} for update in updates):
+        await versioning.bump_version(db, current_user.id, versioning.APPOINTMENTS)
+    await db.commit()
+    suggestions.remove(current_user.id, DOCTOR, [old for old, _ in renamed])
+    suggestions.add(current_user.id, DOCTOR, [new for _, new in renamed])
+    return [appointments[item_id] for item_id in ids]
+
+
+@router.delete("/batch", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_appointments_batch(
+    body: batch_schema.BatchDelete,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """
+    Deletes several appointments in one transaction.
+
+    If any ID is unknown or repeated, nothing is deleted and the response
+    lists the failing items.
+    """
+    appointments = await batch.fetch_owned(db, models.Appointment, current_user.id, body.ids)
+    batch.raise_for_item_errors(batch.duplicate_id_errors(body.ids) + batch.missing_id_errors(body.ids, appointments, "Appointment"))
+
+    await db.execute(
+        delete(models.Appointment).where(
+            models.Appointment.id.in_(body.ids),
+            models.Appointment.owner_id == current_user.id
+        )
+    )
+    await versioning.bump_version(db, current_user.id, versioning.APPOINTMENTS)
+    await db.commit()
+    suggestions.remove(current_user.id, DOCTOR, [appointment.doctor_name for appointment in appointments.values()])
+    return None
+
+
+@router.get("/", response_model=List[appointment_schema.AppointmentShow])
+async def get_all_user_appointments(
+    request: Request,
+    response: Response,
+    start: Optional[datetime] = Query(None, description="Only return appointments at or after this time."),
+    end: Optional[datetime] = Query(None, description="Only return appointments before this time."),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="The maximum number of appointments to return."),
+    cursor: Optional[str] = Query(None, description="The `X-Next-Cursor` value from the previous page."),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: models.User = Depends(get_current_user_readonly)
+):
+    """
+    Retrieves the appointments of the currently authenticated user, ordered by date.
+
+    Results can be limited to a `start`/`end` range and are paginated with a
+    keyset cursor: when more appointments are available, the response carries
+    an `X-Next-Cursor` header to pass as `cursor` for the next page. Each page
+    is read from the (owner_id, appointment_datetime) index, so its cost does
+    not grow with the length of the user's history.
+
+    Every page carries an ETag; a request whose `If-None-Match` still matches
+    is answered with `304 Not Modified` without reading the appointments table.
+    With FAST_JSON_RESPONSES enabled, only the displayed columns are selected
+    and the rows are encoded with orjson instead of per-row Pydantic models.
+    Requesting a subset of `fields` always takes that path, for just those columns.
+    """
+    serializer = appointment_rows.only(fields)
+    projected = serializer is not appointment_rows or settings.FAST_JSON_RESPONSES
+
+    not_modified = await versioning.check_not_modified(
+        request, response, db, current_user.id, versioning.APPOINTMENTS
+    )
+    if not_modified is not None:
+        return not_modified
+
+    after = _decode_cursor(cursor) if cursor is not None else None
+    query = appointments_page_query(current_user.id, start, end, after, limit)
+
+    # Projected rows and ORM objects both expose the columns as attributes. The
+    # sort key is always selected, as the next cursor is built from it.
+    if projected:
+        columns = serializer.columns_with("appointment_datetime", "id")
+        appointments = (await db.execute(query.with_only_columns(*columns))).all()
+    else:
+        appointments = (await db.scalars(query)).all()
+
+    if len(appointments) > limit:
+        appointments = appointments[:limit]
+        last = appointments[-1]
+        response.headers["X-Next-Cursor"] = _encode_cursor(last.appointment_datetime, last.id)
+
+    if projected:
+        return serializer.response(appointments, request, response)
     return appointments
 
 
 @router.get("/{appointment_id}", response_model=appointment_schema.AppointmentShow)
-def get_appointment_by_id(
+async def get_appointment_by_id(
     appointment_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    request: Request,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: models.User = Depends(get_current_user_readonly)
 ):
     """
     Retrieves a specific appointment by its ID.
     Ensures the appointment belongs to the currently authenticated user.
+
+    With a subset of `fields`, only those columns are selected and returned.
     """
-    appointment = db.query(models.Appointment).filter(
+    serializer = appointment_rows.only(fields)
+    query = select(models.Appointment).where(
         models.Appointment.id == appointment_id,
         models.Appointment.owner_id == current_user.id
-    ).first()
+    )
+
+    if serializer is not appointment_rows:
+        row = (await db.execute(query.with_only_columns(*serializer.columns))).first()
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Appointment with id {appointment_id} not found"
+            )
+        return serializer.response_one(row, request)
+
+    appointment = await db.scalar(query)
 
     if not appointment:
         raise HTTPException(
@@ -82,21 +315,22 @@ def get_appointment_by_id(
 
 
 @router.put("/{appointment_id}", response_model=appointment_schema.AppointmentShow)
-def update_appointment(
+async def update_appointment(
     appointment_id: int,
     appointment_update: appointment_schema.AppointmentUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
     """
     Updates an existing appointment by its ID.
     Ensures the appointment belongs to the currently authenticated user.
+
+    The change is a single owner-scoped `UPDATE ... RETURNING`, so the
+    appointment is neither read before nor refreshed after the update.
     """
-    appointment_query = db.query(models.Appointment).filter(
-        models.Appointment.id == appointment_id,
-        models.Appointment.owner_id == current_user.id
-    )
-    db_appointment = appointment_query.first()
+    # `exclude_unset=True` ensures we only update fields that were actually provided.
+    update_data = appointment_update.model_dump(exclude_unset=True)
+    db_appointment = await crud.update_owned(db, models.Appointment, current_user.id, appointment_id, update_data)
 
     if not db_appointment:
         raise HTTPException(
@@ -104,39 +338,38 @@ def update_appointment(
             detail=f"Appointment with id {appointment_id} not found"
         )
 
-    # `exclude_unset=True` ensures we only update fields that were provided.
-    update_data = appointment_update.model_dump(exclude_unset=True)
-    appointment_query.update(update_data, synchronize_session=False)
-
-    db.commit()
-    db.refresh(db_appointment)  # Refresh the instance to get the updated data
+    if update_data:
+        # An empty update changes nothing, so the cached lists stay valid.
+        await versioning.bump_version(db, current_user.id, versioning.APPOINTMENTS)
+        await db.commit()
+    if "doctor_name" in update_data:
+        # The previous name is not known without reading the row, so the index is rebuilt.
+        suggestions.invalidate(current_user.id, DOCTOR)
     return db_appointment
 
 
-@router.delete("/{appointment_id}", status_code=status.HTTP_24_NO_CONTENT)
-def delete_appointment(
+@router.delete("/{appointment_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_appointment(
     appointment_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
     """
     Deletes an appointment by its ID.
     Ensures the appointment belongs to the currently authenticated user.
-    """
-    appointment_query = db.query(models.Appointment).filter(
-        models.Appointment.id == appointment_id,
-        models.Appointment.owner_id == current_user.id
-    )
-    appointment = appointment_query.first()
 
-    if not appointment:
+    A single owner-scoped DELETE is issued; its affected row count tells
+    whether the appointment existed.
+    """
+    if not await crud.delete_owned(db, models.Appointment, current_user.id, appointment_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Appointment with id {appointment_id} not found"
         )
 
-    appointment_query.delete(synchronize_session=False)
-    db.commit()
+    await versioning.bump_version(db, current_user.id, versioning.APPOINTMENTS)
+    await db.commit()
+    suggestions.invalidate(current_user.id, DOCTOR)
 
     # A 204 response should not return any content.
     return None
@@ -1,30 +1,104 @@
 # backend/app/routes/contact_routes.py
 
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import delete, insert, literal, select, update
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app import models
-from app.auth import get_current_user
-from app.database import get_db
-from app.schemas import contact_schema
+from app import batch, crud, models, versioning
+from app.auth import get_current_user, get_current_user_readonly
+from app.config import settings
+from app.database import get_async_db, get_async_read_db
+from app.schemas import batch_schema, contact_schema
+from app.serialization import FIELDS_DESCRIPTION, NegotiatedRoute, RowSerializer
 
 # Create a new router for contact-related endpoints.
 router = APIRouter(
     prefix="/contacts",
-    tags=["Contacts"]
+    tags=["Contacts"],
+    route_class=NegotiatedRoute,  # Serve MessagePack to clients that ask for it
 )
 
 # Define a constant for the maximum number of contacts allowed per user.
 MAX_CONTACTS_PER_USER = 5
 
+# Serializes projected contact rows for the fast JSON path and sparse fieldsets.
+contact_rows = RowSerializer(models.Contact, contact_schema.ContactShow)
+
+
+# --- Contact Limit ---
+# The limit is enforced with the `users.contact_count` counter instead of a
+# COUNT over the contacts table. A conditional UPDATE of the user's row both
+# checks and takes the slot, and the row lock it holds until commit makes
+# concurrent creates for the same user wait for each other.
+
+async def _claim_contact_slots(db: AsyncSession, owner_id: int, count: int) -> bool:
+    """
+    Reserves `count` contact slots for the user in a single statement.
+
+    Returns:
+        True if the slots were taken, False if they would exceed MAX_CONTACTS_PER_USER.
+    """
+    result = await db.execute(
+        update(models.User)
+        .where(
+            models.User.id == owner_id,
+            models.User.contact_count <= MAX_CONTACTS_PER_USER - count
+        )
+        .values(contact_count=models.User.contact_count + count)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+async def _release_contact_slots(db: AsyncSession, owner_id: int, count: int) -> None:
+    """
+    Gives back `count` contact slots after contacts were deleted.
+    """
+    await db.execute(
+        update(models.User)
+        .where(models.User.id == owner_id)
+        .values(contact_count=models.User.contact_count - count)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _insert_contact_if_slot_free(owner_id: int, values: dict):
+    """
+    Builds one PostgreSQL statement that takes a contact slot and inserts the
+    contact only if the slot was free, returning the new contact (or no row).
+
+    The slot is claimed by an `UPDATE ... RETURNING` in a CTE, and the INSERT
+    selects from that CTE, so the limit check and the insert are a single
+    round-trip.
+    """
+    users = models.User.__table__
+    contacts = models.Contact.__table__
+
+    slot = (
+        update(users)
+        .where(users.c.id == owner_id, users.c.contact_count < MAX_CONTACTS_PER_USER)
+        .values(contact_count=users.c.contact_count + 1)
+        .returning(users.c.id)
+        .cte("slot")
+    )
+    columns = list(values)
+    return (
+        insert(models.Contact)
+        .from_select(
+            [*columns, "owner_id"],
+            select(*[literal(values[column], type_=contacts.c[column].type) for column in columns], slot.c.id)
+        )
+        .returning(models.Contact)
+    )
+
 
 @router.post("/", response_model=contact_schema.ContactShow, status_code=status.HTTP_201_CREATED)
-def create_contact(
+async def create_contact(
     contact: contact_schema.ContactCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
     """
@@ -33,107 +107,278 @@ def create_contact(
     Enforces two business rules:
     1. A user cannot have more than MAX_CONTACTS_PER_USER contacts.
     2. A user cannot have two contacts with the same phone number.
+
+    Both rules hold under concurrent requests. On PostgreSQL the limit check
+    and the insert are one statement; other databases use two.
     """
-    # Rule 1: Limit the total number of contacts per user.
-    existing_contacts_count = db.query(models.Contact).filter(
-        models.Contact.owner_id == current_user.id
-    ).count()
-    if existing_contacts_count >= MAX_CONTACTS_PER_USER:
+    values = contact.model_dump()
+
+    try:
+        if db.get_bind().dialect.name == "postgresql":
+            new_contact = await db.scalar(_insert_contact_if_slot_free(current_user.id, values))
+        elif await _claim_contact_slots(db, current_user.id, 1):
+            new_contact = (await batch.insert_many(db, models.Contact, [{**values, "owner_id": current_user.id}]))[0]
+        else:
+            new_contact = None
+    except IntegrityError:
+        # Rule 2: This error is raised by the unique constraint on (owner_id, phone_number) in the model.
+        # The rollback also returns the claimed slot.
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"A contact with the phone number '{contact.phone_number}' already exists."
+        )
+
+    # Rule 1: No slot was free, so nothing was inserted.
+    if new_contact is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Cannot add more than {MAX_CONTACTS_PER_USER} emergency contacts."
         )
 
-    # Create the new contact object.
-    new_contact = models.Contact(**contact.model_dump(), owner_id=current_user.id)
-    db.add(new_contact)
+    await versioning.bump_version(db, current_user.id, versioning.CONTACTS)
+    await db.commit()
+    return new_contact
+
+
+# --- Batch Endpoints ---
+# Declared before the `/{contact_id}` routes so that "batch" is never parsed as an ID.
+
+@router.post("/batch", response_model=List[contact_schema.ContactShow], status_code=status.HTTP_201_CREATED)
+async def create_contacts_batch(
+    contacts: List[contact_schema.ContactCreate] = Body(..., min_length=1, max_length=MAX_CONTACTS_PER_USER),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """
+    Creates several emergency contacts for the currently authenticated user at once.
+
+    The same business rules as for a single contact apply to the batch as a
+    whole: the user's total may not exceed MAX_CONTACTS_PER_USER, and no two
+    contacts (existing or new) may share a phone number. If any item breaks a
+    rule, nothing is created and the response lists the failing items.
+    """
+    existing = (await db.scalars(
+        select(models.Contact).where(models.Contact.owner_id == current_user.id)
+    )).all()
+
+    errors = []
+    remaining_slots = MAX_CONTACTS_PER_USER - len(existing)
+    taken_numbers = {c.phone_number for c in existing}
+    for index, contact in enumerate(contacts):
+        if index >= remaining_slots:
+            errors.append(batch.item_error(
+                index, status.HTTP_400_BAD_REQUEST,
+                f"Cannot add more than {MAX_CONTACTS_PER_USER} emergency contacts."
+            ))
+        if contact.phone_number in taken_numbers:
+            errors.append(batch.item_error(
+                index, status.HTTP_409_CONFLICT,
+                f"A contact with the phone number '{contact.phone_number}' already exists."
+            ))
+        taken_numbers.add(contact.phone_number)
+    batch.raise_for_item_errors(errors)
+
+    # The check above gives per-item errors; the claim enforces the limit atomically.
+    if not await _claim_contact_slots(db, current_user.id, len(contacts)):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot add more than {MAX_CONTACTS_PER_USER} emergency contacts."
+        )
 
     try:
-        db.commit()
-        db.refresh(new_contact)
+        new_contacts = await batch.insert_many(
+            db, models.Contact, [{**contact.model_dump(), "owner_id": current_user.id} for contact in contacts]
+        )
+        await versioning.bump_version(db, current_user.id, versioning.CONTACTS)
+        await db.commit()
     except IntegrityError:
-        # Rule 2: This error is raised by the unique constraint on (owner_id, phone_number) in the model.
-        db.rollback()
+        # A concurrent request added one of these numbers after the check above.
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
-            detail=f"A contact with the phone number '{contact.phone_number}' already exists."
+            detail="One of the phone numbers already exists."
         )
-    return new_contact
+    return new_contacts
 
 
-@router.get("/", response_model=List[contact_schema.ContactShow])
-def get_all_user_contacts(
-    db: Session = Depends(get_db),
+@router.patch("/batch", response_model=List[contact_schema.ContactShow])
+async def update_contacts_batch(
+    updates: List[contact_schema.ContactBatchUpdate] = Body(..., min_length=1, max_length=MAX_CONTACTS_PER_USER),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """
+    Applies partial updates to several emergency contacts in one transaction.
+
+    Phone numbers must stay unique across all of the user's contacts once
+    the whole batch is applied. If any item is unknown, repeated or causes a
+    duplicate, nothing is changed and the response lists the failing items.
+    """
+    # A user has at most MAX_CONTACTS_PER_USER contacts, so load all of them to
+    # check the phone numbers against the final state of the batch.
+    owned = {c.id: c for c in await db.scalars(
+        select(models.Contact).where(models.Contact.owner_id == current_user.id)
+    )}
+    ids = [update.id for update in updates]
+    errors = batch.duplicate_id_errors(ids) + batch.missing_id_errors(ids, owned, "Contact")
+
+    final_numbers = {contact_id: c.phone_number for contact_id, c in owned.items()}
+    for update in updates:
+        if update.id in owned and update.phone_number is not None:
+            final_numbers[update.id] = update.phone_number
+    for index, update in enumerate(updates):
+        if update.phone_number is not None and list(final_numbers.values()).count(update.phone_number) > 1:
+            errors.append(batch.item_error(
+                index, status.HTTP_409_CONFLICT,
+                f"Another contact already has the phone number '{update.phone_number}'.",
+                update.id
+            ))
+    batch.raise_for_item_errors(errors)
+
+    for update in updates:
+        for key, value in update.model_dump(exclude_unset=True, exclude={"id"}).items():
+            setattr(owned[update.id], key, value)
+
+    try:
+        if any(update.model_fields_set - {"id"} for update in updates):
+            await versioning.bump_version(db, current_user.id, versioning.CONTACTS)
+        await db.commit()
+    except IntegrityError:
+        # Swapping numbers between contacts can collide while the rows are
+        # updated one by one, even though the final state is valid.
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="The phone numbers could not be updated without a temporary duplicate."
+        )
+    return [owned[contact_id] for contact_id in ids]
+
+
+@router.delete("/batch", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_contacts_batch(
+    body: batch_schema.BatchDelete,
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user)
+):
+    """
+    Deletes several emergency contacts in one transaction.
+
+    If any ID is unknown or repeated, nothing is deleted and the response
+    lists the failing items.
+    """
+    contacts = await batch.fetch_owned(db, models.Contact, current_user.id, body.ids)
+    batch.raise_for_item_errors(batch.duplicate_id_errors(body.ids) + batch.missing_id_errors(body.ids, contacts, "Contact"))
+
+    result = await db.execute(
+        delete(models.Contact).where(
+            models.Contact.id.in_(body.ids),
+            models.Contact.owner_id == current_user.id
+        )
+    )
+    # A concurrent request may have deleted some of them since they were
+    # fetched, so only the rows this statement removed give back a slot.
+    await _release_contact_slots(db, current_user.id, result.rowcount)
+    await versioning.bump_version(db, current_user.id, versioning.CONTACTS)
+    await db.commit()
+    return None
+
+
+@router.get("/", response_model=List[contact_schema.ContactShow])
+async def get_all_user_contacts(
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: models.User = Depends(get_current_user_readonly)
 ):
     """
     Retrieves a list of all emergency contacts for the currently authenticated user.
+
+    The response carries an ETag; a request whose `If-None-Match` still matches
+    is answered with `304 Not Modified` without reading the contacts table.
+    With FAST_JSON_RESPONSES enabled, only the displayed columns are selected
+    and the rows are encoded with orjson instead of per-row Pydantic models.
+    Requesting a subset of `fields` always takes that path, for just those columns.
     """
-    contacts = db.query(models.Contact).filter(models.Contact.owner_id == current_user.id).all()
-    return contacts
+    serializer = contact_rows.only(fields)
+
+    not_modified = await versioning.check_not_modified(
+        request, response, db, current_user.id, versioning.CONTACTS
+    )
+    if not_modified is not None:
+        return not_modified
+
+    query = select(models.Contact).where(models.Contact.owner_id == current_user.id)
+
+    if serializer is not contact_rows or settings.FAST_JSON_RESPONSES:
+        rows = await db.execute(query.with_only_columns(*serializer.columns))
+        return serializer.response(rows, request, response)
+
+    contacts = await db.scalars(query)
+    return contacts.all()
 
 
 @router.put("/{contact_id}", response_model=contact_schema.ContactShow)
-def update_contact(
+async def update_contact(
     contact_id: int,
     contact_update: contact_schema.ContactUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
     """
     Updates a specific emergency contact by its ID.
     Ensures the contact belongs to the currently authenticated user.
-    """
-    contact_query = db.query(models.Contact).filter(
-        models.Contact.id == contact_id,
-        models.Contact.owner_id == current_user.id
-    )
-    db_contact = contact_query.first()
-
-    if not db_contact:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Contact with id {contact_id} not found."
-        )
 
+    The change is a single owner-scoped `UPDATE ... RETURNING`, so the
+    contact is neither read before nor refreshed after the update.
+    """
     update_data = contact_update.model_dump(exclude_unset=True)
-    contact_query.update(update_data, synchronize_session=False)
 
     try:
-        db.commit()
-        db.refresh(db_contact)
+        db_contact = await crud.update_owned(db, models.Contact, current_user.id, contact_id, update_data)
     except IntegrityError:
-        db.rollback()
+        # The unique constraint on (owner_id, phone_number) is checked by the UPDATE itself.
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=f"Another contact already has the phone number '{contact_update.phone_number}'."
         )
+
+    if not db_contact:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Contact with id {contact_id} not found."
+        )
+
+    if update_data:
+        # An empty update changes nothing, so the cached lists stay valid.
+        await versioning.bump_version(db, current_user.id, versioning.CONTACTS)
+        await db.commit()
     return db_contact
 
 
 @router.delete("/{contact_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_contact(
+async def delete_contact(
     contact_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
     """
     Deletes an emergency contact by its ID.
     Ensures the contact belongs to the currently authenticated user.
-    """
-    contact_query = db.query(models.Contact).filter(
-        models.Contact.id == contact_id,
-        models.Contact.owner_id == current_user.id
-    )
-    contact = contact_query.first()
 
-    if not contact:
+    A single owner-scoped DELETE is issued; its affected row count tells
+    whether the contact existed.
+    """
+    if not await crud.delete_owned(db, models.Contact, current_user.id, contact_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Contact with id {contact_id} not found."
         )
 
-    contact_query.delete(synchronize_session=False)
-    db.commit()
+    await _release_contact_slots(db, current_user.id, 1)
+    await versioning.bump_version(db, current_user.id, versioning.CONTACTS)
+    await db.commit()
 
     return None
@@ -0,0 +1,114 @@
+# backend/app/routes/dashboard_routes.py
+
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+from app.auth import get_current_user_readonly
+from app.database import get_async_read_db
+from app.routes.contact_routes import MAX_CONTACTS_PER_USER
+from app.routes.tip_routes import tip_pool
+from app.schemas import dashboard_schema
+from app.serialization import NegotiatedRoute, parse_fields
+
+# Create a new router for the aggregated dashboard endpoint.
+router = APIRouter(
+    prefix="/dashboard",
+    tags=["Dashboard"],
+    route_class=NegotiatedRoute,  # Serve MessagePack to clients that ask for it
+)
+
+# The optional parts of the summary. `day` and `counts` are always returned.
+SECTIONS = ("medications", "appointments", "contacts", "tip")
+
+
+async def _count(db: AsyncSession, model, *criteria) -> int:
+    """Counts the rows of `model` matching `criteria` without loading them."""
+    return await db.scalar(select(func.count()).select_from(model).where(*criteria))
+
+
+@router.get("/summary", response_model=dashboard_schema.DashboardSummary, response_model_exclude_unset=True)
+async def get_dashboard_summary(
+    day: Optional[date] = Query(None, description="The client's current date. Defaults to the server's date."),
+    contacts_limit: int = Query(3, ge=0, le=MAX_CONTACTS_PER_USER, description="How many contacts to return."),
+    fields: Optional[str] = Query(
+        None, description=f"Comma-separated sections to return ({', '.join(SECTIONS)}). Defaults to all of them."
+    ),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: models.User = Depends(get_current_user_readonly)
+):
+    """
+    Returns everything the dashboard and home page show in one response.
+
+    Both dependencies share the same read session, so authentication and all
+    queries below run on a single connection, and a cached principal adds no
+    query at all.
+
+    Sections left out of `fields` are not read: their counts come from a
+    COUNT query instead of the rows, and the tip is not picked at all.
+    """
+    sections = parse_fields(fields, SECTIONS) or set(SECTIONS)
+    day = day or date.today()
+    day_start = datetime.combine(day, time.min)
+    summary = {"day": day}
+
+    med_criteria = (
+        models.Medication.owner_id == current_user.id,
+        models.Medication.is_active.is_(True)
+    )
+    if "medications" in sections:
+        meds = await db.scalars(
+            select(models.Medication)
+            .where(*med_criteria)
+            .order_by(models.Medication.timing, models.Medication.id)
+        )
+        summary["medications"] = meds.all()
+        active_medications = len(summary["medications"])
+    else:
+        active_medications = await _count(db, models.Medication, *med_criteria)
+
+    app_criteria = (
+        models.Appointment.owner_id == current_user.id,
+        models.Appointment.appointment_datetime >= day_start,
+        models.Appointment.appointment_datetime < day_start + timedelta(days=1)
+    )
+    if "appointments" in sections:
+        apps = await db.scalars(
+            select(models.Appointment)
+            .where(*app_criteria)
+            .order_by(models.Appointment.appointment_datetime, models.Appointment.id)
+        )
+        summary["appointments"] = apps.all()
+        appointments_today = len(summary["appointments"])
+    else:
+        appointments_today = await _count(db, models.Appointment, *app_criteria)
+
+    if "contacts" in sections:
+        # A user has at most MAX_CONTACTS_PER_USER contacts, so fetching all of them
+        # is as cheap as a separate COUNT and gives the total for free.
+        contacts = await db.scalars(
+            select(models.Contact)
+            .where(models.Contact.owner_id == current_user.id)
+            .order_by(models.Contact.id)
+        )
+        contacts = contacts.all()
+        summary["contacts"] = contacts[:contacts_limit]
+        contact_count = len(contacts)
+    else:
+        contact_count = await _count(db, models.Contact, models.Contact.owner_id == current_user.id)
+
+    if "tip" in sections:
+        # The same pick as GET /tips/today, served from the in-memory tip pool.
+        await tip_pool.ensure_loaded(db)
+        summary["tip"] = tip_pool.tip_of_the_day(day)
+
+    summary["counts"] = {
+        "active_medications": active_medications,
+        "appointments_today": appointments_today,
+        "contacts": contact_count,
+    }
+    return summary
@@ -0,0 +1,56 @@
+# backend/app/routes/internal_routes.py
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header
+
+from app.auth import password_hashing_pool, principal_cache, verify_shared_token
+from app.compression import compression_stats
+from app.config import settings
+from app.database import async_engine, engine, get_pool_stats, replicas
+from app.mailer import mailer
+from app.routes.tip_routes import tip_pool
+from app.serialization import NegotiatedRoute
+from app.suggest import suggestions
+
+
+def require_internal_token(x_internal_token: Optional[str] = Header(None)) -> None:
+    """
+    Dependency that only lets through requests carrying INTERNAL_STATS_TOKEN.
+
+    While the token is not configured the internal endpoints do not exist
+    (404), so a default deployment exposes nothing.
+    """
+    verify_shared_token(x_internal_token, settings.INTERNAL_STATS_TOKEN)
+
+
+# Create a new router for internal, operational endpoints.
+router = APIRouter(
+    prefix="/internal",
+    tags=["Internal"],
+    route_class=NegotiatedRoute,  # Serve MessagePack to clients that ask for it
+    dependencies=[Depends(require_internal_token)],
+)
+
+
+@router.get("/stats")
+def get_internal_stats():
+    """
+    Returns in-process runtime counters for monitoring.
+
+    The counters are kept per worker process, so a monitoring system should
+    scrape every worker (or aggregate the values) when running several of them.
+    It is disabled unless INTERNAL_STATS_TOKEN is set, and then requires
+    that token in the `X-Internal-Token` header.
+    """
+    return {
+        "principal_cache": principal_cache.stats(),
+        "password_hashing": password_hashing_pool.stats(),
+        "database_pool": get_pool_stats(engine),
+        "async_database_pool": get_pool_stats(async_engine.sync_engine),
+        "replicas": [replica.stats() for replica in replicas],
+        "compression": compression_stats.stats(),
+        "tip_pool": tip_pool.stats(),
+        "suggestions": suggestions.stats(),
+        "mailer": mailer.stats(),
+    }
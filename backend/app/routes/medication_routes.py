@@ -1,26 +1,34 @@
 # backend/app/routes/medication_routes.py
 
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app import models
-from app.auth import get_current_user
-from app.database import get_db
-from app.schemas import medication_schema
+from app import batch, crud, models, versioning
+from app.auth import get_current_user, get_current_user_readonly
+from app.config import settings
+from app.database import get_async_db, get_async_read_db
+from app.schemas import batch_schema, medication_schema
+from app.serialization import FIELDS_DESCRIPTION, NegotiatedRoute, RowSerializer
+from app.suggest import MEDICATION, suggestions
 
 # Create a new router for medication-related endpoints.
 router = APIRouter(
     prefix="/medications",
-    tags=["Medications"]
+    tags=["Medications"],
+    route_class=NegotiatedRoute,  # Serve MessagePack to clients that ask for it
 )
 
+# Serializes projected medication rows for the fast JSON path and sparse fieldsets.
+medication_rows = RowSerializer(models.Medication, medication_schema.MedicationShow)
+
 
 @router.post("/", response_model=medication_schema.MedicationShow, status_code=status.HTTP_201_CREATED)
-def create_medication(
+async def create_medication(
     med: medication_schema.MedicationCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
     """
@@ -31,41 +39,147 @@ def create_medication(
         owner_id=current_user.id  # Assign to the logged-in user
     )
     db.add(new_med)
-    db.commit()
-    db.refresh(new_med)
+    await versioning.bump_version(db, current_user.id, versioning.MEDICATIONS)
+    await db.commit()
+    await db.refresh(new_med)
+    suggestions.add(current_user.id, MEDICATION, [new_med.name])
     return new_med
 
 
-@router.get("/", response_model=List[medication_schema.MedicationShow])
-def get_user_medications(
-    db: Session = Depends(get_db),
+# --- Batch Endpoints ---
+# Declared before the `/{med_id}` routes so that "batch" is never parsed as an ID.
+
+@router.post("/batch", response_model=List[medication_schema.MedicationShow], status_code=status.HTTP_201_CREATED)
+async def create_medications_batch(
+    meds: List[medication_schema.MedicationCreate] = Body(..., min_length=1, max_length=batch.MAX_BATCH_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """
+    Creates several medications for the currently authenticated user at once.
+
+    The rows are written with multi-row `INSERT ... RETURNING` statements and
+    committed in a single transaction, so either every medication is created or none is.
+    """
+    new_meds = await batch.insert_many(
+        db, models.Medication, [{**med.model_dump(), "owner_id": current_user.id} for med in meds]
+    )
+    await versioning.bump_version(db, current_user.id, versioning.MEDICATIONS)
+    await db.commit()
+    suggestions.add(current_user.id, MEDICATION, [med.name for med in meds])
+    return new_meds
+
+
+@router.patch("/batch", response_model=List[medication_schema.MedicationShow])
+async def update_medications_batch(
+    updates: List[medication_schema.MedicationBatchUpdate] = Body(..., min_length=1, max_length=batch.MAX_BATCH_SIZE),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user)
+):
+    """
+    Applies partial updates to several medications in one transaction.
+
+    Each item carries the ID of the medication and only the fields to change. If
+    any ID is unknown or repeated, nothing is changed and the response lists
+    the failing items.
+    """
+    ids = [update.id for update in updates]
+    meds = await batch.fetch_owned(db, models.Medication, current_user.id, ids)
+    batch.raise_for_item_errors(batch.duplicate_id_errors(ids) + batch.missing_id_errors(ids, meds, "Medication"))
+
+    # (old name, new name) of the renamed medications, for the suggestion index.
+    renamed = [(meds[update.id].name, update.name) for update in updates if "name" in update.model_fields_set]
+    for update in updates:
+        for key, value in update.model_dump(exclude_unset=True, exclude={"id"}).items():
+            setattr(meds[update.id], key, value)
+
+    if any(update.model_fields_set - {"id"} for update in updates):
+        await versioning.bump_version(db, current_user.id, versioning.MEDICATIONS)
+    await db.commit()
+    suggestions.remove(current_user.id, MEDICATION, [old for old, _ in renamed])
+    suggestions.add(current_user.id, MEDICATION, [new for _, new in renamed])
+    return [meds[item_id] for item_id in ids]
+
+
+@router.delete("/batch", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_medications_batch(
+    body: batch_schema.BatchDelete,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """
+    Deletes several medications in one transaction.
+
+    If any ID is unknown or repeated, nothing is deleted and the response
+    lists the failing items.
+    """
+    meds = await batch.fetch_owned(db, models.Medication, current_user.id, body.ids)
+    batch.raise_for_item_errors(batch.duplicate_id_errors(body.ids) + batch.missing_id_errors(body.ids, meds, "Medication"))
+
+    await db.execute(
+        delete(models.Medication).where(
+            models.Medication.id.in_(body.ids),
+            models.Medication.owner_id == current_user.id
+        )
+    )
+    await versioning.bump_version(db, current_user.id, versioning.MEDICATIONS)
+    await db.commit()
+    suggestions.remove(current_user.id, MEDICATION, [med.name for med in meds.values()])
+    return None
+
+
+@router.get("/", response_model=List[medication_schema.MedicationShow])
+async def get_user_medications(
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: models.User = Depends(get_current_user_readonly)
 ):
     """
     Retrieves a list of all medications for the currently authenticated user.
+
+    The response carries an ETag; a request whose `If-None-Match` still matches
+    is answered with `304 Not Modified` without reading the medications table.
+    With FAST_JSON_RESPONSES enabled, only the displayed columns are selected
+    and the rows are encoded with orjson instead of per-row Pydantic models.
+    Requesting a subset of `fields` always takes that path, for just those columns.
     """
-    meds = db.query(models.Medication).filter(
-        models.Medication.owner_id == current_user.id
-    ).all()
-    return meds
+    serializer = medication_rows.only(fields)
+
+    not_modified = await versioning.check_not_modified(
+        request, response, db, current_user.id, versioning.MEDICATIONS
+    )
+    if not_modified is not None:
+        return not_modified
+
+    query = select(models.Medication).where(models.Medication.owner_id == current_user.id)
+
+    if serializer is not medication_rows or settings.FAST_JSON_RESPONSES:
+        rows = await db.execute(query.with_only_columns(*serializer.columns))
+        return serializer.response(rows, request, response)
+
+    meds = await db.scalars(query)
+    return meds.all()
 
 
 @router.put("/{med_id}", response_model=medication_schema.MedicationShow)
-def update_medication(
+async def update_medication(
     med_id: int,
     med_update: medication_schema.MedicationUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
     """
     Updates a specific medication by its ID.
     Ensures the medication belongs to the currently authenticated user.
+
+    The change is a single owner-scoped `UPDATE ... RETURNING`, so the
+    medication is neither read before nor refreshed after the update.
     """
-    med_query = db.query(models.Medication).filter(
-        models.Medication.id == med_id,
-        models.Medication.owner_id == current_user.id
-    )
-    db_med = med_query.first()
+    # `exclude_unset=True` ensures we only update fields that were actually provided.
+    update_data = med_update.model_dump(exclude_unset=True)
+    db_med = await crud.update_owned(db, models.Medication, current_user.id, med_id, update_data)
 
     if not db_med:
         raise HTTPException(
@@ -73,40 +187,38 @@ def update_medication(
             detail=f"Medication with id {med_id} not found."
         )
 
-    # `exclude_unset=True` ensures we only update fields that were actually provided.
-    update_data = med_update.model_dump(exclude_unset=True)
-    med_query.update(update_data, synchronize_session=False)
-
-    db.commit()
-    # Refresh the existing instance to get the updated data from the database.
-    db.refresh(db_med)
+    if update_data:
+        # An empty update changes nothing, so the cached lists stay valid.
+        await versioning.bump_version(db, current_user.id, versioning.MEDICATIONS)
+        await db.commit()
+    if "name" in update_data:
+        # The previous name is not known without reading the row, so the index is rebuilt.
+        suggestions.invalidate(current_user.id, MEDICATION)
     return db_med
 
 
 @router.delete("/{med_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_medication(
+async def delete_medication(
     med_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
     """
     Deletes a medication by its ID.
     Ensures the medication belongs to the currently authenticated user.
-    """
-    medication_query = db.query(models.Medication).filter(
-        models.Medication.id == med_id,
-        models.Medication.owner_id == current_user.id
-    )
-    medication = medication_query.first()
 
-    if not medication:
+    A single owner-scoped DELETE is issued; its affected row count tells
+    whether the medication existed.
+    """
+    if not await crud.delete_owned(db, models.Medication, current_user.id, med_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Medication with id {med_id} not found."
         )
 
-    medication_query.delete(synchronize_session=False)
-    db.commit()
+    await versioning.bump_version(db, current_user.id, versioning.MEDICATIONS)
+    await db.commit()
+    suggestions.invalidate(current_user.id, MEDICATION)
 
     # A 204 No Content response should not return a body.
     return None
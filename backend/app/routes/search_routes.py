@@ -0,0 +1,49 @@
+# backend/app/routes/search_routes.py
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+from app.auth import get_current_user_readonly
+from app.database import get_async_read_db
+from app.record_search import search_records
+from app.schemas import search_schema
+from app.serialization import NegotiatedRoute
+
+# Create a new router for searching across a user's records.
+router = APIRouter(
+    prefix="/search",
+    tags=["Search"],
+    route_class=NegotiatedRoute,  # Serve MessagePack to clients that ask for it
+)
+
+# Limits for the number of results returned per kind of record.
+DEFAULT_RESULTS_PER_KIND = 5
+MAX_RESULTS_PER_KIND = 50
+
+
+@router.get("/", response_model=search_schema.SearchResponse)
+async def search_user_records(
+    q: str = Query(..., min_length=1, max_length=200, description="The words to search for."),
+    limit: int = Query(
+        DEFAULT_RESULTS_PER_KIND, ge=1, le=MAX_RESULTS_PER_KIND,
+        description="The maximum number of results per kind of record."
+    ),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: models.User = Depends(get_current_user_readonly)
+):
+    """
+    Searches the user's medications, appointments and contacts at once.
+
+    Searched are the medications' name and dosage, the appointments' doctor,
+    purpose and location, and the contacts' name and relationship. A word of
+    the query matches a word that starts with it, so "cardio" finds
+    "Cardiologist". Records matching more of the words, or matching them in
+    their name rather than a detail, rank higher.
+
+    The three tables are searched with a single UNION ALL query that is
+    scoped to the user through the `owner_id` indexes. Results are grouped by
+    kind, best group first, and each group reports its total number of matches.
+    """
+    terms, groups = await search_records(db, current_user.id, q, limit)
+    return {"terms": terms, "groups": groups}
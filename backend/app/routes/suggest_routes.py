@@ -0,0 +1,47 @@
+# backend/app/routes/suggest_routes.py
+
+from typing import List, Literal
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+from app.auth import get_current_user_readonly
+from app.database import get_async_read_db
+from app.schemas import suggest_schema
+from app.serialization import NegotiatedRoute
+from app.suggest import DOCTOR, MEDICATION, suggestions
+
+# Create a new router for the typeahead endpoint.
+router = APIRouter(
+    prefix="/suggest",
+    tags=["Suggestions"],
+    route_class=NegotiatedRoute,  # Serve MessagePack to clients that ask for it
+)
+
+# Limits for the number of suggestions returned.
+DEFAULT_SUGGESTIONS = 8
+MAX_SUGGESTIONS = 50
+
+
+@router.get("/", response_model=List[suggest_schema.Suggestion])
+async def get_suggestions(
+    kind: Literal[MEDICATION, DOCTOR] = Query(..., description="What to suggest: medication or doctor names."),
+    prefix: str = Query("", max_length=100, description="What the user has typed so far (case-insensitive)."),
+    limit: int = Query(DEFAULT_SUGGESTIONS, ge=1, le=MAX_SUGGESTIONS, description="The maximum number of suggestions."),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: models.User = Depends(get_current_user_readonly)
+):
+    """
+    Suggests names the user has used before for a medication or a doctor.
+
+    A name matches when any of its words starts with `prefix`, so "sha" finds
+    "Dr. Anil Sharma". Names the user uses most come first; medication names
+    from the global dictionary, if one is configured, fill the remaining places.
+
+    Suggestions are answered from a per-user index in memory, which is built
+    with one query on the user's first request and kept current by the
+    medication and appointment endpoints, so no `LIKE` scan is run per keystroke.
+    """
+    matches = await suggestions.suggest(db, current_user.id, kind, prefix, limit)
+    return [suggest_schema.Suggestion(name=name, uses=uses) for name, uses in matches]
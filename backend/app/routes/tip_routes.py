@@ -1,71 +1,304 @@
 # backend/app/routes/tip_routes.py
 
-import random
-from typing import List
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app import models
-from app.auth import get_current_user
-from app.database import get_db
+from app import models, versioning
+from app.auth import get_current_user, verify_shared_token
+from app.config import settings
+from app.database import get_async_db, get_async_read_db
 from app.schemas import tip_schema
+from app.serialization import NegotiatedRoute
+from app.tip_ingest import FORMATS, MEDIA_TYPE_FORMATS, IngestError, content_hash, ingest_tips
+from app.tip_pool import TipPool
+from app.tip_search import search_postgres
 
 # Create a new router for health tip endpoints.
 router = APIRouter(
     prefix="/tips",
-    tags=["Health Tips"]
+    tags=["Health Tips"],
+    route_class=NegotiatedRoute,  # Serve MessagePack to clients that ask for it
 )
 
+# In-memory copy of the tips table that random tips are served from.
+tip_pool = TipPool(ttl_seconds=settings.TIP_POOL_TTL_SECONDS)
+
+# Page size limits for the tip list.
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Page size limits for search results.
+DEFAULT_SEARCH_PAGE_SIZE = 20
+MAX_SEARCH_PAGE_SIZE = 100
+
+# The tip for an explicitly requested date never changes, so it may be cached for a day.
+ONE_DAY_SECONDS = 24 * 60 * 60
+
+
+def _public_cache_control(max_age: int) -> str:
+    """Tips are the same for every user, so shared caches may store them too."""
+    return f"public, max-age={max_age}"
+
+
+def _search_in_postgres(db: AsyncSession) -> bool:
+    """Whether /tips/search runs in the database rather than in the tip pool."""
+    return settings.TIP_SEARCH_BACKEND == "auto" and db.get_bind().dialect.name == "postgresql"
+
+
+def require_tip_admin_token(x_admin_token: Optional[str] = Header(None)) -> None:
+    """
+    Dependency that only lets through requests carrying TIP_ADMIN_TOKEN.
+
+    Tips are shared by every user, so only the tip editors may create them.
+    """
+    verify_shared_token(x_admin_token, settings.TIP_ADMIN_TOKEN)
+
+
+def _tip_not_found(category: Optional[str]) -> HTTPException:
+    detail = f"No health tips found in category '{category}'." if category else "No health tips found in the database."
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=detail
+    )
+
 
 @router.get("/random", response_model=tip_schema.TipShow)
-def get_random_tip(db: Session = Depends(get_db)):
+async def get_random_tip(
+    category: Optional[str] = Query(None, description="Only pick from this category (case-insensitive)."),
+    db: AsyncSession = Depends(get_async_read_db)
+):
     """
-    Fetches a single random health tip from the database.
+    Fetches a single random health tip.
 
     This endpoint is public and does not require authentication, allowing
     even logged-out users to see a health tip.
-    """
-    # This method is generally more compatible across different SQL databases
-    # than ordering by a random function.
-    tip_count = db.query(models.Tip).count()
-    if tip_count == 0:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No health tips found in the database."
-        )
 
-    random_offset = random.randint(0, tip_count - 1)
-    random_tip = db.query(models.Tip).offset(random_offset).first()
+    Tips are served from the in-memory tip pool, so a request only reaches the
+    database when the pool has expired and is reloaded.
+    """
+    await tip_pool.ensure_loaded(db)
+    random_tip = tip_pool.random(category)
 
-    if not random_tip:
-        # Fallback in case of an issue with the offset.
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Could not retrieve a random health tip."
-        )
+    if random_tip is None:
+        raise _tip_not_found(category)
 
     return random_tip
 
 
-@router.post("/", response_model=tip_schema.TipShow, status_code=status.HTTP_201_CREATED)
-def create_tip(
+@router.get("/today", response_model=tip_schema.TipShow)
+async def get_tip_of_the_day(
+    request: Request,
+    response: Response,
+    day: Optional[date] = Query(None, description="The client's current date. Defaults to the server's date."),
+    category: Optional[str] = Query(None, description="Only pick from this category (case-insensitive)."),
+    seed: Optional[str] = Query(None, max_length=64, description="An optional value (e.g. a user ID) that varies the pick."),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Returns the health tip of the day.
+
+    The tip is picked deterministically from the date, the category and the
+    seed, and stays the same for the whole day. The response is public and
+    carries `Cache-Control` and `ETag` headers, so browsers, reverse proxies
+    and the frontend can reuse it: for an explicit `day` for a full day,
+    otherwise until the server's midnight.
+    """
+    await tip_pool.ensure_loaded(db)
+
+    if day is None:
+        day = date.today()
+        next_midnight = datetime.combine(day + timedelta(days=1), time.min)
+        max_age = max(int((next_midnight - datetime.now()).total_seconds()), 0)
+    else:
+        max_age = ONE_DAY_SECONDS
+
+    tip = tip_pool.tip_of_the_day(day, category, seed)
+    if tip is None:
+        raise _tip_not_found(category)
+
+    etag = versioning.make_etag(request, "tip-of-the-day", day.isoformat(), tip.id, tip.category, tip.content)
+    not_modified = versioning.conditional_response(request, response, etag, _public_cache_control(max_age))
+    if not_modified is not None:
+        return not_modified
+
+    return tip
+
+
+@router.get("/", response_model=List[tip_schema.TipShow])
+async def get_tips(
+    request: Request,
+    response: Response,
+    category: Optional[str] = Query(None, description="Only list tips of this category (case-insensitive)."),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="The maximum number of tips to return."),
+    cursor: Optional[int] = Query(None, description="The `X-Next-Cursor` value from the previous page."),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Lists health tips in ID order, one page at a time.
+
+    When more tips are available, the response carries an `X-Next-Cursor`
+    header to pass as `cursor` for the next page. Pages are served from the
+    tip pool and are public and cacheable; the ETag is derived from the page's
+    content, so it is the same on every worker.
+    """
+    await tip_pool.ensure_loaded(db)
+
+    # Fetch one extra tip to find out whether another page exists.
+    tips = tip_pool.page(limit + 1, after_id=cursor, category=category)
+    next_cursor = None
+    if len(tips) > limit:
+        tips = tips[:limit]
+        next_cursor = str(tips[-1].id)
+        response.headers["X-Next-Cursor"] = next_cursor
+
+    etag = versioning.make_etag(
+        request, "tips", request.url.query, next_cursor,
+        *(f"{tip.id}:{tip.category}:{tip.content}" for tip in tips)
+    )
+    not_modified = versioning.conditional_response(
+        request, response, etag, _public_cache_control(settings.TIPS_CACHE_MAX_AGE_SECONDS)
+    )
+    if not_modified is not None:
+        return not_modified
+
+    return tips
+
+
+@router.get("/search", response_model=List[tip_schema.TipSearchResult])
+async def search_tips(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="The words to search for."),
+    category: Optional[str] = Query(None, description="Only search tips of this category (case-insensitive)."),
+    limit: int = Query(DEFAULT_SEARCH_PAGE_SIZE, ge=1, le=MAX_SEARCH_PAGE_SIZE, description="The maximum number of tips to return."),
+    cursor: int = Query(0, ge=0, description="The `X-Next-Cursor` value from the previous page."),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Full-text searches the health tips' content and category.
+
+    Results are ranked by relevance, best first, and paginated: when more
+    results are available, the response carries an `X-Next-Cursor` header to
+    pass as `cursor` for the next page.
+
+    On PostgreSQL the search uses a GIN index on the tips' `tsvector`, which
+    also supports "quoted phrases", `or` and `-word`; if TIP_SEARCH_MAX_RANKED
+    is set, only that many matches are ranked and paged. Otherwise it runs against an
+    inverted index kept in the tip pool, and matches the tips containing all
+    of the words. Results are public and cacheable like the tip list.
+    """
+    # Fetch one extra result to find out whether another page exists.
+    if _search_in_postgres(db):
+        matches = await search_postgres(db, q, limit + 1, cursor, category, settings.TIP_SEARCH_MAX_RANKED)
+    else:
+        await tip_pool.ensure_loaded(db)
+        matches = await tip_pool.search(q, limit + 1, cursor, category)
+
+    next_cursor = None
+    if len(matches) > limit:
+        matches = matches[:limit]
+        next_cursor = str(cursor + limit)
+        response.headers["X-Next-Cursor"] = next_cursor
+
+    results = [
+        tip_schema.TipSearchResult(id=tip.id, category=tip.category, content=tip.content, rank=round(rank, 6))
+        for tip, rank in matches
+    ]
+
+    etag = versioning.make_etag(
+        request, "tip-search", request.url.query, next_cursor,
+        *(f"{result.id}:{result.rank}:{result.category}:{result.content}" for result in results)
+    )
+    not_modified = versioning.conditional_response(
+        request, response, etag, _public_cache_control(settings.TIPS_CACHE_MAX_AGE_SECONDS)
+    )
+    if not_modified is not None:
+        return not_modified
+
+    return results
+
+
+@router.post(
+    "/",
+    response_model=tip_schema.TipShow,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_tip_admin_token)],
+)
+async def create_tip(
     tip: tip_schema.TipCreate,
-    db: Session = Depends(get_db)
-    # --- Optional Admin Protection ---
-    # To make this an admin-only endpoint, you would uncomment the following line
-    # and add logic to check if the current_user has admin privileges.
-    # current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Creates a new health tip in the database.
 
-    In a production application, this endpoint should be protected to ensure
-    only authorized administrators can add new tips.
+    It is disabled unless TIP_ADMIN_TOKEN is set, and then requires that
+    token in the `X-Admin-Token` header.
     """
-    new_tip = models.Tip(**tip.model_dump())
+    new_tip = models.Tip(**tip.model_dump(), content_hash=content_hash(tip.content))
     db.add(new_tip)
-    db.commit()
-    db.refresh(new_tip)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Raised by the unique index on `content_hash`.
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="An identical health tip already exists."
+        )
+    await db.refresh(new_tip)
+
+    # Make the tip available to random picks in this worker right away.
+    tip_pool.add(new_tip)
     return new_tip
+
+
+@router.post(
+    "/bulk",
+    response_model=tip_schema.TipIngestReport,
+    dependencies=[Depends(require_tip_admin_token)],
+)
+async def ingest_tips_in_bulk(
+    request: Request,
+    input_format: Optional[str] = Query(
+        None, alias="format",
+        description=f"The input format ({', '.join(FORMATS)}). Defaults to the request's Content-Type."
+    ),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Loads many health tips from an NDJSON or CSV request body.
+
+    The body is read as a stream and inserted in batches, with a commit every
+    few batches, so large files need neither much memory nor one round-trip
+    per tip. Tips whose content is already stored are skipped, and invalid
+    rows are reported without stopping the upload. See `app.tip_ingest` for
+    the format and the equivalent command-line tool.
+
+    The tip pool of this worker is reloaded once at the end; other workers
+    pick up the new tips within TIP_POOL_TTL_SECONDS. Like `create_tip`, it
+    requires the TIP_ADMIN_TOKEN in the `X-Admin-Token` header.
+    """
+    media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    input_format = input_format or MEDIA_TYPE_FORMATS.get(media_type)
+    if input_format not in FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send the tips as application/x-ndjson or text/csv, or pass ?format=ndjson|csv."
+        )
+
+    try:
+        report = await ingest_tips(db, request.stream(), input_format)
+    except IngestError as error:
+        tip_pool.invalidate()  # Chunks committed before the error are visible on the next request.
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(error)
+        )
+
+    tip_pool.invalidate()
+    await tip_pool.ensure_loaded(db)
+    return report
@@ -9,20 +9,25 @@ from typing import Optional
 from fastapi import (APIRouter, BackgroundTasks, Depends, File, Form,
                      HTTPException, Request, UploadFile, status)
 from jose import jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import models
-from app.auth import (create_access_token, get_current_user, hash_password,
-                      verify_password)
+from app.auth import (create_access_token, get_current_user,
+                      get_current_user_readonly, hash_password_async,
+                      invalidate_user_cache, verify_and_update_password_async,
+                      verify_password_async)
 from app.config import settings
-from app.database import get_db
+from app.database import get_async_db
 from app.schemas import token_schema, user_schema
+from app.serialization import NegotiatedRoute
 from app.utils import create_password_reset_token, send_password_reset_email
 
 # Create a new router for user-related endpoints.
 router = APIRouter(
     prefix="/users",
-    tags=["Users & Authentication"]
+    tags=["Users & Authentication"],
+    route_class=NegotiatedRoute,  # Serve MessagePack to clients that ask for it
 )
 
 # --- Constants & Directory Setup ---
@@ -38,18 +43,18 @@ MAX_FILE_SIZE = 2 * 1024 * 1024  # 2 Megabytes
 # ===================================================================
 
 @router.post("/register", response_model=user_schema.UserShow, status_code=status.HTTP_201_CREATED)
-def register_user(user: user_schema.UserCreate, db: Session = Depends(get_db)):
+async def register_user(user: user_schema.UserCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Registers a new user in the database. Passwords are automatically hashed.
     """
-    db_user = db.query(models.User).filter(models.User.email == user.email).first()
+    db_user = await db.scalar(select(models.User).where(models.User.email == user.email))
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="An account with this email is already registered."
         )
 
-    hashed_pwd = hash_password(user.password)
+    hashed_pwd = await hash_password_async(user.password)
     new_user = models.User(
         full_name=user.full_name,
         email=user.email,
@@ -57,8 +62,8 @@ def register_user(user: user_schema.UserCreate, db: Session = Depends(get_db)):
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     return new_user
 
 
@@ -67,7 +72,7 @@ async def login_for_access_token(
     username: str = Form(...),
     password: str = Form(...),
     remember_me: bool = Form(False),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Logs in a user and returns a JWT access token.
@@ -78,16 +83,27 @@ async def login_for_access_token(
         username (str): The user's email.
         password (str): The user's plain text password.
         remember_me (bool): If True, provides a long-lived token.
-        db (Session): Database session dependency.
+        db (AsyncSession): Database session dependency.
     """
-    user = db.query(models.User).filter(models.User.email == username).first()
-    if not user or not verify_password(password, user.hashed_password):
+    user = await db.scalar(select(models.User).where(models.User.email == username))
+    verified, new_hash = (
+        await verify_and_update_password_async(password, user.hashed_password) if user else (False, None)
+    )
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password.",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # The stored hash uses a different scheme or cost than the current policy,
+    # so we replace it now while the plain password is available.
+    if new_hash:
+        user.hashed_password = new_hash
+        db.add(user)
+        await db.commit()
+        invalidate_user_cache(user.email)
+
     # Set the token's expiration time based on the 'remember_me' flag.
     if remember_me:
         expires_delta = timedelta(days=settings.ACCESS_TOKEN_EXPIRE_DAYS_REMEMBER)
@@ -108,13 +124,13 @@ async def login_for_access_token(
 async def forgot_password(
     request: user_schema.ForgotPasswordRequest,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Handles a password reset request.
     Generates a time-limited token and sends a reset email in the background.
     """
-    user = db.query(models.User).filter(models.User.email == request.email).first()
+    user = await db.scalar(select(models.User).where(models.User.email == request.email))
     # For security, we don't reveal if the user exists or not.
     # The response is the same in either case.
     if user:
@@ -127,7 +143,7 @@ async def forgot_password(
 
 
 @router.post("/reset-password")
-def reset_password(request: user_schema.ResetPasswordRequest, db: Session = Depends(get_db)):
+async def reset_password(request: user_schema.ResetPasswordRequest, db: AsyncSession = Depends(get_async_db)):
     """
     Resets the user's password using a valid token from the reset email.
     """
@@ -148,13 +164,14 @@ def reset_password(request: user_schema.ResetPasswordRequest, db: Session = Depe
     except jwt.JWTError:
         raise credentials_exception
 
-    user = db.query(models.User).filter(models.User.email == email).first()
+    user = await db.scalar(select(models.User).where(models.User.email == email))
     if user is None:
         raise credentials_exception
 
-    user.hashed_password = hash_password(request.new_password)
+    user.hashed_password = await hash_password_async(request.new_password)
     db.add(user)
-    db.commit()
+    await db.commit()
+    invalidate_user_cache(user.email)
 
     return {"message": "Your password has been reset successfully."}
 
@@ -166,7 +183,7 @@ def reset_password(request: user_schema.ResetPasswordRequest, db: Session = Depe
 @router.post("/me/photo", response_model=user_schema.UserShow)
 async def upload_profile_photo(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
     """
@@ -205,8 +222,9 @@ async def upload_profile_photo(
     current_user.profile_picture_url = url_path
 
     db.add(current_user)
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    await db.refresh(current_user)
+    invalidate_user_cache(current_user.email)
 
     return current_user
 
@@ -216,7 +234,7 @@ async def upload_profile_photo(
 # ===================================================================
 
 @router.get("/me", response_model=user_schema.UserShow)
-def read_current_user_profile(current_user: models.User = Depends(get_current_user)):
+async def read_current_user_profile(current_user: models.User = Depends(get_current_user_readonly)):
     """
     Gets the profile information of the currently logged-in user.
     """
@@ -224,9 +242,9 @@ def read_current_user_profile(current_user: models.User = Depends(get_current_us
 
 
 @router.put("/me", response_model=user_schema.UserShow)
-def update_current_user_profile(
+async def update_current_user_profile(
     user_update: user_schema.UserUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
     """
@@ -237,43 +255,47 @@ def update_current_user_profile(
         setattr(current_user, key, value)
 
     db.add(current_user)
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    await db.refresh(current_user)
+    invalidate_user_cache(current_user.email)
     return current_user
 
 
 @router.put("/me/password")
-def update_current_user_password(
+async def update_current_user_password(
     password_update: user_schema.PasswordUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
     """
     Updates the password for the currently logged-in user after verifying their current password.
     """
-    if not verify_password(password_update.current_password, current_user.hashed_password):
+    if not await verify_password_async(password_update.current_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="The current password you entered is incorrect."
         )
 
-    new_hashed_password = hash_password(password_update.new_password)
+    new_hashed_password = await hash_password_async(password_update.new_password)
     current_user.hashed_password = new_hashed_password
 
     db.add(current_user)
-    db.commit()
+    await db.commit()
+    invalidate_user_cache(current_user.email)
 
     return {"message": "Password updated successfully."}
 
 
 @router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
-def delete_current_user_account(
-    db: Session = Depends(get_db),
+async def delete_current_user_account(
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
     """
     Deletes the account and all associated data for the currently logged-in user.
     """
-    db.delete(current_user)
-    db.commit()
+    email = current_user.email
+    await db.delete(current_user)
+    await db.commit()
+    invalidate_user_cache(email)
     return None
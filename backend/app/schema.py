@@ -0,0 +1,114 @@
+# backend/app/schema.py
+
+from typing import Callable, Dict, Set, Tuple, Union
+
+from sqlalchemy import func, inspect, select, text, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateColumn
+from sqlalchemy.sql import Executable
+
+# Importing the models registers their tables on `Base.metadata`.
+from app import models
+from app.database import Base
+from app.tip_ingest import backfill_content_hashes
+
+# --- Backfills ---
+# Statements that populate a column right after it has been added to an
+# existing table, keyed by (table name, column name). Values that cannot be
+# computed in SQL are filled by a function that receives the connection.
+BACKFILLS: Dict[Tuple[str, str], Union[Executable, Callable[[Connection], None]]] = {
+    ("users", "contact_count"): update(models.User.__table__).values(
+        contact_count=select(func.count())
+        .select_from(models.Contact.__table__)
+        .where(models.Contact.__table__.c.owner_id == models.User.__table__.c.id)
+        .scalar_subquery()
+    ),
+    ("tips", "content_hash"): backfill_content_hashes,
+}
+
+
+# --- PostgreSQL-Only DDL ---
+# Idempotent statements for features that only exist on PostgreSQL, run
+# after the tables have been created.
+POSTGRES_DDL = (
+    # Full-text search over the tips (see `app.tip_search.search_postgres`).
+    # A stored column, so ranking does not have to re-parse every match.
+    "ALTER TABLE tips ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('english'::regconfig, category || ' ' || content)) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_tips_search ON tips USING gin (search_vector)",
+)
+
+
+def _add_missing_columns(engine: Engine) -> Set[Tuple[str, str]]:
+    """
+    Adds columns that exist on a model but not yet in its (existing) table.
+
+    New columns must be nullable or have a `server_default`, so that rows
+    already in the table get a valid value.
+
+    Returns:
+        The (table name, column name) pairs that were added.
+
+    Raises:
+        RuntimeError: If a missing column is NOT NULL without a server default.
+    """
+    inspector = inspect(engine)
+    added = set()
+
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                if not column.nullable and column.server_default is None:
+                    raise RuntimeError(
+                        f"Cannot add NOT NULL column '{table.name}.{column.name}' without a server default."
+                    )
+                column_ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                table_name = engine.dialect.identifier_preparer.format_table(table)
+                connection.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column_ddl}"))
+                print(f"Schema upgrade: added column {table.name}.{column.name}.")
+                added.add((table.name, column.name))
+
+    return added
+
+
+def upgrade_schema(engine: Engine) -> None:
+    """
+    Brings the database schema up to date with the models on startup.
+
+    `Base.metadata.create_all` only creates tables that do not exist yet, and
+    the indexes of those tables. Columns and indexes added to an existing
+    table are created separately here, and new columns are backfilled where
+    a statement is registered in BACKFILLS. On PostgreSQL, POSTGRES_DDL runs
+    as well. Every step checks the database
+    first, so this is safe to run on every startup.
+
+    Args:
+        engine: The (synchronous) engine connected to the primary database.
+    """
+    added_columns = _add_missing_columns(engine)
+
+    Base.metadata.create_all(bind=engine)
+
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as connection:
+            for statement in POSTGRES_DDL:
+                connection.execute(text(statement))
+
+    with engine.begin() as connection:
+        for key, statement in BACKFILLS.items():
+            if key in added_columns:
+                if callable(statement):
+                    statement(connection)
+                else:
+                    connection.execute(statement)
+                print(f"Schema upgrade: backfilled {key[0]}.{key[1]}.")
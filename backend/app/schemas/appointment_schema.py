@@ -38,6 +38,14 @@ class AppointmentUpdate(BaseModel):
     location: Optional[str] = Field(None, max_length=255)
 
 
+class AppointmentBatchUpdate(AppointmentUpdate):
+    """
+    Schema for one item of a batch update.
+    Identifies the appointment to change; all other fields are optional as in AppointmentUpdate.
+    """
+    id: int = Field(..., description="The ID of the appointment to update.")
+
+
 # --- Display Schema ---
 class AppointmentShow(AppointmentBase):
     """
@@ -0,0 +1,20 @@
+# backend/app/schemas/batch_schema.py
+
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from app.batch import MAX_BATCH_SIZE
+
+
+# --- Delete Schema ---
+class BatchDelete(BaseModel):
+    """
+    Schema for deleting several records of one type in a single request.
+    """
+    ids: List[int] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_SIZE,
+        description="The IDs of the records to delete."
+    )
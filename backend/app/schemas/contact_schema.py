@@ -52,6 +52,14 @@ class ContactUpdate(BaseModel):
     relationship_type: Optional[str] = Field(None, max_length=50)
 
 
+class ContactBatchUpdate(ContactUpdate):
+    """
+    Schema for one item of a batch update.
+    Identifies the contact to change; all other fields are optional as in ContactUpdate.
+    """
+    id: int = Field(..., description="The ID of the contact to update.")
+
+
 # --- Display Schema ---
 class ContactShow(ContactBase):
     """
@@ -0,0 +1,36 @@
+# backend/app/schemas/dashboard_schema.py
+
+from datetime import date
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.schemas.appointment_schema import AppointmentShow
+from app.schemas.contact_schema import ContactShow
+from app.schemas.medication_schema import MedicationShow
+from app.schemas.tip_schema import TipShow
+
+
+# --- Counts Schema ---
+class DashboardCounts(BaseModel):
+    """
+    Precomputed totals shown on the dashboard and the home page.
+    """
+    active_medications: int = Field(..., description="The number of active medications.")
+    appointments_today: int = Field(..., description="The number of appointments on the requested day.")
+    contacts: int = Field(..., description="The total number of emergency contacts, not just those returned.")
+
+
+# --- Display Schema ---
+class DashboardSummary(BaseModel):
+    """
+    Schema for the aggregated dashboard response.
+    Bundles everything the dashboard needs so the client can render it from a single request.
+    Sections that were not requested with `fields` are omitted from the response.
+    """
+    day: date = Field(..., description="The day the summary was built for.")
+    medications: Optional[List[MedicationShow]] = Field(None, description="Active medications, ordered by timing.")
+    appointments: Optional[List[AppointmentShow]] = Field(None, description="The day's appointments, ordered by time.")
+    contacts: Optional[List[ContactShow]] = Field(None, description="The user's first emergency contacts.")
+    tip: Optional[TipShow] = Field(None, description="The health tip of the day, if any tips exist.")
+    counts: DashboardCounts
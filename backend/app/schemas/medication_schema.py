@@ -38,6 +38,14 @@ class MedicationUpdate(BaseModel):
     is_active: Optional[bool] = None
 
 
+class MedicationBatchUpdate(MedicationUpdate):
+    """
+    Schema for one item of a batch update.
+    Identifies the medication to change; all other fields are optional as in MedicationUpdate.
+    """
+    id: int = Field(..., description="The ID of the medication to update.")
+
+
 # --- Display Schema ---
 class MedicationShow(MedicationBase):
     """
@@ -0,0 +1,38 @@
+# backend/app/schemas/search_schema.py
+
+from datetime import datetime
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+# --- Display Schemas ---
+class SearchResult(BaseModel):
+    """
+    Schema for one record found by a search. Its full data is available from
+    the endpoint of its kind, e.g. `/appointments/{id}`.
+    """
+    id: int
+    title: str = Field(..., description="The medication's, doctor's or contact's name.")
+    subtitle: Optional[str] = Field(None, description="The dosage, the purpose of the visit or the relationship.")
+    detail: Optional[str] = Field(None, description="The appointment's location or the contact's phone number.")
+    at: Optional[datetime] = Field(None, description="The appointment's date and time.")
+    score: float = Field(..., description="The relevance of the record; higher is better.")
+
+
+class SearchGroup(BaseModel):
+    """
+    Schema for the matching records of one kind.
+    """
+    kind: Literal["medications", "appointments", "contacts"]
+    total: int = Field(..., description="The number of matching records of this kind, not just those returned.")
+    best_score: float = Field(..., description="The score of the best match, by which the groups are ordered.")
+    results: List[SearchResult] = Field(..., description="The best matches, best first.")
+
+
+class SearchResponse(BaseModel):
+    """
+    Schema for the response of a search across a user's records.
+    """
+    terms: List[str] = Field(..., description="The words that were searched for, without stopwords.")
+    groups: List[SearchGroup] = Field(..., description="One group per kind with matches, best group first.")
@@ -0,0 +1,12 @@
+# backend/app/schemas/suggest_schema.py
+
+from pydantic import BaseModel, Field
+
+
+# --- Display Schema ---
+class Suggestion(BaseModel):
+    """
+    Schema for one typeahead suggestion.
+    """
+    name: str = Field(..., description="The suggested name, as the user first spelled it.")
+    uses: int = Field(..., description="How many of the user's records use this name; 0 for dictionary names.")
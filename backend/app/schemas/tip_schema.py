@@ -1,6 +1,6 @@
 # backend/app/schemas/tip_schema.py
 
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -39,3 +39,33 @@ class TipShow(TipBase):
     class Config:
         # Pydantic v2 setting to allow creating the schema from an ORM model.
         from_attributes = True
+
+
+# --- Search Schema ---
+class TipSearchResult(TipShow):
+    """
+    Schema for one health tip found by a full-text search.
+    """
+    rank: float = Field(..., description="The relevance score; higher is better. Only comparable within one search.")
+
+
+# --- Bulk Ingestion Schemas ---
+class TipIngestError(BaseModel):
+    """
+    Schema describing one row that was rejected during bulk ingestion.
+    """
+    line: int = Field(..., description="The line of the input the row starts on.")
+    detail: str = Field(..., description="Why the row was rejected.")
+
+
+class TipIngestReport(BaseModel):
+    """
+    Schema for the summary returned after a bulk tip ingestion.
+    """
+    received: int = Field(..., description="The number of rows read from the input.")
+    inserted: int = Field(..., description="The number of new tips stored.")
+    duplicates: int = Field(..., description="Rows skipped because the same content is already stored or was repeated.")
+    invalid: int = Field(..., description="Rows skipped because they failed validation.")
+    errors: List[TipIngestError] = Field(..., description="The first rejected rows.")
+    seconds: float = Field(..., description="The time the ingestion took.")
+    rows_per_second: float = Field(..., description="The ingestion throughput.")
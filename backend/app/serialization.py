@@ -0,0 +1,282 @@
+# backend/app/serialization.py
+
+import struct
+from datetime import date, datetime, time
+from typing import Any, Callable, Coroutine, Dict, Iterable, List, Optional, Set, Tuple, Type
+
+import msgpack
+import orjson
+from fastapi import HTTPException, Request, Response, status
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, TypeAdapter, create_model
+from sqlalchemy import Column, Row
+
+# Column types that orjson encodes exactly like Pydantic's JSON mode (datetimes are
+# stored naive, so no UTC "Z" vs "+00:00" difference arises), so rows
+# made only of these types can be serialized without going through Pydantic.
+NATIVE_JSON_TYPES = (bool, int, float, str, date, datetime, time)
+
+
+# --- MessagePack ---
+# Clients that send `Accept: application/msgpack` receive MessagePack instead
+# of JSON. Dates and times, which JSON spells out as 8-26 character strings,
+# are packed into fixed-size extension types:
+#   1  date             int32, days since 1970-01-01
+#   2  time             int64, microseconds since midnight
+#   3  naive datetime   int64, microseconds since 1970-01-01T00:00:00
+# Timezone-aware values are sent as ISO 8601 strings, as in JSON.
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+EXT_DATE = 1
+EXT_TIME = 2
+EXT_DATETIME = 3
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_DAY = _EPOCH.toordinal()
+
+
+def _msgpack_default(value: Any) -> Any:
+    """
+    Encodes the types MessagePack does not support natively.
+    """
+    # `datetime` is a subclass of `date`, so it must be checked first.
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            return value.isoformat()
+        delta = value - _EPOCH
+        micros = (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+        return msgpack.ExtType(EXT_DATETIME, struct.pack(">q", micros))
+    if isinstance(value, date):
+        return msgpack.ExtType(EXT_DATE, struct.pack(">i", value.toordinal() - _EPOCH_DAY))
+    if isinstance(value, time):
+        if value.tzinfo is not None:
+            return value.isoformat()
+        micros = ((value.hour * 60 + value.minute) * 60 + value.second) * 1_000_000 + value.microsecond
+        return msgpack.ExtType(EXT_TIME, struct.pack(">q", micros))
+    raise TypeError(f"Cannot serialize {type(value).__name__} to MessagePack.")
+
+
+def packb(content: Any) -> bytes:
+    """Encodes a value as MessagePack, using the extension types above."""
+    return msgpack.packb(content, default=_msgpack_default)
+
+
+def wants_msgpack(request: Request) -> bool:
+    """
+    Decides from the `Accept` header whether the client prefers MessagePack.
+
+    MessagePack is chosen only if it is listed with a quality at least as high
+    as JSON (or a wildcard), so clients that do not ask for it keep getting JSON.
+    """
+    msgpack_quality = json_quality = 0.0
+    for media_range in request.headers.get("accept", "").split(","):
+        media_type, *params = [part.strip().lower() for part in media_range.split(";")]
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        if media_type in MSGPACK_MEDIA_TYPES:
+            msgpack_quality = max(msgpack_quality, quality)
+        elif media_type in ("application/json", "application/*", "*/*"):
+            json_quality = max(json_quality, quality)
+    return msgpack_quality > 0 and msgpack_quality >= json_quality
+
+
+class NegotiatedRoute(APIRoute):
+    """
+    A route class that serves JSON or MessagePack depending on `Accept`.
+
+    Routes build their JSON response as usual. When the client prefers
+    MessagePack, the JSON body is read back through the route's response
+    model, so dates and times regain their Python types, and re-encoded as
+    MessagePack. Responses that are already MessagePack (such as those built
+    by `RowSerializer`) are left alone. Every response gets `Vary: Accept`.
+
+    Error responses raised as HTTPException are rendered by the exception
+    handlers after this point and stay JSON.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+        adapter = TypeAdapter(self.response_model) if self.response_model is not None else None
+
+        async def negotiated_handler(request: Request) -> Response:
+            response = await handler(request)
+            response.headers.add_vary_header("Accept")
+
+            content_type = response.headers.get("content-type", "")
+            body = getattr(response, "body", None)  # Streaming responses have no body to convert.
+            if not (body and content_type.startswith("application/json") and wants_msgpack(request)):
+                return response
+
+            if adapter is not None:
+                # Honour the route's exclusion options, as FastAPI did for the JSON body.
+                content = adapter.dump_python(
+                    adapter.validate_json(body),
+                    exclude_unset=self.response_model_exclude_unset,
+                    exclude_defaults=self.response_model_exclude_defaults,
+                    exclude_none=self.response_model_exclude_none,
+                )
+            else:
+                content = orjson.loads(body)
+
+            packed = Response(content=packb(content), status_code=response.status_code, media_type=MSGPACK_MEDIA_TYPE)
+            for key, value in response.headers.items():
+                if key not in ("content-length", "content-type"):
+                    packed.headers.append(key, value)
+            return packed
+
+        return negotiated_handler
+
+
+# --- Sparse Fieldsets ---
+# List and detail endpoints accept `?fields=name,timing` to return (and read
+# from the database) only some of their fields.
+FIELDS_DESCRIPTION = "Comma-separated names of the fields to return, e.g. `id,name`. Defaults to all fields."
+
+
+def parse_fields(fields: Optional[str], available: Iterable[str]) -> Optional[Set[str]]:
+    """
+    Parses the value of a `fields=` query parameter.
+
+    Args:
+        fields: The raw parameter value, e.g. "name,phone_number".
+        available: The field names that may be requested.
+
+    Raises:
+        HTTPException (400): If a requested name is not available.
+
+    Returns:
+        The requested names, or None if every field should be returned.
+    """
+    requested = {name.strip() for name in (fields or "").split(",") if name.strip()}
+    if not requested:
+        return None
+
+    available = list(available)
+    unknown = requested.difference(available)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown field(s): {', '.join(sorted(unknown))}. Available fields: {', '.join(available)}."
+        )
+    return requested
+
+
+class RowSerializer:
+    """
+    Serializes column-projected rows straight into a response.
+
+    A list endpoint that returns ORM objects with a `response_model` builds an
+    entity per row, then validates and converts each one through Pydantic. With
+    a `RowSerializer` the route selects only the columns of the display schema
+    and hands the plain rows to orjson instead.
+
+    `only()` narrows the serializer to a sparse fieldset, so a route can select
+    and encode just the fields a client asked for.
+
+    If any schema field maps to a column type that orjson would encode
+    differently from Pydantic, the rows are validated with a prebuilt
+    `TypeAdapter` first, so the output is the same either way.
+    """
+
+    def __init__(self, model: Type[Any], schema: Type[BaseModel]):
+        """
+        Args:
+            model: The mapped class to read from.
+            schema: The display schema; its field names must be column names of `model`.
+        """
+        self.model = model
+        self.schema = schema
+        self.names: Tuple[str, ...] = tuple(schema.model_fields)
+        self.columns: List[Column] = [model.__table__.c[name] for name in self.names]
+        self.needs_validation = any(
+            column.type.python_type not in NATIVE_JSON_TYPES for column in self.columns
+        )
+        self.adapter = TypeAdapter(List[schema])
+        self.item_adapter = TypeAdapter(schema)
+        # Narrowed serializers, keyed by field names. There are at most
+        # 2^len(fields) of them, so the cache needs no bound.
+        self._subsets: Dict[Tuple[str, ...], "RowSerializer"] = {}
+
+    def only(self, fields: Optional[str]) -> "RowSerializer":
+        """
+        Returns a serializer for a sparse fieldset.
+
+        Args:
+            fields: The value of the `fields=` query parameter. None or an
+                    empty value selects every field.
+
+        Raises:
+            HTTPException (400): If a requested name is not a field of the schema.
+        """
+        requested = parse_fields(fields, self.names)
+        if requested is None or len(requested) == len(self.names):
+            return self
+
+        # Keep the schema's field order, so the same set always maps to the same entry.
+        names = tuple(name for name in self.names if name in requested)
+        subset = self._subsets.get(names)
+        if subset is None:
+            schema = create_model(
+                f"{self.schema.__name__}Fields",
+                **{name: (self.schema.model_fields[name].annotation, self.schema.model_fields[name]) for name in names},
+            )
+            subset = self._subsets[names] = RowSerializer(self.model, schema)
+        return subset
+
+    def columns_with(self, *names: str) -> List[Column]:
+        """
+        Returns the columns to select, plus any of `names` that are not among
+        them (e.g. a sort key needed for a cursor). Extra columns are selected
+        after the serialized ones and are not part of the output.
+        """
+        table = self.model.__table__
+        return self.columns + [table.c[name] for name in names if name not in self.names]
+
+    def _items(self, rows: Iterable[Row]) -> List[Dict[str, Any]]:
+        # `zip` stops at the serialized fields and drops any trailing extra columns.
+        return [dict(zip(self.names, row)) for row in rows]
+
+    def render(self, rows: Iterable[Row]) -> bytes:
+        """
+        Encodes rows selected from `columns` as a JSON array.
+        """
+        items = self._items(rows)
+        if self.needs_validation:
+            return self.adapter.dump_json(self.adapter.validate_python(items))
+        return orjson.dumps(items)
+
+    def response(self, rows: Iterable[Row], request: Request, response: Response) -> Response:
+        """
+        Builds the final response for a list endpoint, as MessagePack if the
+        client prefers it and as JSON otherwise.
+
+        Args:
+            rows: The projected rows, in response order.
+            request: The incoming request, for content negotiation.
+            response: The `Response` parameter of the route. Its headers
+                      (e.g. ETag or pagination cursors) are copied over, as
+                      FastAPI does not apply them to a returned response.
+        """
+        if wants_msgpack(request):
+            fast_response = Response(content=packb(self._items(rows)), media_type=MSGPACK_MEDIA_TYPE)
+        else:
+            fast_response = Response(content=self.render(rows), media_type="application/json")
+        for key, value in response.headers.items():
+            fast_response.headers[key] = value
+        return fast_response
+
+    def response_one(self, row: Row, request: Request) -> Response:
+        """
+        Builds the response for a detail endpoint from a single projected row.
+        """
+        item = self._items([row])[0]
+        if wants_msgpack(request):
+            return Response(content=packb(item), media_type=MSGPACK_MEDIA_TYPE)
+        if self.needs_validation:
+            return Response(content=self.item_adapter.dump_json(self.item_adapter.validate_python(item)), media_type="application/json")
+        return Response(content=orjson.dumps(item), media_type="application/json")
@@ -0,0 +1,302 @@
+# backend/app/suggest.py
+
+import bisect
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+from app.config import settings
+
+# --- Suggestion Kinds ---
+MEDICATION = "medication"
+DOCTOR = "doctor"
+
+# The column the names of each kind are taken from.
+SOURCE_COLUMNS = {
+    MEDICATION: models.Medication.name,
+    DOCTOR: models.Appointment.doctor_name,
+}
+
+_WORD = re.compile(r"\w+")
+
+
+def normalize(text: str) -> str:
+    """Case-folds text and reduces it to its words, so "Dr. Sharma" and "dr sharma" match."""
+    return " ".join(_WORD.findall(text.casefold()))
+
+
+class PrefixIndex:
+    """
+    A set of names that can be looked up by the prefix of any of their words.
+
+    Each name is stored under its normalized key and under the key starting
+    at each later word, so "sha" finds "Dr. Anil Sharma". The keys are kept
+    in one sorted list, so the names matching a prefix are a binary search
+    and a short scan away.
+
+    Names that normalize to the same key are one entry, which counts how many
+    records use it and keeps the first spelling it was added with. An entry
+    is dropped when its count reaches zero.
+    """
+
+    def __init__(self, names: Iterable[Tuple[str, int]] = ()):
+        """
+        Args:
+            names: The initial (name, uses) pairs.
+        """
+        # Normalized name -> [display name, uses].
+        self._entries: Dict[str, List[Any]] = {}
+        for name, uses in names:
+            key = normalize(name)
+            if not key:
+                continue
+            entry = self._entries.get(key)
+            if entry is None:
+                self._entries[key] = [name, uses]
+            else:
+                entry[1] += uses
+        # Sorted (word key, normalized name) pairs; built in one sort rather than by insertion.
+        self._keys: List[Tuple[str, str]] = sorted(
+            (word_key, key) for key in self._entries for word_key in self._word_keys(key)
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _word_keys(key: str) -> List[str]:
+        words = key.split(" ")
+        return [" ".join(words[start:]) for start in range(len(words))]
+
+    def add(self, name: str, uses: int = 1) -> None:
+        """Adds a name, or counts more uses of a name already present."""
+        key = normalize(name)
+        if not key:
+            return
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry[1] += uses
+            return
+        self._entries[key] = [name, uses]
+        for word_key in self._word_keys(key):
+            bisect.insort(self._keys, (word_key, key))
+
+    def remove(self, name: str, uses: int = 1) -> None:
+        """Counts fewer uses of a name, and drops it when none are left."""
+        key = normalize(name)
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        entry[1] -= uses
+        if entry[1] > 0:
+            return
+        del self._entries[key]
+        for word_key in self._word_keys(key):
+            position = bisect.bisect_left(self._keys, (word_key, key))
+            if position < len(self._keys) and self._keys[position] == (word_key, key):
+                del self._keys[position]
+
+    def search(self, prefix: str, limit: int, by_uses: bool = True) -> List[Tuple[str, int]]:
+        """
+        Returns up to `limit` (name, uses) pairs whose words start with `prefix`.
+
+        Args:
+            prefix: What the user has typed so far. An empty prefix matches every name.
+            limit: The maximum number of names to return.
+            by_uses: Rank the most used names first (then alphabetically). Without
+                     it, names are returned alphabetically by the matching word and
+                     the scan stops after `limit` names, which suits large indexes.
+        """
+        prefix = normalize(prefix)
+        keys = self._keys
+        matches: Dict[str, None] = {}  # Normalized names in scan order, without duplicates.
+        for position in range(bisect.bisect_left(keys, (prefix,)), len(keys)):
+            word_key, key = keys[position]
+            if not word_key.startswith(prefix):
+                break
+            matches[key] = None
+            if not by_uses and len(matches) == limit:
+                break
+
+        entries = [self._entries[key] for key in matches]
+        if by_uses:
+            entries.sort(key=lambda entry: (-entry[1], entry[0].casefold()))
+        return [(name, uses) for name, uses in entries[:limit]]
+
+
+def load_dictionary(path: str) -> Optional[PrefixIndex]:
+    """
+    Loads the global medication dictionary: a UTF-8 text file with one name
+    per line. Blank lines and lines starting with "#" are skipped.
+    """
+    if not path:
+        return None
+    with open(path, encoding="utf-8") as file:
+        names = [line.strip() for line in file]
+    dictionary = PrefixIndex((name, 0) for name in names if name and not name.startswith("#"))
+    print(f"Suggestions: loaded {len(dictionary)} medication names from {path}.")
+    return dictionary
+
+
+class SuggestionIndex:
+    """
+    Per-user prefix indexes over the names of a user's medications and doctors.
+
+    An index is built from the database the first time a user asks for
+    suggestions of a kind, with one grouped query, and is then kept up to
+    date by the CRUD routes through `add()`, `remove()` and `invalidate()`, so
+    lookups are answered from memory. Indexes are rebuilt once they are older
+    than `ttl_seconds`, which bounds how long changes made through another
+    worker can be missing, and the least recently used ones are dropped once
+    more than `max_users` indexes are held.
+
+    Medication suggestions are topped up from an optional global dictionary
+    of medication names, after the user's own names.
+    """
+
+    def __init__(self, max_users: int, ttl_seconds: float, dictionary_path: str = ""):
+        """
+        Args:
+            max_users: The maximum number of (user, kind) indexes kept in memory.
+            ttl_seconds: How long an index is used before it is rebuilt.
+            dictionary_path: The global medication dictionary, or "" for none.
+                             It is read on first use.
+        """
+        self.max_users = max_users
+        self.ttl_seconds = ttl_seconds
+        self.dictionary_path = dictionary_path
+        self._dictionary: Optional[PrefixIndex] = None
+        self._dictionary_loaded = False
+        # (owner ID, kind) -> (loaded at, index), least recently used first.
+        self._indexes: "OrderedDict[Tuple[int, str], Tuple[float, PrefixIndex]]" = OrderedDict()
+        # (owner ID, kind) -> whether the load in progress is still current. A
+        # change during the load may or may not be in what it read, so it is discarded.
+        self._loading: Dict[Tuple[int, str], bool] = {}
+
+        # --- Monitoring Counters ---
+        self.loads = 0
+        self.hits = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def dictionary(self) -> Optional[PrefixIndex]:
+        """Returns the global medication dictionary, loading it on first use."""
+        if not self._dictionary_loaded:
+            self._dictionary = load_dictionary(self.dictionary_path)
+            self._dictionary_loaded = True
+        return self._dictionary
+
+    async def _user_index(self, db: AsyncSession, owner_id: int, kind: str) -> PrefixIndex:
+        key = (owner_id, kind)
+        cached = self._indexes.get(key)
+        if cached is not None and time.monotonic() - cached[0] < self.ttl_seconds:
+            self._indexes.move_to_end(key)
+            self.hits += 1
+            return cached[1]
+
+        column = SOURCE_COLUMNS[kind]
+        self._loading[key] = True
+        try:
+            rows = await db.execute(
+                select(column, func.count())
+                .where(column.class_.owner_id == owner_id)
+                .group_by(column)
+            )
+            index = PrefixIndex(rows.tuples())
+            current = self._loading.get(key, False)
+        finally:
+            self._loading.pop(key, None)
+
+        self.loads += 1
+        if current:
+            self._indexes[key] = (time.monotonic(), index)
+            self._indexes.move_to_end(key)
+            while len(self._indexes) > self.max_users:
+                self._indexes.popitem(last=False)
+                self.evictions += 1
+        return index
+
+    async def suggest(
+        self, db: AsyncSession, owner_id: int, kind: str, prefix: str, limit: int
+    ) -> List[Tuple[str, int]]:
+        """
+        Returns up to `limit` (name, uses) pairs for what a user has typed.
+
+        The user's own names come first, most used first; medication names
+        from the global dictionary (with 0 uses) fill the remaining places.
+
+        Args:
+            db: A session to build the user's index with, if it is not in memory.
+            owner_id: The ID of the user.
+            kind: MEDICATION or DOCTOR.
+            prefix: What the user has typed so far.
+            limit: The maximum number of suggestions.
+        """
+        index = await self._user_index(db, owner_id, kind)
+        suggestions = index.search(prefix, limit)
+
+        dictionary = self.dictionary() if kind == MEDICATION else None
+        if dictionary is not None and len(suggestions) < limit:
+            seen = {normalize(name) for name, _ in suggestions}
+            for name, uses in dictionary.search(prefix, limit, by_uses=False):
+                if normalize(name) not in seen:
+                    suggestions.append((name, uses))
+                    if len(suggestions) == limit:
+                        break
+        return suggestions
+
+    def _changed(self, owner_id: int, kind: str) -> Optional[PrefixIndex]:
+        key = (owner_id, kind)
+        if key in self._loading:
+            self._loading[key] = False
+        cached = self._indexes.get(key)
+        return cached[1] if cached is not None else None
+
+    def add(self, owner_id: int, kind: str, names: Iterable[str]) -> None:
+        """Records names used by records that were just created or renamed."""
+        index = self._changed(owner_id, kind)
+        if index is not None:
+            for name in names:
+                index.add(name)
+
+    def remove(self, owner_id: int, kind: str, names: Iterable[str]) -> None:
+        """Records names no longer used by records that were just deleted or renamed."""
+        index = self._changed(owner_id, kind)
+        if index is not None:
+            for name in names:
+                index.remove(name)
+
+    def invalidate(self, owner_id: int, kind: str) -> None:
+        """
+        Drops a user's index, for changes whose previous names are not known
+        (a single-row UPDATE or DELETE). It is rebuilt on the next lookup.
+        """
+        self._changed(owner_id, kind)
+        if self._indexes.pop((owner_id, kind), None) is not None:
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns a snapshot of the number of indexes held and the counters."""
+        return {
+            "indexes": len(self._indexes),
+            "max_users": self.max_users,
+            "ttl_seconds": self.ttl_seconds,
+            "dictionary_names": len(self._dictionary) if self._dictionary is not None else None,
+            "loads": self.loads,
+            "hits": self.hits,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+# Shared by the suggestion endpoint and the medication and appointment routes that keep it current.
+suggestions = SuggestionIndex(
+    max_users=settings.SUGGEST_MAX_USERS,
+    ttl_seconds=settings.SUGGEST_TTL_SECONDS,
+    dictionary_path=settings.MEDICATION_DICTIONARY_PATH,
+)
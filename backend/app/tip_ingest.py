@@ -0,0 +1,382 @@
+# backend/app/tip_ingest.py
+
+"""
+Bulk ingestion of health tips from NDJSON or CSV.
+
+Usage (from the `backend` directory):
+    python -m app.tip_ingest tips.ndjson
+    python -m app.tip_ingest tips.csv --batch-size 1000 --batches-per-transaction 10
+
+Each row has a `content` and an optional `category` (default "General"). For
+CSV, the first line is a header naming those columns. The same data can be
+uploaded to `POST /tips/bulk` with a `Content-Type` of `application/x-ndjson`
+or `text/csv` and the TIP_ADMIN_TOKEN in the `X-Admin-Token` header; the
+worker that receives the upload then reloads its tip pool right away.
+
+Rows are read as a stream, inserted with one multi-row statement per batch and
+committed every few batches, so memory use is bounded by one batch however
+large the input is. Tips whose normalized content is already stored (or
+appears earlier in the input) are skipped, using the unique `content_hash`
+column.
+"""
+
+import argparse
+import asyncio
+import codecs
+import csv
+import hashlib
+import io
+import json
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set
+
+from pydantic import ValidationError
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+from app.schemas import tip_schema
+
+# Rows per INSERT statement, and INSERT statements per transaction.
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_BATCHES_PER_TRANSACTION = 10
+
+# A single line longer than this is rejected instead of being buffered.
+MAX_LINE_CHARS = 64 * 1024
+
+# At most this many row errors are reported individually; the rest are only counted.
+MAX_REPORTED_ERRORS = 20
+
+FORMATS = ("ndjson", "csv")
+MEDIA_TYPE_FORMATS = {
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonlines": "ndjson",
+    "text/csv": "csv",
+}
+
+
+class IngestError(ValueError):
+    """Raised when the input as a whole cannot be read (e.g. a CSV without a header)."""
+
+
+def content_hash(content: str) -> str:
+    """
+    Returns the deduplication key of a tip's content.
+
+    Whitespace and letter case are normalized first, so tips that differ only
+    in formatting count as the same tip.
+    """
+    normalized = " ".join(content.split()).casefold()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+# --- Input Parsing ---
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Splits a stream of UTF-8 byte chunks into lines, without the line endings.
+
+    Raises:
+        IngestError: If a line is longer than MAX_LINE_CHARS.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+        if len(pending) > MAX_LINE_CHARS:
+            raise IngestError(f"A line is longer than {MAX_LINE_CHARS} characters.")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def _ndjson_records(lines: AsyncIterator[str]) -> AsyncIterator[Any]:
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError:
+            yield line_number, None
+
+
+async def _csv_records(lines: AsyncIterator[str]) -> AsyncIterator[Any]:
+    """
+    Yields one dictionary per CSV record, keyed by the header.
+
+    A quoted field may span several lines; a record is complete once it
+    contains an even number of quote characters.
+    """
+    header: Optional[List[str]] = None
+    buffer: List[str] = []
+    line_number = first_line = 0
+    async for line in lines:
+        line_number += 1
+        if not buffer:
+            first_line = line_number
+        buffer.append(line)
+        if sum(part.count('"') for part in buffer) % 2:
+            continue  # Inside a quoted field.
+
+        record = "\n".join(buffer)
+        buffer = []
+        if not record.strip():
+            continue
+        values = next(csv.reader(io.StringIO(record)))
+
+        if header is None:
+            header = [name.strip().lower() for name in values]
+            if "content" not in header:
+                raise IngestError("The CSV header must name a 'content' column.")
+            continue
+        yield first_line, dict(zip(header, values))
+
+    if buffer:
+        yield first_line, None  # An unterminated quoted field.
+
+
+def parse_records(lines: AsyncIterator[str], input_format: str) -> AsyncIterator[Any]:
+    """
+    Parses lines of NDJSON or CSV into (line number, record) pairs. A record
+    that cannot be parsed at all is passed on as None.
+    """
+    if input_format == "csv":
+        return _csv_records(lines)
+    return _ndjson_records(lines)
+
+
+def _validate(record: Any) -> tip_schema.TipCreate:
+    if not isinstance(record, dict):
+        raise ValueError("The row is not a valid JSON object or CSV record.")
+    if not record.get("category"):
+        record = {key: value for key, value in record.items() if key != "category"}  # Use the default.
+    tip = tip_schema.TipCreate.model_validate(record)
+    if not tip.content.strip():
+        raise ValueError("The tip content is empty.")
+    return tip
+
+
+# --- Ingestion ---
+class TipIngester:
+    """
+    Validates, deduplicates and inserts a stream of tip records.
+
+    Rows are collected into batches of `batch_size` and written with one
+    multi-row `INSERT ... ON CONFLICT (content_hash) DO NOTHING` each, and
+    the session is committed after every `batches_per_transaction` batches.
+    A failure therefore only rolls back the current chunk; earlier chunks
+    stay committed, and re-running the same input skips them as duplicates.
+
+    Repeats within one batch are dropped before the INSERT; repeats of
+    earlier batches are skipped by the unique index, so nothing is kept
+    in memory about rows already written.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        batches_per_transaction: int = DEFAULT_BATCHES_PER_TRANSACTION,
+    ):
+        self.db = db
+        self.batch_size = batch_size
+        self.batches_per_transaction = batches_per_transaction
+
+        self.received = 0
+        self.inserted = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.errors: List[Dict[str, Any]] = []
+        self._batch: List[Dict[str, Any]] = []
+        # The content hashes in `_batch`.
+        self._batch_hashes: Set[str] = set()
+        self._uncommitted_batches = 0
+
+    def _record_error(self, line: int, detail: str) -> None:
+        self.invalid += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "detail": detail})
+
+    async def _insert(self, rows: List[Dict[str, Any]]) -> int:
+        """Inserts a batch and returns the number of rows actually stored."""
+        dialect = self.db.get_bind().dialect.name
+
+        if dialect in ("postgresql", "sqlite"):
+            if dialect == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+            stmt = dialect_insert(models.Tip).values(rows).on_conflict_do_nothing(
+                index_elements=[models.Tip.content_hash]
+            )
+            result = await self.db.execute(stmt)
+            return result.rowcount
+
+        # Other databases: drop the hashes that already exist, then insert the rest.
+        existing = set(await self.db.scalars(
+            select(models.Tip.content_hash).where(models.Tip.content_hash.in_([row["content_hash"] for row in rows]))
+        ))
+        new_rows = [row for row in rows if row["content_hash"] not in existing]
+        if new_rows:
+            await self.db.execute(insert(models.Tip), new_rows)
+        return len(new_rows)
+
+    async def _flush(self) -> None:
+        if self._batch:
+            inserted = await self._insert(self._batch)
+            self.inserted += inserted
+            self.duplicates += len(self._batch) - inserted
+            self._batch = []
+            self._batch_hashes = set()
+            self._uncommitted_batches += 1
+        if self._uncommitted_batches >= self.batches_per_transaction:
+            await self.db.commit()
+            self._uncommitted_batches = 0
+
+    async def add(self, line: int, record: Any) -> None:
+        """Validates one record and queues it for insertion."""
+        self.received += 1
+        try:
+            tip = _validate(record)
+        except (ValidationError, ValueError) as error:
+            detail = "; ".join(e["msg"] for e in error.errors()) if isinstance(error, ValidationError) else str(error)
+            self._record_error(line, detail)
+            return
+
+        content = tip.content.strip()
+        digest = content_hash(content)
+        if digest in self._batch_hashes:
+            self.duplicates += 1
+            return
+        self._batch_hashes.add(digest)
+
+        self._batch.append({"category": tip.category, "content": content, "content_hash": digest})
+        if len(self._batch) >= self.batch_size:
+            await self._flush()
+
+    async def finish(self) -> None:
+        """Writes the last partial batch and commits."""
+        await self._flush()
+        await self.db.commit()
+        self._uncommitted_batches = 0
+
+
+async def ingest_tips(
+    db: AsyncSession,
+    chunks: AsyncIterator[bytes],
+    input_format: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    batches_per_transaction: int = DEFAULT_BATCHES_PER_TRANSACTION,
+) -> Dict[str, Any]:
+    """
+    Ingests a stream of NDJSON or CSV bytes into the tips table.
+
+    Args:
+        db: The session to write with. It is committed in chunks.
+        chunks: The raw input, e.g. `request.stream()`.
+        input_format: "ndjson" or "csv".
+        batch_size: Rows per INSERT statement.
+        batches_per_transaction: INSERT statements per commit.
+
+    Raises:
+        IngestError: If the input as a whole cannot be read.
+
+    Returns:
+        A report with the row counts, the first row errors, the elapsed time
+        and the throughput in rows per second.
+    """
+    started_at = time.perf_counter()
+    ingester = TipIngester(db, batch_size=batch_size, batches_per_transaction=batches_per_transaction)
+    try:
+        async for line, record in parse_records(iter_lines(chunks), input_format):
+            await ingester.add(line, record)
+        await ingester.finish()
+    except BaseException:
+        await db.rollback()
+        raise
+
+    seconds = time.perf_counter() - started_at
+    return {
+        "received": ingester.received,
+        "inserted": ingester.inserted,
+        "duplicates": ingester.duplicates,
+        "invalid": ingester.invalid,
+        "errors": ingester.errors,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(ingester.received / seconds, 1) if seconds else 0.0,
+    }
+
+
+def backfill_content_hashes(connection) -> None:
+    """
+    Fills `content_hash` for tips stored before the column existed.
+
+    Used by `app.schema.upgrade_schema`. If the table already holds the same
+    content more than once, only the oldest copy gets the hash; the unique
+    index allows the others to keep a NULL.
+    """
+    tips = models.Tip.__table__
+    seen: Set[str] = set()
+    updates = []
+    for tip_id, content in connection.execute(select(tips.c.id, tips.c.content).order_by(tips.c.id)):
+        digest = content_hash(content)
+        if digest not in seen:
+            seen.add(digest)
+            updates.append({"tip_id": tip_id, "digest": digest})
+
+    if updates:
+        connection.execute(
+            update(tips).where(tips.c.id == bindparam("tip_id")).values(content_hash=bindparam("digest")),
+            updates,
+        )
+
+
+# --- Command Line ---
+async def _file_chunks(path: str, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    with open(path, "rb") as file:
+        while chunk := file.read(chunk_size):
+            yield chunk
+
+
+def _guess_format(path: str) -> str:
+    return "csv" if path.lower().endswith(".csv") else "ndjson"
+
+
+async def _run(path: str, input_format: str, batch_size: int, batches_per_transaction: int) -> Dict[str, Any]:
+    from app.database import AsyncSessionLocal, async_engine
+
+    try:
+        async with AsyncSessionLocal() as db:
+            return await ingest_tips(db, _file_chunks(path), input_format, batch_size, batches_per_transaction)
+    finally:
+        await async_engine.dispose()
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Bulk-load health tips from an NDJSON or CSV file.")
+    parser.add_argument("path", help="The file to load.")
+    parser.add_argument("--format", choices=FORMATS, help="The input format (default: guessed from the extension).")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Rows per INSERT statement (default: {DEFAULT_BATCH_SIZE}).")
+    parser.add_argument("--batches-per-transaction", type=int, default=DEFAULT_BATCHES_PER_TRANSACTION,
+                        help=f"INSERT statements per commit (default: {DEFAULT_BATCHES_PER_TRANSACTION}).")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(_run(args.path, args.format or _guess_format(args.path), args.batch_size, args.batches_per_transaction))
+
+    print(f"Read {report['received']} rows in {report['seconds']:.2f}s ({report['rows_per_second']:.0f} rows/s): "
+          f"{report['inserted']} inserted, {report['duplicates']} duplicates, {report['invalid']} invalid.")
+    for error in report["errors"]:
+        print(f"    line {error['line']}: {error['detail']}")
+    print("Running API workers pick up the new tips within TIP_POOL_TTL_SECONDS "
+          "(uploads to POST /tips/bulk are served by the receiving worker right away).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+# backend/app/tip_pool.py
+
+import asyncio
+import bisect
+import hashlib
+import random
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+from app.tip_search import TipSearchIndex
+
+# A day's picks are dropped once it is this far behind the server's date
+# (clients in other time zones may still be on the previous day).
+DAILY_PICKS_GRACE = timedelta(days=1)
+# Bounds the days whose picks are remembered, and the picks per day. Beyond
+# these, picks for further days or seeds are computed on every request
+# instead; the unseeded picks of a remembered day are always kept.
+MAX_DAILY_PICK_DAYS = 64
+MAX_DAILY_PICKS = 4096
+
+
+class PooledTip:
+    """
+    A compact, read-only copy of one row of the `tips` table.
+
+    `__slots__` keeps each record to three references, without a per-instance
+    `__dict__`, so the whole table fits comfortably in memory.
+    """
+    __slots__ = ("id", "category", "content")
+
+    def __init__(self, id: int, category: str, content: str):
+        self.id = id
+        self.category = category
+        self.content = content
+
+
+class TipPool:
+    """
+    An in-process copy of the `tips` table that tips are served from.
+
+    Tips are stored in one array, and a per-category index holds the positions
+    of each category's tips in that array, so a random pick, with or without a
+    category, is a single `random.choice`.
+
+    The pool is refreshed once it is older than `ttl_seconds`, so tips added
+    through another worker show up here within one TTL. Tips created through
+    this worker are added right away with `add()`. A refresh only fetches the
+    tips with IDs above the highest one already loaded; if the row count then
+    does not match (e.g. tips were deleted), the whole table is reloaded instead.
+
+    The full-text search index is built on the first search and then kept up
+    to date as tips are appended, so it is only rebuilt after a full reload.
+    It is built in a worker thread, so requests keep being served meanwhile.
+
+    The tip of the day is remembered once picked, so it stays the same for
+    the whole day even if tips are added or the pool is reloaded meanwhile.
+    A day's picks are dropped once that day is over, and requests with many
+    different seeds cannot push out the unseeded pick.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        """
+        Args:
+            ttl_seconds: How long a loaded copy is used before it is reloaded.
+        """
+        self.ttl_seconds = ttl_seconds
+        self._tips: List[PooledTip] = []
+        # Lower-cased category -> positions in `_tips`.
+        self._by_category: Dict[str, List[int]] = {}
+        self._max_id = 0
+        self._search_index: Optional[TipSearchIndex] = None
+        self._loaded_at: Optional[float] = None
+        # Ensures that concurrent requests on an expired pool trigger one reload, not one each.
+        self._load_lock = asyncio.Lock()
+        self._index_lock = asyncio.Lock()
+        # day -> (category, seed) -> the tip picked for it.
+        self._daily_picks: Dict[date, Dict[Tuple[Optional[str], Optional[str]], PooledTip]] = {}
+
+        # --- Monitoring Counters ---
+        self.loads = 0
+        self.refreshes = 0
+        self.index_builds = 0
+        self.hits = 0
+        self.daily_pick_hits = 0
+        self.daily_pick_misses = 0
+        self.searches = 0
+
+    def _is_fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl_seconds
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        """
+        Loads or refreshes the pool from the database if it is empty or expired.
+
+        Args:
+            db: A session to read the tips with. A fresh pool does not use it,
+                so no connection is checked out.
+        """
+        if self._is_fresh():
+            return
+
+        async with self._load_lock:
+            if self._is_fresh():  # Another request reloaded the pool while we waited.
+                return
+
+            if self._loaded_at is None or not await self._refresh(db):
+                await self._reload(db)
+            self._loaded_at = time.monotonic()
+
+    async def _reload(self, db: AsyncSession) -> None:
+        """Replaces the pool with a full copy of the table."""
+        rows = await db.execute(
+            select(models.Tip.id, models.Tip.category, models.Tip.content).order_by(models.Tip.id)
+        )
+        tips = [PooledTip(*row) for row in rows]
+        by_category: Dict[str, List[int]] = {}
+        for position, tip in enumerate(tips):
+            by_category.setdefault(tip.category.lower(), []).append(position)
+
+        # Swap the structures at once, so readers never see a mix of old and new.
+        # The search index is rebuilt on the next search.
+        self._tips, self._by_category, self._search_index = tips, by_category, None
+        self._max_id = tips[-1].id if tips else 0
+        self.loads += 1
+
+    async def _refresh(self, db: AsyncSession) -> bool:
+        """
+        Appends the tips added since the last load.
+
+        Returns:
+            False if the pool no longer matches the table and must be reloaded.
+        """
+        rows = await db.execute(
+            select(models.Tip.id, models.Tip.category, models.Tip.content)
+            .where(models.Tip.id > self._max_id)
+            .order_by(models.Tip.id)
+        )
+        new_tips = [PooledTip(*row) for row in rows]
+        count = await db.scalar(select(func.count()).select_from(models.Tip))
+        if len(self._tips) + len(new_tips) != count:
+            return False
+
+        for tip in new_tips:
+            self._append(tip)
+        self.refreshes += 1
+        return True
+
+    def _append(self, tip: PooledTip) -> None:
+        self._tips.append(tip)
+        position = len(self._tips) - 1
+        self._by_category.setdefault(tip.category.lower(), []).append(position)
+        if self._search_index is not None:
+            self._search_index.add(position, tip.category, tip.content)
+        self._max_id = tip.id
+
+    def add(self, tip: models.Tip) -> None:
+        """
+        Adds a newly created tip to the pool without waiting for a refresh.
+        """
+        if tip.id <= self._max_id:
+            # Already loaded, or out of ID order (which `page()` relies on); reload instead.
+            self.invalidate()
+            return
+        self._append(PooledTip(tip.id, tip.category, tip.content))
+
+    def invalidate(self) -> None:
+        """Forces a full reload on the next request."""
+        self._loaded_at = None
+
+    def _positions(self, category: Optional[str]) -> Optional[List[int]]:
+        """Returns the array positions of a category's tips, or None for every tip."""
+        if category is None:
+            return None
+        return self._by_category.get(category.lower(), [])
+
+    def random(self, category: Optional[str] = None) -> Optional[PooledTip]:
+        """
+        Returns a random tip, optionally from one category (case-insensitive).
+
+        Returns:
+            The tip, or None if the pool (or the category) has no tips.
+        """
+        tips = self._tips
+        if category is None:
+            if not tips:
+                return None
+            self.hits += 1
+            return random.choice(tips)
+
+        positions = self._by_category.get(category.lower())
+        if not positions:
+            return None
+        self.hits += 1
+        return tips[random.choice(positions)]
+
+    def tip_of_the_day(self, day: date, category: Optional[str] = None, seed: Optional[str] = None) -> Optional[PooledTip]:
+        """
+        Picks the tip for a given day deterministically.
+
+        Without a seed, consecutive days step through the tips in ID order, so
+        no tip repeats before all have been shown. A seed (e.g. a user ID)
+        shifts the starting point, so different seeds see different tips.
+
+        Args:
+            day: The day to pick the tip for.
+            category: Only pick from this category (case-insensitive).
+            seed: An optional string that varies the pick.
+
+        Returns:
+            The tip, or None if the pool (or the category) has no tips.
+        """
+        key = (category.lower() if category else None, seed)
+        picks = self._daily_picks_for(day)
+        pick = picks.get(key) if picks is not None else None
+        if pick is not None:
+            self.daily_pick_hits += 1
+            return pick
+
+        positions = self._positions(category)
+        count = len(self._tips) if positions is None else len(positions)
+        if count == 0:
+            return None
+
+        offset = int.from_bytes(hashlib.sha256(seed.encode("utf-8")).digest()[:8], "big") if seed else 0
+        index = (day.toordinal() + offset) % count
+        pick = self._tips[index if positions is None else positions[index]]
+
+        self.daily_pick_misses += 1
+        if picks is not None and (seed is None or len(picks) < MAX_DAILY_PICKS):
+            picks[key] = pick
+        return pick
+
+    def _daily_picks_for(self, day: date) -> Optional[Dict[Tuple[Optional[str], Optional[str]], PooledTip]]:
+        """
+        Returns the remembered picks of a day, dropping those of days that are over.
+
+        The days around the server's date are always remembered, so requests
+        for many future days cannot crowd out today's picks.
+
+        Returns:
+            None if the picks of `day` are not remembered: the day is over, or
+            it lies further ahead and MAX_DAILY_PICK_DAYS days are remembered already.
+        """
+        today = date.today()
+        oldest = today - DAILY_PICKS_GRACE
+        if day < oldest:
+            return None
+        for past_day in [past_day for past_day in self._daily_picks if past_day < oldest]:
+            del self._daily_picks[past_day]
+        picks = self._daily_picks.get(day)
+        if picks is None and (day <= today + DAILY_PICKS_GRACE or len(self._daily_picks) < MAX_DAILY_PICK_DAYS):
+            picks = self._daily_picks[day] = {}
+        return picks
+
+    def page(self, limit: int, after_id: Optional[int] = None, category: Optional[str] = None) -> List[PooledTip]:
+        """
+        Returns up to `limit` tips in ID order, starting after `after_id`.
+
+        The array is sorted by ID (tips are loaded in ID order and new tips get
+        higher IDs), so each page starts with a binary search.
+        """
+        tips = self._tips
+        positions = self._positions(category)
+        if positions is None:
+            start = bisect.bisect_right(tips, after_id, key=lambda tip: tip.id) if after_id is not None else 0
+            return tips[start:start + limit]
+
+        start = bisect.bisect_right(positions, after_id, key=lambda position: tips[position].id) if after_id is not None else 0
+        return [tips[position] for position in positions[start:start + limit]]
+
+    async def search_index(self) -> TipSearchIndex:
+        """Returns the search index over the pool, building it if necessary."""
+        while self._search_index is None:
+            async with self._index_lock:
+                if self._search_index is not None:  # Another request built it while we waited.
+                    break
+                tips = self._tips
+                index = await asyncio.to_thread(_build_search_index, tips[:])
+                if tips is not self._tips:
+                    continue  # Fully reloaded meanwhile; build again from the new tips.
+                # Tips appended while the index was being built.
+                for position in range(index.size, len(tips)):
+                    index.add(position, tips[position].category, tips[position].content)
+                self._search_index = index
+                self.index_builds += 1
+        return self._search_index
+
+    async def search(
+        self,
+        query: str,
+        limit: int,
+        offset: int = 0,
+        category: Optional[str] = None,
+    ) -> List[Tuple[PooledTip, float]]:
+        """
+        Full-text searches the pool; see `TipSearchIndex` for the ranking.
+
+        Returns:
+            Up to `limit` (tip, score) pairs, best first, after skipping `offset`.
+        """
+        index = await self.search_index()
+        tips = self._tips
+        matches = index.search(query, limit, offset, allowed=self._positions(category))
+        self.searches += 1
+        return [(tips[position], score) for position, score in matches]
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns a snapshot of the pool's size and counters."""
+        return {
+            "tips": len(self._tips),
+            "categories": {category: len(positions) for category, positions in sorted(self._by_category.items())},
+            "ttl_seconds": self.ttl_seconds,
+            "age_seconds": round(time.monotonic() - self._loaded_at, 1) if self._loaded_at is not None else None,
+            "loads": self.loads,
+            "refreshes": self.refreshes,
+            "hits": self.hits,
+            "daily_picks": sum(len(picks) for picks in self._daily_picks.values()),
+            "daily_pick_hits": self.daily_pick_hits,
+            "daily_pick_misses": self.daily_pick_misses,
+            "searches": self.searches,
+            "index_builds": self.index_builds,
+            "search_index_terms": self._search_index.terms if self._search_index is not None else None,
+        }
+
+
+def _build_search_index(tips: List[PooledTip]) -> TipSearchIndex:
+    index = TipSearchIndex()
+    for position, tip in enumerate(tips):
+        index.add(position, tip.category, tip.content)
+    return index
@@ -0,0 +1,262 @@
+# backend/app/tip_search.py
+
+import math
+import re
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Registers PostgreSQL's full-text search functions (`websearch_to_tsquery` etc.) with `func`.
+import sqlalchemy.dialects.postgresql  # noqa: F401
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+
+# Words too common to be worth indexing.
+STOPWORDS = frozenset("""
+a an and are as at be but by can do does for from has have how if in into is it its
+of on or so than that the their them then there these they this to was were what when
+which while who will with you your
+""".split())
+
+_WORD = re.compile(r"\w+")
+
+# PostgreSQL only: the stored `tsvector` of a tip's category and content.
+# It is added by `app.schema` rather than mapped on the model, as other
+# databases have no `tsvector` type.
+SEARCH_VECTOR = literal_column("tips.search_vector")
+
+# The cost of one binary-search probe relative to one element of a set intersection.
+PROBE_COST = 10
+
+
+def search_query(text: str):
+    """Parses web-search style input (`sleep -coffee "blood sugar"`) into a `tsquery`."""
+    # The same configuration as the `search_vector` column in `app.schema`.
+    return func.websearch_to_tsquery(literal_column("'english'::regconfig"), text)
+
+
+_VOWELS = frozenset("aeiouy")
+
+
+def stem(word: str) -> str:
+    """
+    Reduces a lower-cased word to its stem with a few English suffix rules,
+    so that "sleeping", "sleeps" and "sleep", or "hydrated" and "hydrate",
+    match as PostgreSQL's English stemmer would match them.
+
+    The rules only ever cut a suffix, so a stem is always a prefix of the
+    word; `app.record_search` relies on that for its substring filter.
+    Irregular forms ("slept") are not related to their stems.
+    """
+    if len(word) <= 3:
+        return word
+
+    # Plurals and third person: "berries", "glasses", "walks".
+    if word.endswith("ies") and len(word) > 4:
+        word = word[:-3]
+    elif word.endswith("sses"):
+        word = word[:-2]
+    elif word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        word = word[:-1]
+
+    # Participles: "walking", "walked", "running", "stopped", "worried".
+    for suffix in ("ing", "ed"):
+        if word.endswith(suffix) and not word.endswith("eed"):
+            base = word[:-len(suffix)]
+            if len(base) >= 3 and not _VOWELS.isdisjoint(base):
+                word = base
+                if word[-1] == word[-2] and word[-1] not in _VOWELS and word[-1] not in "lsz":
+                    word = word[:-1]
+                elif word.endswith("i"):
+                    word = word[:-1]
+            break
+
+    # A final silent "e" or consonant "y": "hydrate", "exercise", "berry".
+    if len(word) > 3:
+        if word.endswith("e") and not word.endswith("ee"):
+            word = word[:-1]
+        elif word.endswith("y") and word[-2] not in _VOWELS:
+            word = word[:-1]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Splits text into index terms: lower-cased words without stopwords,
+    reduced to their stems (see `stem`).
+    """
+    return [stem(word) for word in _WORD.findall(text.lower()) if word not in STOPWORDS]
+
+
+class TipSearchIndex:
+    """
+    An in-process inverted index over the tips of a `TipPool`.
+
+    Every term maps to a compact `array` of the (ascending) pool positions of
+    the tips it occurs in. The few tips that contain a term more than once are
+    also kept in a small per-term dict with the count.
+
+    A query matches the tips that contain all of its terms, ranked by the sum
+    of tf * idf over the terms, ties in ID order. Since most terms occur once
+    per tip, most matches share the same base score: the tips with repeated
+    terms are scored and sorted first, and the rest are taken in position
+    order from the rarest term's postings, stopping as soon as the page is
+    full. A query therefore never scores every matching tip.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, array] = {}
+        # Term -> {position: count} for the tips that contain the term more than once.
+        self._repeats: Dict[str, Dict[int, int]] = {}
+        self.size = 0
+
+    @property
+    def terms(self) -> int:
+        """The number of distinct terms in the index."""
+        return len(self._postings)
+
+    def add(self, position: int, category: str, content: str) -> None:
+        """
+        Indexes one tip. Positions must be added in increasing order.
+        """
+        for term, count in Counter(tokenize(f"{category} {content}")).items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = array("I")
+            postings.append(position)
+            if count > 1:
+                self._repeats.setdefault(term, {})[position] = count
+        self.size += 1
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        offset: int = 0,
+        allowed: Optional[Sequence[int]] = None,
+    ) -> List[Tuple[int, float]]:
+        """
+        Returns up to `limit` (position, score) pairs of the best matches,
+        skipping the first `offset`.
+
+        Args:
+            query: The search text.
+            limit: The maximum number of results.
+            offset: The number of better-ranked results to skip.
+            allowed: If given, the ascending positions that may match (e.g. a category).
+        """
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+
+        idf = {}
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                return []  # A term that occurs nowhere cannot be matched.
+            idf[term] = math.log(1 + self.size / len(postings))
+        base_score = sum(idf.values())
+
+        lists = [self._postings[term] for term in terms]
+        if allowed is not None:
+            lists.append(allowed)
+        lists.sort(key=len)
+        rarest, others = lists[0], lists[1:]
+        wanted = offset + limit
+
+        # Either probe the other lists for each tip of the rarest list, in order,
+        # until the page is full, or intersect all the lists at once with set
+        # operations. A probe is a binary search in Python, about ten times the
+        # cost per element of an intersection, so probe only when the expected
+        # number of probes (from the lists' selectivity) is small enough.
+        matched: Optional[set] = None
+        if others:
+            selectivity = math.prod(len(postings) / self.size for postings in others)
+            probes = min(len(rarest), wanted / max(selectivity, 1e-9)) * len(others)
+            if sum(map(len, lists)) < PROBE_COST * probes:
+                matched = set(rarest).intersection(*others)
+
+        def is_match(position: int) -> bool:
+            if matched is not None:
+                return position in matched
+            return all(_contains(postings, position) for postings in lists)
+
+        # Tips with a repeated query term score above the base; rank them first.
+        extra: Dict[int, float] = {}
+        for term in terms:
+            for position, count in self._repeats.get(term, {}).items():
+                extra[position] = extra.get(position, 0.0) + idf[term] * (count - 1)
+        results = sorted(
+            ((position, base_score + bonus) for position, bonus in extra.items() if is_match(position)),
+            key=lambda result: (-result[1], result[0])
+        )[:wanted]
+
+        # The remaining matches all have the base score, so they rank in position order.
+        if len(results) < wanted:
+            if matched is not None:
+                candidates = sorted(matched.difference(extra))
+            else:
+                candidates = (position for position in rarest if position not in extra)
+            for position in candidates:
+                if matched is None and not all(_contains(postings, position) for postings in others):
+                    continue
+                results.append((position, base_score))
+                if len(results) == wanted:
+                    break
+
+        return results[offset:]
+
+
+def _contains(positions: Sequence[int], position: int) -> bool:
+    """Binary search in an ascending sequence of positions."""
+    index = bisect_left(positions, position)
+    return index < len(positions) and positions[index] == position
+
+
+async def search_postgres(
+    db: AsyncSession,
+    query: str,
+    limit: int,
+    offset: int = 0,
+    category: Optional[str] = None,
+    max_ranked: int = 0,
+) -> List[Tuple[Any, float]]:
+    """
+    Searches the tips with PostgreSQL full-text search.
+
+    Matches are found through the GIN index on the stored `search_vector`
+    column (see `app.schema`) and ranked with `ts_rank_cd`, ties in ID order.
+    `query` uses the web search syntax: words are ANDed, and "quoted phrases",
+    `or` and `-word` work.
+
+    Ranking has to look at every match. With `max_ranked`, only the lowest-ID
+    matches, up to that many, are ranked, so the results stay the same from page to
+    page and end after `max_ranked` of them (0 ranks all).
+
+    Returns:
+        (row, rank) pairs; the rows have `id`, `category` and `content`.
+    """
+    # In FROM, so the query is parsed once, even in a generic (prepared) plan.
+    ts_query = search_query(query).column_valued("query")
+    candidates = (
+        select(models.Tip.id, models.Tip.category, models.Tip.content, SEARCH_VECTOR.label("search_vector"), ts_query)
+        .where(SEARCH_VECTOR.op("@@")(ts_query))
+    )
+    if category is not None:
+        candidates = candidates.where(func.lower(models.Tip.category) == category.lower())
+    if max_ranked:
+        candidates = candidates.order_by(models.Tip.id).limit(max_ranked)
+    candidates = candidates.subquery()
+
+    rank = func.ts_rank_cd(candidates.c.search_vector, candidates.c.query)
+    statement = (
+        select(candidates.c.id, candidates.c.category, candidates.c.content, rank.label("rank"))
+        .order_by(rank.desc(), candidates.c.id)
+        .offset(offset)
+        .limit(limit)
+    )
+    rows = await db.execute(statement)
+    return [(row, row.rank) for row in rows]
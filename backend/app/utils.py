@@ -2,27 +2,12 @@
 
 from datetime import datetime, timedelta
 
-from fastapi_mail import ConnectionConfig, FastMail, MessageSchema
+from fastapi_mail import MessageSchema
 from jose import jwt
 from pydantic import EmailStr
 
 from app.config import settings
-
-# --- Email Connection Configuration ---
-# This configuration object reads email server settings from your .env file
-# via the global `settings` instance. It's used by FastMail to connect to
-# your email provider's SMTP server.
-conf = ConnectionConfig(
-    MAIL_USERNAME=settings.MAIL_USERNAME,
-    MAIL_PASSWORD=settings.MAIL_PASSWORD,
-    MAIL_FROM=settings.MAIL_FROM,
-    MAIL_PORT=settings.MAIL_PORT,
-    MAIL_SERVER=settings.MAIL_SERVER,
-    MAIL_STARTTLS=True,
-    MAIL_SSL_TLS=False,
-    USE_CREDENTIALS=True,
-    VALIDATE_CERTS=True
-)
+from app.mailer import mailer
 
 
 def create_password_reset_token(email: str) -> str:
@@ -87,9 +72,8 @@ async def send_password_reset_email(email: EmailStr, token: str):
         subtype="html"
     )
 
-    fm = FastMail(conf)
     try:
-        await fm.send_message(message)
+        await mailer.send(message)
         print(f"Password reset email sent successfully to {email}")
     except Exception as e:
         # It's important to log errors in background tasks for debugging.
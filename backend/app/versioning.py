@@ -0,0 +1,162 @@
+# backend/app/versioning.py
+
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response, status
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import DataVersion
+from app.serialization import MSGPACK_MEDIA_TYPE, wants_msgpack
+
+# --- Collection Names ---
+# Each name identifies one per-user collection whose version is tracked.
+MEDICATIONS = "medications"
+APPOINTMENTS = "appointments"
+CONTACTS = "contacts"
+
+# Clients may keep a copy but must revalidate it on every use, and shared
+# caches must not store it because the data is private to the user.
+CACHE_CONTROL = "private, no-cache"
+
+
+async def bump_version(db: AsyncSession, owner_id: int, collection: str) -> None:
+    """
+    Increments the version of a user's collection.
+
+    Call this before committing a create, update or delete, so the new version
+    is committed in the same transaction as the change itself (and rolled back
+    with it). PostgreSQL and SQLite use a single upsert statement; other
+    databases fall back to an UPDATE followed by an INSERT for the first write.
+
+    Args:
+        db: The session of the write request.
+        owner_id: The ID of the user who owns the collection.
+        collection: One of the collection names defined in this module.
+    """
+    dialect = db.get_bind().dialect.name
+
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        stmt = insert(DataVersion).values(owner_id=owner_id, collection=collection, version=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DataVersion.owner_id, DataVersion.collection],
+            set_={"version": DataVersion.version + 1},
+        )
+        await db.execute(stmt)
+        return
+
+    result = await db.execute(
+        update(DataVersion)
+        .where(DataVersion.owner_id == owner_id, DataVersion.collection == collection)
+        .values(version=DataVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        db.add(DataVersion(owner_id=owner_id, collection=collection, version=1))
+
+
+async def get_version(db: AsyncSession, owner_id: int, collection: str) -> int:
+    """
+    Returns the current version of a user's collection, or 0 if it was never written.
+    """
+    version = await db.scalar(
+        select(DataVersion.version).where(
+            DataVersion.owner_id == owner_id,
+            DataVersion.collection == collection
+        )
+    )
+    return version or 0
+
+
+def make_etag(request: Request, *parts) -> str:
+    """
+    Builds a strong ETag from `parts` and the negotiated media type, so the
+    JSON and MessagePack encodings of the same content never validate each other.
+    """
+    representation = MSGPACK_MEDIA_TYPE if wants_msgpack(request) else "application/json"
+    raw = "|".join(str(part) for part in (*parts, representation))
+    return '"' + hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def build_etag(owner_id: int, collection: str, version: int, request: Request) -> str:
+    """
+    Builds a strong ETag for one representation of a collection.
+
+    The query string and the negotiated media type are part of the tag, so
+    filtered or paginated variants of the same collection, or its JSON and
+    MessagePack encodings, never validate each other.
+    """
+    return make_etag(request, owner_id, collection, version, request.url.query)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Evaluates an `If-None-Match` header against the current ETag.
+
+    `If-None-Match` uses the weak comparison, so a `W/` prefix sent by an
+    intermediary still matches.
+    """
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    etag: str,
+    cache_control: str = CACHE_CONTROL,
+) -> Optional[Response]:
+    """
+    Answers a conditional GET whose current ETag is already known.
+
+    Returns:
+        A `304 Not Modified` response if the client's copy is current. Otherwise
+        the ETag and `Cache-Control` are set on `response` and None is returned,
+        in which case the route should build the full response.
+    """
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": cache_control},
+        )
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    return None
+
+
+async def check_not_modified(
+    request: Request,
+    response: Response,
+    db: AsyncSession,
+    owner_id: int,
+    collection: str,
+) -> Optional[Response]:
+    """
+    Handles a conditional GET for a user's collection.
+
+    The version is read before the collection itself. If a write commits in
+    between, the fresh rows are labelled with the old version, which only
+    costs the client one extra full response later; stale rows are never
+    labelled with a new version.
+
+    Args:
+        request: The incoming request, for `If-None-Match` and the query string.
+        response: The route's response, which receives the ETag header.
+        db: The read session of the request.
+        owner_id: The ID of the authenticated user.
+        collection: One of the collection names defined in this module.
+
+    Returns:
+        A `304 Not Modified` response if the client's copy is current,
+        otherwise None, in which case the route should build the full response.
+    """
+    version = await get_version(db, owner_id, collection)
+    return conditional_response(request, response, build_etag(owner_id, collection, version, request))
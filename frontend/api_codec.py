@@ -0,0 +1,47 @@
+# /frontend/api_codec.py
+
+"""
+Decodes MessagePack responses from the backend.
+
+The API returns MessagePack instead of JSON when asked to, which is smaller
+and faster to parse for long lists. Dates and times arrive as compact
+extension types; they are turned back into the same ISO 8601 strings JSON
+would contain, so the pages can keep calling `response.json()` unchanged.
+"""
+
+import struct
+from datetime import datetime, timedelta
+
+import msgpack
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+# Prefer MessagePack, but accept JSON (e.g. error responses are always JSON).
+ACCEPT_HEADER = "application/msgpack, application/json;q=0.9"
+
+# Extension type codes, matching `backend/app/serialization.py`.
+EXT_DATE = 1
+EXT_TIME = 2
+EXT_DATETIME = 3
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _ext_hook(code: int, data: bytes):
+    if code == EXT_DATE:
+        return (_EPOCH + timedelta(days=struct.unpack(">i", data)[0])).date().isoformat()
+    if code == EXT_TIME:
+        return (_EPOCH + timedelta(microseconds=struct.unpack(">q", data)[0])).time().isoformat()
+    if code == EXT_DATETIME:
+        return (_EPOCH + timedelta(microseconds=struct.unpack(">q", data)[0])).isoformat()
+    return msgpack.ExtType(code, data)
+
+
+def decode_response(response):
+    """
+    Makes `response.json()` return the decoded body of a MessagePack response.
+    JSON responses are returned untouched.
+    """
+    if response is not None and response.headers.get("content-type", "").startswith(MSGPACK_MEDIA_TYPE):
+        payload = msgpack.unpackb(response.content, ext_hook=_ext_hook)
+        response.json = lambda **kwargs: payload
+    return response
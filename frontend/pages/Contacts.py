@@ -10,6 +10,7 @@ import streamlit as st
 st.set_page_config(page_title="Emergency Contacts", layout="wide", icon="🆘")
 
 # --- 2. Custom UI Components ---
+from api_codec import ACCEPT_HEADER, decode_response
 from ui_components import apply_styles, build_sidebar
 
 # --- 3. APPLY STYLES & SIDEBAR ---
@@ -30,14 +31,15 @@ class ApiClient:
             st.warning("Your session has expired. Please login again.")
             st.switch_page("streamlit_app.py")
             st.stop()
-        return {"Authorization": f"Bearer {token}"}
+        return {"Authorization": f"Bearer {token}", "Accept": ACCEPT_HEADER}
 
     def _make_request(self, method: str, endpoint: str, **kwargs):
         url = f"{self.base_url}{endpoint}"
         try:
-            response = requests.request(method, url, headers=self._get_headers(), timeout=15, **kwargs)
+            headers = {**self._get_headers(), **kwargs.pop("headers", {})}
+            response = requests.request(method, url, headers=headers, timeout=15, **kwargs)
             response.raise_for_status()
-            return response
+            return decode_response(response)
         except requests.exceptions.HTTPError as e:
             error_detail = e.response.json().get('detail', 'An unknown API error occurred.')
             st.error(f"Error: {error_detail}")
@@ -45,7 +47,14 @@ class ApiClient:
             st.error("Connection Error: Could not connect to the server.")
         return None
 
-    def get(self, endpoint: str): return self._make_request("GET", endpoint)
+    def get(self, endpoint: str):
+        # Revalidate cached lists with their ETag; an unchanged list comes back as an empty 304.
+        etag_cache = st.session_state.setdefault("etag_cache", {})
+        cached = etag_cache.get(endpoint)
+        response = self._make_request("GET", endpoint, headers={"If-None-Match": cached.headers["ETag"]} if cached is not None else {})
+        if response is not None and response.status_code == 304: return cached
+        if response is not None and "ETag" in response.headers: etag_cache[endpoint] = response
+        return response
     def post(self, endpoint: str, json_data: dict): return self._make_request("POST", endpoint, json=json_data)
     def put(self, endpoint: str, json_data: dict): return self._make_request("PUT", endpoint, json=json_data)
     def delete(self, endpoint: str): return self._make_request("DELETE", endpoint)
@@ -12,6 +12,7 @@ st.set_page_config(page_title="Dashboard", layout="wide", page_icon="📈")
 
 # --- 2. Custom UI Components ---
 # Correctly placed after page config.
+from api_codec import ACCEPT_HEADER, decode_response
 from ui_components import apply_styles, build_sidebar
 
 # --- 3. APPLY STYLES & SIDEBAR ---
@@ -30,13 +31,13 @@ class ApiClient:
         if not token:
             st.warning("Your session has expired. Please login again.")
             st.switch_page("streamlit_app.py"); st.stop()
-        return {"Authorization": f"Bearer {token}"}
+        return {"Authorization": f"Bearer {token}", "Accept": ACCEPT_HEADER}
     def _make_request(self, method: str, endpoint: str, **kwargs):
         url = f"{self.base_url}{endpoint}"
         try:
             response = requests.request(method, url, headers=self._get_headers(), timeout=15, **kwargs)
             response.raise_for_status()
-            return response
+            return decode_response(response)
         except requests.exceptions.RequestException: return None
     def get(self, endpoint: str): return self._make_request("GET", endpoint)
 
@@ -61,21 +62,26 @@ def handle_take_med(med_id: int):
 
 # --- DATA FETCHING (with Caching) ---
 @st.cache_data(ttl=300)
-def get_dashboard_data():
-    meds_resp, apps_resp, tips_resp, contacts_resp = api.get("/medications/"), api.get("/appointments/"), api.get("/tips/random"), api.get("/contacts/")
-    meds = meds_resp.json() if meds_resp and meds_resp.status_code == 200 else []
-    apps = apps_resp.json() if apps_resp and apps_resp.status_code == 200 else []
-    tip = tips_resp.json() if tips_resp and tips_resp.status_code == 200 else None
-    contacts = contacts_resp.json() if contacts_resp and contacts_resp.status_code == 200 else []
-    return meds, apps, tip, contacts
+def get_dashboard_data(day: str, access_token: str):
+    # One request returns today's medications, appointments and contacts.
+    # The token is part of the cache key so cached data is never shared between users.
+    response = api.get(f"/dashboard/summary?day={day}&contacts_limit=3&fields=medications,appointments,contacts")
+    if not (response and response.status_code == 200):
+        return [], [], []
+    summary = response.json()
+    return summary["medications"], summary["appointments"], summary["contacts"]
+
+@st.cache_data(ttl=3600)
+def get_tip_of_the_day(day: str):
+    # The tip of the day is the same for every user, so it is cached per day only.
+    response = api.get(f"/tips/today?day={day}")
+    return response.json() if response and response.status_code == 200 else None
 
 with st.spinner("Loading your dashboard..."):
-    all_meds, all_apps, health_tip, contacts = get_dashboard_data()
+    active_meds_today, today_apps, contacts = get_dashboard_data(today_str, st.session_state['access_token'])
+    health_tip = get_tip_of_the_day(today_str)
 
-# --- Process Data for Today ---
-active_meds_today = [m for m in all_meds if m['is_active']]
 today = datetime.now().date()
-today_apps = [app for app in all_apps if datetime.fromisoformat(app['appointment_datetime']).date() == today]
 
 # --- Main Page Content ---
 st.header("📈 Your Daily Dashboard")
@@ -99,8 +105,7 @@ with col1:
         st.subheader("💊 Today's Medication Checklist")
         if not active_meds_today: st.write("No active medications found.")
         else:
-            sorted_meds = sorted(active_meds_today, key=lambda x: datetime.strptime(x['timing'], '%H:%M:%S').time())
-            for med in sorted_meds:
+            for med in active_meds_today:  # Already sorted by timing.
                 med_id = med['id']
                 is_taken = med_id in st.session_state[f"taken_meds_{today_str}"]
                 c1, c2 = st.columns([4, 2])
@@ -116,7 +121,7 @@ with col1:
         st.subheader("🗓️ Today's Appointments")
         if not today_apps: st.write("You have no appointments scheduled for today.")
         else:
-            for app in sorted(today_apps, key=lambda x: x['appointment_datetime']):
+            for app in today_apps:
                 app_time = datetime.fromisoformat(app['appointment_datetime']).strftime('%I:%M %p')
                 st.info(f"**Dr. {app['doctor_name']}** at **{app_time}** for '{app.get('purpose', 'a check-up')}'")
 
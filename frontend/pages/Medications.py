@@ -11,6 +11,7 @@ import streamlit as st
 st.set_page_config(page_title="My Medications", layout="wide", page_icon="💊")
 
 # --- 2. Custom UI Components ---
+from api_codec import ACCEPT_HEADER, decode_response
 from ui_components import apply_styles, build_sidebar
 
 # --- 3. APPLY STYLES & SIDEBAR ---
@@ -27,17 +28,25 @@ class ApiClient:
         if not token:
             st.warning("Your session has expired. Please login again.")
             st.switch_page("streamlit_app.py"); st.stop()
-        return {"Authorization": f"Bearer {token}"}
+        return {"Authorization": f"Bearer {token}", "Accept": ACCEPT_HEADER}
     def _make_request(self, method: str, endpoint: str, **kwargs):
         try:
-            response = requests.request(f"{self.base_url}{endpoint}", headers=self._get_headers(), timeout=15, **kwargs)
+            headers = {**self._get_headers(), **kwargs.pop("headers", {})}
+            response = requests.request(method, f"{self.base_url}{endpoint}", headers=headers, timeout=15, **kwargs)
             response.raise_for_status()
-            return response
+            return decode_response(response)
         except requests.exceptions.HTTPError as e:
             st.error(f"API Error: {e.response.json().get('detail', 'Unknown error')}")
         except requests.exceptions.ConnectionError: st.error("Connection Error.")
         return None
-    def get(self, endpoint: str): return self._make_request("GET", endpoint)
+    def get(self, endpoint: str):
+        # Revalidate cached lists with their ETag; an unchanged list comes back as an empty 304.
+        etag_cache = st.session_state.setdefault("etag_cache", {})
+        cached = etag_cache.get(endpoint)
+        response = self._make_request("GET", endpoint, headers={"If-None-Match": cached.headers["ETag"]} if cached is not None else {})
+        if response is not None and response.status_code == 304: return cached
+        if response is not None and "ETag" in response.headers: etag_cache[endpoint] = response
+        return response
     def post(self, endpoint: str, json_data: dict): return self._make_request("POST", endpoint, json=json_data)
     def put(self, endpoint: str, json_data: dict): return self._make_request("PUT", endpoint, json=json_data)
     def delete(self, endpoint: str): return self._make_request("DELETE", endpoint)
@@ -11,6 +11,7 @@ import streamlit as st
 st.set_page_config(page_title="Settings", layout="wide", icon="⚙️")
 
 # --- 2. Custom UI Components ---
+from api_codec import ACCEPT_HEADER, decode_response
 from ui_components import apply_styles, build_sidebar
 
 # --- 3. APPLY STYLES & SIDEBAR ---
@@ -31,7 +32,7 @@ class ApiClient:
             st.warning("Your session has expired. Please login again.")
             st.switch_page("streamlit_app.py")
             st.stop()
-        headers = {"Authorization": f"Bearer {token}"}
+        headers = {"Authorization": f"Bearer {token}", "Accept": ACCEPT_HEADER}
         # Don't set Content-Type for file uploads; `requests` handles the boundary.
         if is_json:
             headers["Content-Type"] = "application/json"
@@ -43,7 +44,7 @@ class ApiClient:
             is_json = "files" not in kwargs
             response = requests.request(method, url, headers=self._get_headers(is_json), timeout=20, **kwargs)
             response.raise_for_status()
-            return response
+            return decode_response(response)
         except requests.exceptions.HTTPError as e:
             error_detail = e.response.json().get('detail', 'An unknown API error occurred.')
             st.error(f"Error: {error_detail}")
@@ -31,6 +31,7 @@ st.set_page_config(
 
 # --- 4. LOCAL IMPORTS (AB YEH 100% KAAM KAREGA) ---
 # Upar diye gaye fix ke kaaran, ab yeh import kabhi fail nahi hoga.
+from api_codec import ACCEPT_HEADER, decode_response
 from ui_components import apply_styles, build_sidebar
 
 # --- 5. GLOBAL VARIABLES & CONSTANTS ---
@@ -49,14 +50,14 @@ class ApiClient:
 
     def _get_headers(self) -> dict:
         token = st.session_state.get("access_token")
-        return {"Authorization": f"Bearer {token}"} if token else {}
+        return {"Accept": ACCEPT_HEADER, **({"Authorization": f"Bearer {token}"} if token else {})}
 
     def _make_request(self, method: str, endpoint: str, **kwargs):
         url = f"{self.base_url}{endpoint}"
         try:
             response = requests.request(method, url, headers=self._get_headers(), timeout=15, **kwargs)
             response.raise_for_status()
-            return response
+            return decode_response(response)
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 401: return None
             st.error(f"API Error: {e.response.json().get('detail', 'Unknown error')}")
@@ -81,10 +82,15 @@ def create_header():
         </div>
     """, unsafe_allow_html=True)
 
-def create_sos_bar():
+def get_home_summary():
+    """Fetches everything the home page shows (SOS contact and today's counts) in one request."""
+    # Only the contacts section is needed; the counts are always included.
+    response = api.get(f"/dashboard/summary?day={date.today().isoformat()}&contacts_limit=1&fields=contacts")
+    return response.json() if response and response.status_code == 200 else None
+
+def create_sos_bar(summary):
     """Displays an emergency SOS bar."""
-    response = api.get("/contacts/")
-    emergency_contact = response.json()[0] if response and response.status_code == 200 and response.json() else None
+    emergency_contact = summary["contacts"][0] if summary and summary["contacts"] else None
     if emergency_contact:
         st.markdown(f'<a href="tel:{emergency_contact["phone_number"]}" class="emergency-bar" target="_blank">🚨 EMERGENCY SOS (Call {emergency_contact["name"]}) 🚨</a>', unsafe_allow_html=True)
     else:
@@ -143,7 +149,7 @@ def show_login_register_page():
                 if response and response.status_code == 201:
                     st.success("Account created! Please log in.")
 
-def show_main_app_area():
+def show_main_app_area(summary):
     """Displays the main application dashboard for a logged-in user."""
     user_name = st.session_state.get('user_email', 'User').split('@')[0]
     st.title(f"Welcome, {user_name.capitalize()}!")
@@ -154,12 +160,8 @@ def show_main_app_area():
         col1, col2 = st.columns([2, 1])
         with col1:
             st.subheader("Today at a Glance")
-            with st.spinner("Loading summary..."):
-                meds_resp = api.get("/medications/")
-                apps_resp = api.get("/appointments/")
-            
-            active_meds_count = sum(1 for m in meds_resp.json() if m['is_active']) if meds_resp else 0
-            today_apps_count = sum(1 for a in apps_resp.json() if datetime.fromisoformat(a['appointment_datetime']).date() == date.today()) if apps_resp else 0
+            active_meds_count = summary["counts"]["active_medications"] if summary else 0
+            today_apps_count = summary["counts"]["appointments_today"] if summary else 0
 
             m_col1, m_col2 = st.columns(2)
             m_col1.metric("Active Medications", f"{active_meds_count} meds")
@@ -207,8 +209,10 @@ def main():
     else:
         build_sidebar()
         create_header()
-        create_sos_bar()
-        show_main_app_area()
+        with st.spinner("Loading summary..."):
+            summary = get_home_summary()
+        create_sos_bar(summary)
+        show_main_app_area(summary)
 
 if __name__ == "__main__":
     main()